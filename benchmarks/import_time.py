@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Break down the import cost of the pipeline entry points using ``-X importtime``.
+
+Usage::
+
+    python benchmarks/import_time.py                      # every CLI entry point
+    python benchmarks/import_time.py src.analytics --top 20
+    python benchmarks/import_time.py --budget-ms 150      # exit 1 when over budget
+
+The script also fails when any of the heavy runtime dependencies are imported at
+module load, which is what keeps ``--help`` and cron invocations fast.
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = (
+    "src.pipeline",
+    "src.dump_db",
+    "src.replay",
+    "src.daemon",
+    "src.serve",
+    "src.workqueue",
+    "src.sync_db",
+)
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "sqlalchemy", "requests", "urllib3")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """Return ``(package, self_us, cumulative_us)`` rows for importing ``module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, package = line[len("import time:") :].split("|")
+        rows.append((package.rstrip(), int(self_us), int(cumulative_us)))
+    # Rows are printed in completion order; everything up to ``site`` is interpreter
+    # start-up rather than the module under test.
+    site_rows = [index for index, row in enumerate(rows) if row[0] == " site"]
+    return rows[site_rows[-1] + 1 :] if site_rows else rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--top", type=int, default=10, help="Rows to print per module")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail when a module's cumulative import time exceeds this budget",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        rows = measure(module)
+        total_us = next(cum for pkg, _, cum in rows if pkg.strip() == module)
+        print(f"{module}: {total_us / 1000:.1f} ms cumulative")
+        for package, self_us, cumulative_us in sorted(
+            rows, key=lambda row: row[2], reverse=True
+        )[: args.top]:
+            print(
+                f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms  {package}"
+            )
+
+        loaded_heavy = sorted(
+            {pkg.strip() for pkg, _, _ in rows if pkg.strip() in HEAVY_MODULES}
+        )
+        if loaded_heavy:
+            print(f"  heavy dependencies imported eagerly: {', '.join(loaded_heavy)}")
+            failed = True
+        if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+            print(f"  over budget of {args.budget_ms:.1f} ms")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Compare JSON backends on the payloads the pipeline actually encodes and decodes.
+
+Usage::
+
+    python benchmarks/json_codec.py                 # all payloads, all backends
+    python benchmarks/json_codec.py --repeat 50
+
+Payloads mirror real traffic: archive responses for a 30-day chunk, a full year
+and ten years with every variable in ``ALL_DAILY_VARS``; a single-day raw
+artefact; and a metric report of 3,650 rows. Each backend is timed on decoding
+the compact document and on encoding it compact and indented; ``json`` with
+indentation is what the pipeline wrote before the codec layer existed.
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import ALL_DAILY_VARS  # noqa: E402
+from src.utils import jsoncodec  # noqa: E402
+from src.utils.io import json_default  # noqa: E402
+
+
+def archive_payload(days: int, seed: int = 0) -> dict:
+    """Return an archive response shaped like Open-Meteo's for ``days`` days."""
+    rng = random.Random(seed)
+    start = date(2015, 1, 1)
+    daily: dict = {
+        "time": [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+    }
+    for variable in ALL_DAILY_VARS:
+        if variable in {"sunrise", "sunset"}:
+            daily[variable] = [
+                f"{day}T0{rng.randint(4, 7)}:{rng.randint(10, 59)}"
+                for day in daily["time"]
+            ]
+        else:
+            daily[variable] = [round(rng.uniform(-20, 40), 1) for _ in range(days)]
+    return {
+        "latitude": 50.45,
+        "longitude": 30.52,
+        "generationtime_ms": 1.2,
+        "utc_offset_seconds": 10800,
+        "timezone": "Europe/Kyiv",
+        "timezone_abbreviation": "EEST",
+        "elevation": 179.0,
+        "daily_units": {variable: "unit" for variable in ALL_DAILY_VARS},
+        "daily": daily,
+        "_requested_daily": list(ALL_DAILY_VARS),
+        "_accepted_daily": list(ALL_DAILY_VARS),
+        "_dropped_daily": [],
+    }
+
+
+def metric_rows(count: int) -> list[dict]:
+    """Return report records similar to the rolling-window metric output."""
+    rng = random.Random(1)
+    start = date(2015, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=index)).isoformat(),
+            "temp_max_7d_avg": rng.uniform(-10, 35),
+            "temp_min_7d_avg": rng.uniform(-20, 20),
+            "precip_7d_sum": rng.uniform(0, 80),
+            "sunshine_hours_7d": rng.uniform(0, 100),
+            "radiation_7d_avg": None if index % 11 == 0 else rng.uniform(0, 30),
+            "hot_days_7d": rng.randint(0, 7),
+        }
+        for index in range(count)
+    ]
+
+
+def payloads() -> dict[str, object]:
+    return {
+        "raw day file": archive_payload(1),
+        "archive 30 days": archive_payload(30),
+        "archive 366 days": archive_payload(366),
+        "archive 10 years": archive_payload(3653),
+        "metric 3650 rows": metric_rows(3650),
+    }
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the best wall time of ``repeat`` calls, in milliseconds."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per cell")
+    args = parser.parse_args(argv)
+
+    backends = ["json"]
+    if jsoncodec.resolve_codec("auto").name == "orjson":
+        backends.append("orjson")
+    else:
+        print("orjson is not installed; only the stdlib backend is measured\n")
+
+    header = (
+        f"{'payload':<18} {'backend':<8} {'KiB':>7} {'indent KiB':>10} "
+        f"{'decode ms':>10} {'encode ms':>10} {'indent ms':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for label, payload in payloads().items():
+        for backend in backends:
+            codec = jsoncodec.resolve_codec(backend)
+            compact = codec.dumps(payload, indent=False, default=json_default)
+            indented = codec.dumps(payload, indent=True, default=json_default)
+            decode = best_of(lambda: codec.loads(compact), args.repeat)
+            encode = best_of(
+                lambda: codec.dumps(payload, indent=False, default=json_default),
+                args.repeat,
+            )
+            indent = best_of(
+                lambda: codec.dumps(payload, indent=True, default=json_default),
+                args.repeat,
+            )
+            print(
+                f"{label:<18} {backend:<8} {len(compact) / 1024:>7.1f} "
+                f"{len(indented) / 1024:>10.1f} "
+                f"{decode:>10.3f} {encode:>10.3f} {indent:>10.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
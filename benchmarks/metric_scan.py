@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Compare per-metric queries with one shared scan for the metric catalogue.
+
+Usage::
+
+    python benchmarks/metric_scan.py                      # 1,000,000 rows
+    python benchmarks/metric_scan.py --rows 200000 --repeat 5 --backend duckdb
+
+The synthetic history of ``metric_backends.py`` is loaded into SQLite and
+DuckDB. For the default report, ``sql`` runs each file in ``METRIC_SQL_FILES``
+and ``scan`` computes ``METRIC_CATALOGUE`` with :func:`src.metrics.scan_metrics`.
+For an extended catalogue (rolling 7/30/90/365 days, heatwaves at 25/30/35 °C
+and two regressions), ``per-metric`` scans the table once per metric and
+``scan`` once for all of them. The best of ``--repeat`` runs is reported.
+"""
+
+import argparse
+import math
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from metric_backends import load_duckdb, load_sqlite, synthetic_history  # noqa: E402
+
+from src.config import METRIC_SQL_FILES, PipelineConfig  # noqa: E402
+from src.metrics import (  # noqa: E402
+    METRIC_CATALOGUE,
+    HeatwaveStreaks,
+    LinearFit,
+    RollingWindow,
+    scan_metrics,
+)
+
+EXTENDED_CATALOGUE = (
+    *(RollingWindow(f"rolling_{days}d", days) for days in (7, 30, 90, 365)),
+    *(HeatwaveStreaks(f"heatwaves_{t:.0f}", threshold=t) for t in (25.0, 30.0, 35.0)),
+    LinearFit("sunshine_vs_temp", x="temp_max_c", y="sunshine_sec"),
+    LinearFit("precip_vs_temp", x="temp_max_c", y="precip_mm"),
+)
+
+
+def best_of(repeat: int, run) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def time_engine(config: PipelineConfig, engine, repeat: int) -> dict[str, float]:
+    import pandas as pd
+    from sqlalchemy import text
+
+    from src.utils.io import load_sql_file
+
+    queries = [
+        text(load_sql_file(config, filename, backend=config.db_backend))
+        for filename in METRIC_SQL_FILES
+    ]
+    with engine.connect() as conn:
+        return {
+            "default sql": best_of(
+                repeat, lambda: [pd.read_sql_query(q, conn) for q in queries]
+            ),
+            "default scan": best_of(
+                repeat, lambda: scan_metrics(conn, METRIC_CATALOGUE)
+            ),
+            "extended per-metric": best_of(
+                repeat,
+                lambda: [scan_metrics(conn, [m]) for m in EXTENDED_CATALOGUE],
+            ),
+            "extended scan": best_of(
+                repeat, lambda: scan_metrics(conn, EXTENDED_CATALOGUE)
+            ),
+        }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--backend",
+        choices=("sqlite", "duckdb"),
+        nargs="+",
+        default=["sqlite", "duckdb"],
+    )
+    args = parser.parse_args(argv)
+
+    from src.load import get_db_engine
+
+    history = synthetic_history(args.rows)
+    print(
+        f"{args.rows:,} synthetic days, best of {args.repeat} run(s); "
+        f"extended catalogue has {len(EXTENDED_CATALOGUE)} metrics\n"
+    )
+    loaders = {"sqlite": load_sqlite, "duckdb": load_duckdb}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        base = replace(
+            PipelineConfig.from_env(),
+            db_path=tmp / "weather.db",
+            duckdb_path=tmp / "weather.duckdb",
+        )
+        for backend in args.backend:
+            config = replace(base, db_backend=backend)
+            loaders[backend](config, history)
+            engine = get_db_engine(config)
+            results[backend] = time_engine(config, engine, args.repeat)
+            engine.dispose()
+
+    columns = list(next(iter(results.values())))
+    header = f"{'backend':<8} " + " ".join(f"{name:>20}" for name in columns)
+    print(header)
+    print("-" * len(header))
+    for backend, timings in results.items():
+        cells = " ".join(f"{timings[name]:>18.2f} s" for name in columns)
+        print(f"{backend:<8} {cells}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
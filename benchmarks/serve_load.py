@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Load-test the HTTP read service with concurrent keep-alive clients.
+
+Usage::
+
+    python benchmarks/serve_load.py                        # 16 clients x 300 requests
+    python benchmarks/serve_load.py --clients 64 --requests 200 --days 7305
+
+A temporary SQLite database is filled with ``--days`` days of synthetic history
+and the default metric report is generated from it. The service is then started
+on a free local port and hammered by ``--clients`` threads, each holding one
+HTTP/1.1 connection. Each client draws from a fixed mix of requests:
+
+* 50% ``/daily`` for one of 32 thirty-day windows;
+* 35% ``/metrics/<name>``;
+* 15% revalidations that send the ``ETag`` seen earlier in ``If-None-Match``.
+
+The run is repeated with the response cache enabled and disabled
+(``cache_bytes=0``), and client-side p50/p99 latencies and throughput are reported.
+"""
+
+import argparse
+import http.client
+import math
+import random
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import METRIC_SQL_FILES, PipelineConfig  # noqa: E402
+
+
+def synthetic_frame(days: int, start: date = date(2015, 1, 1)):
+    """Return a ``weather_daily``-shaped frame of ``days`` seasonal days."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(11)
+    season = np.sin(np.arange(days) * 2 * np.pi / 365.25)
+    temp_max = np.round(18 + 14 * season + rng.normal(0, 4, days), 1)
+    return pd.DataFrame(
+        {
+            "date": [(start + timedelta(days=i)).isoformat() for i in range(days)],
+            "temp_max_c": temp_max,
+            "temp_min_c": np.round(temp_max - rng.uniform(5, 12, days), 1),
+            "precip_mm": np.round(rng.gamma(0.6, 3.0, days), 1),
+            "sunshine_sec": np.round(np.clip(30000 + 14000 * season, 0, 86400)),
+        }
+    )
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_clients(address, paths: list[str], clients: int, requests: int) -> tuple:
+    """Drive the server and return ``(latencies_s, statuses, wall_seconds)``."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+
+    def client(seed: int) -> None:
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(*address, timeout=30)
+        etags: dict[str, str] = {}
+        local_latencies = []
+        local_statuses: dict[int, int] = {}
+        barrier.wait()
+        for _ in range(requests):
+            roll = rng.random()
+            if roll < 0.15 and etags:
+                path = rng.choice(list(etags))
+                headers = {"If-None-Match": etags[path]}
+            else:
+                path = rng.choice(paths[1] if roll < 0.65 else paths[0])
+                headers = {}
+            started = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+            if response.status == 200:
+                etags[path] = response.getheader("ETag")
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=300, help="requests per client")
+    parser.add_argument("--days", type=int, default=3653, help="days of history")
+    args = parser.parse_args(argv)
+
+    import logging
+
+    from src.analytics import calculate_metrics
+    from src.load import ensure_db_and_table, load_upsert_statement, upsert_frame
+    from src.serve import ReadService, make_server
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        config = replace(
+            PipelineConfig.from_env(),
+            db_backend="sqlite",
+            db_path=tmp / "weather.db",
+            reports_root=tmp / "reports",
+            data_version_path=tmp / "version",
+        )
+        engine = ensure_db_and_table(config)
+        upsert_frame(engine, load_upsert_statement(config), synthetic_frame(args.days))
+        calculate_metrics(config, METRIC_SQL_FILES, engine=engine)
+
+        first = date(2015, 1, 1)
+        daily_paths = []
+        for index in range(32):
+            start = first + timedelta(days=(index * 97) % max(1, args.days - 30))
+            end = start + timedelta(days=29)
+            daily_paths.append(f"/daily?start={start}&end={end}")
+        metric_paths = [f"/metrics/{Path(name).stem}" for name in METRIC_SQL_FILES]
+
+        print(
+            f"{args.clients} clients x {args.requests} requests, "
+            f"{args.days:,} days of history\n"
+        )
+        header = (
+            f"{'mode':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+            "  statuses"
+        )
+        print(header)
+        print("-" * len(header))
+        for mode, cache_bytes in (("cached", None), ("uncached", 0)):
+            service = ReadService(config, engine=engine, cache_bytes=cache_bytes)
+            server = make_server(service, port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                latencies, statuses, wall = run_clients(
+                    server.server_address[:2],
+                    [metric_paths, daily_paths],
+                    args.clients,
+                    args.requests,
+                )
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+            print(
+                f"{mode:<10} {len(latencies) / wall:>8.0f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.2f} "
+                f"{percentile(latencies, 0.99) * 1000:>8.2f} "
+                f"{max(latencies) * 1000:>8.2f}  "
+                + ", ".join(f"{code}: {n}" for code, n in sorted(statuses.items()))
+            )
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
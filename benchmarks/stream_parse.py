@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compare peak memory of whole-body and streamed parsing of one large archive response.
+
+Usage::
+
+    python benchmarks/stream_parse.py                   # 10, 40 and 80 years
+    python benchmarks/stream_parse.py --years 40 --window-days 366
+
+Each response has every variable in ``ALL_DAILY_VARS`` and is fed to the parser
+in 64 KiB chunks, as ``requests`` hands them over. ``whole`` decodes the body at
+once and splits it into per-day payloads the way ``save_batch_artefacts`` does;
+``stream`` spools the body with :func:`src.utils.jsonstream.spool_archive` and
+splits one window at a time. Peak memory is measured with ``tracemalloc``
+(which slows both modes down, so times come from a separate untraced run).
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from json_codec import archive_payload  # noqa: E402
+
+from src.extract import STREAM_CHUNK_BYTES  # noqa: E402
+from src.load import split_daily_payload  # noqa: E402
+from src.utils import jsoncodec  # noqa: E402
+from src.utils.jsonstream import spool_archive  # noqa: E402
+
+
+def chunks(body: bytes):
+    for offset in range(0, len(body), STREAM_CHUNK_BYTES):
+        yield body[offset : offset + STREAM_CHUNK_BYTES]
+
+
+def parse_whole(body: bytes, window_days: int) -> int:
+    days = list(split_daily_payload(jsoncodec.loads(b"".join(chunks(body)))))
+    return len(days)
+
+
+def parse_streamed(body: bytes, window_days: int) -> int:
+    total = 0
+    with spool_archive(chunks(body)) as archive:
+        for window in archive.iter_windows(window_days):
+            total += len(list(split_daily_payload(window)))
+    return total
+
+
+def measure(parse, body: bytes, window_days: int) -> tuple[float, float, int]:
+    """Return ``(seconds, peak_mib, days)`` for one parse of ``body``."""
+    started = time.perf_counter()
+    days = parse(body, window_days)
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    parse(body, window_days)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, days
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[10, 40, 80])
+    parser.add_argument("--window-days", type=int, default=366)
+    args = parser.parse_args(argv)
+
+    print(f"JSON backend: {jsoncodec.backend_name()}, window {args.window_days} days\n")
+    header = f"{'years':>5} {'body MiB':>9} {'mode':<7} {'seconds':>8} {'peak MiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for years in args.years:
+        body = jsoncodec.dumps(archive_payload(round(years * 365.25)))
+        for mode, parse in (("whole", parse_whole), ("stream", parse_streamed)):
+            seconds, peak, days = measure(parse, body, args.window_days)
+            print(
+                f"{years:>5} {len(body) / 2**20:>9.1f} {mode:<7} "
+                f"{seconds:>8.2f} {peak:>9.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
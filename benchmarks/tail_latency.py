@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Measure archive request latency with and without hedging against a stalling server.
+
+Usage::
+
+    python benchmarks/tail_latency.py                      # 300 requests, 3% stall 2 s
+    python benchmarks/tail_latency.py --requests 500 --stall-rate 0.05 --stall 5
+
+A local fake archive answers after a log-normal delay (median ``--median-ms``)
+and stalls for ``--stall`` seconds on a random ``--stall-rate`` of requests. The
+same seeded sequence of requests is sent one after another through
+:func:`src.extract.http_get_with_retries`, first as the pipeline does by
+default (fixed 60 s timeout), then through a
+:class:`src.utils.resilience.RequestGuard` with its own defaults (p95 hedging,
+4 × p99 timeout, 0.5 breaker). Client-side p50/p99/max latency, total time and
+the guard's counters are reported.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.extract import http_get_with_retries, make_retry_session  # noqa: E402
+from src.utils.resilience import CircuitBreaker, RequestGuard  # noqa: E402
+
+BODY = json.dumps({"latitude": 50.0, "longitude": 30.0, "daily": {"time": []}}).encode()
+
+
+def start_server(args) -> ThreadingHTTPServer:
+    """Serve ``BODY`` after a random delay drawn per request."""
+    rng = random.Random(args.seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):  # noqa: N802 - http.server naming
+            with lock:
+                stall = rng.random() < args.stall_rate
+                delay = rng.lognormvariate(math.log(args.median_ms / 1000), 0.3)
+            time.sleep(args.stall if stall else delay)
+            try:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(BODY)))
+                self.end_headers()
+                self.wfile.write(BODY)
+            except OSError:
+                pass  # the client closed a hedged twin's connection
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run(url: str, requests: int, guard: RequestGuard | None) -> list[float]:
+    session = make_retry_session(1)
+    latencies = []
+    try:
+        for index in range(requests):
+            started = time.perf_counter()
+            response = http_get_with_retries(
+                url, {"request": index}, max_attempts=1, session=session, guard=guard
+            )
+            response.close()
+            latencies.append(time.perf_counter() - started)
+    finally:
+        session.close()
+    return latencies
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--median-ms", type=float, default=40.0)
+    parser.add_argument("--stall-rate", type=float, default=0.03)
+    parser.add_argument("--stall", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{args.requests} sequential requests, median {args.median_ms:.0f} ms, "
+        f"{args.stall_rate:.0%} stall {args.stall:.1f}s\n"
+    )
+    header = f"{'mode':<8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'total s':>8}"
+    print(header)
+    print("-" * len(header))
+    guard = None
+    for mode in ("fixed", "guarded"):
+        server = start_server(args)
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/archive"
+        if mode == "guarded":
+            guard = RequestGuard(breaker=CircuitBreaker())
+        try:
+            latencies = run(url, args.requests, guard)
+        finally:
+            if guard is not None:
+                guard.close()
+            server.shutdown()
+            server.server_close()
+        print(
+            f"{mode:<8} {percentile(latencies, 0.5) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+            f"{max(latencies) * 1000:>8.1f} {sum(latencies):>8.2f}"
+        )
+    print(f"\nguard counters: {guard.counters.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+-- Lease the oldest pending task. DuckDB's optimistic concurrency aborts the second of
+-- two transactions updating the same row, so a lost race surfaces as a conflict.
+UPDATE work_queue
+SET status = 'leased',
+    lease_owner = :owner,
+    lease_expires_at = :expires_at,
+    attempts = attempts + 1,
+    updated_at = :now
+WHERE status = 'pending'
+  AND task_id = (
+    SELECT task_id
+    FROM work_queue
+    WHERE status = 'pending'
+    ORDER BY start_date, task_id
+    LIMIT 1
+  )
+RETURNING task_id, latitude, longitude, start_date, end_date, attempts;
@@ -0,0 +1,100 @@
+-- Schema for DuckDB database (columnar, for analytics-heavy local deployments)
+
+CREATE TABLE IF NOT EXISTS weather_daily (
+  date                        DATE PRIMARY KEY,
+  temp_max_c                  DOUBLE CHECK (temp_max_c > -100 AND temp_max_c < 70),
+  temp_min_c                  DOUBLE CHECK (temp_min_c > -120 AND temp_min_c < 70),
+  temp_max_f                  DOUBLE,
+  temp_min_f                  DOUBLE,
+  app_temp_max_c              DOUBLE CHECK (app_temp_max_c > -120 AND app_temp_max_c < 80),
+  app_temp_min_c              DOUBLE CHECK (app_temp_min_c > -120 AND app_temp_min_c < 80),
+
+  precip_mm                   DOUBLE CHECK (precip_mm >= 0),
+  rain_mm                     DOUBLE CHECK (rain_mm >= 0),
+  showers_mm                  DOUBLE CHECK (showers_mm >= 0),
+  snowfall_mm                 DOUBLE CHECK (snowfall_mm >= 0),
+  precip_hours                DOUBLE CHECK (precip_hours >= 0 AND precip_hours <= 24),
+
+  sunrise                     TIMESTAMP,                          -- local time, as returned by the API
+  sunset                      TIMESTAMP,                          -- local time, as returned by the API
+  daylight_sec                DOUBLE CHECK (daylight_sec >= 0 AND daylight_sec <= 86400),
+  sunshine_sec                DOUBLE CHECK (sunshine_sec >= 0 AND sunshine_sec <= 86400),
+  shortwave_radiation_mj_m2   DOUBLE CHECK (shortwave_radiation_mj_m2 >= 0),
+
+  wind_max_kmh                DOUBLE CHECK (wind_max_kmh >= 0),
+  wind_gust_max_kmh           DOUBLE CHECK (wind_gust_max_kmh >= 0),
+  wind_dir_deg                DOUBLE CHECK (wind_dir_deg >= 0 AND wind_dir_deg <= 360),
+
+  weather_code                INTEGER CHECK (weather_code BETWEEN 0 AND 99),
+  et0_mm                      DOUBLE CHECK (et0_mm >= 0),
+
+  uv_index_max                DOUBLE CHECK (uv_index_max >= 0),
+  uv_index_clear_sky_max      DOUBLE CHECK (uv_index_clear_sky_max >= 0),
+
+  source                      VARCHAR NOT NULL DEFAULT 'open-meteo',
+  ingested_at                 TIMESTAMPTZ NOT NULL DEFAULT current_timestamp
+);
+
+-- No secondary index on weather_code: DuckDB scans columns with zone maps, and ART
+-- indexes on updated columns only slow the UPSERT down.
+
+CREATE TABLE IF NOT EXISTS weather_monthly (
+  month                       DATE PRIMARY KEY,                   -- first day of the month
+  days                        INTEGER NOT NULL,
+  mean_temp_max_c             DOUBLE,
+  mean_temp_min_c             DOUBLE,
+  total_precip_mm             DOUBLE,
+  sunshine_hours              DOUBLE,
+  hot_days                    INTEGER NOT NULL,                   -- temp_max_c >= 30
+  updated_at                  TIMESTAMPTZ NOT NULL DEFAULT current_timestamp
+);
+
+CREATE TABLE IF NOT EXISTS weather_yearly (
+  year                        INTEGER PRIMARY KEY,
+  days                        INTEGER NOT NULL,
+  mean_temp_max_c             DOUBLE,
+  mean_temp_min_c             DOUBLE,
+  total_precip_mm             DOUBLE,
+  sunshine_hours              DOUBLE,
+  hot_days                    INTEGER NOT NULL,                   -- temp_max_c >= 30
+  updated_at                  TIMESTAMPTZ NOT NULL DEFAULT current_timestamp
+);
+
+-- Shared backfill queue (src/workqueue.py); times are unix epoch seconds. DuckDB
+-- admits a single writing process, so all workers must run inside one process.
+CREATE TABLE IF NOT EXISTS work_queue (
+  task_id                     VARCHAR PRIMARY KEY,                -- lat,lon:start:end
+  latitude                    DOUBLE NOT NULL,
+  longitude                   DOUBLE NOT NULL,
+  start_date                  DATE NOT NULL,
+  end_date                    DATE NOT NULL,
+  status                      VARCHAR NOT NULL DEFAULT 'pending'
+                              CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+  attempts                    INTEGER NOT NULL DEFAULT 0,
+  lease_owner                 VARCHAR,
+  lease_expires_at            DOUBLE,
+  rows_loaded                 INTEGER,
+  last_error                  VARCHAR,
+  updated_at                  DOUBLE
+);
+
+-- Per-source watermarks of src/sync_db.py: the last (ingested_at, date) copied here
+CREATE TABLE IF NOT EXISTS sync_state (
+  source                      VARCHAR PRIMARY KEY,                -- source database URL
+  ingested_at                 VARCHAR NOT NULL,                   -- source's ingested_at, UTC
+  last_date                   VARCHAR NOT NULL,
+  rows_synced                 BIGINT NOT NULL DEFAULT 0,
+  updated_at                  VARCHAR NOT NULL
+);
+
+-- Content version of weather_daily: a random token replaced in the same transaction as
+-- every write that changes a row (src/load.py); metric caching keys on it
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name                  VARCHAR PRIMARY KEY,
+  version                     VARCHAR NOT NULL,
+  updated_at                  VARCHAR NOT NULL
+);
+
+INSERT OR IGNORE INTO table_versions (table_name, version, updated_at)
+VALUES ('weather_daily', replace(CAST(uuid() AS VARCHAR), '-', ''),
+        strftime(now(), '%Y-%m-%dT%H:%M:%SZ'));
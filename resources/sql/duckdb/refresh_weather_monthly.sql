@@ -0,0 +1,24 @@
+INSERT INTO weather_monthly (
+  month, days, mean_temp_max_c, mean_temp_min_c,
+  total_precip_mm, sunshine_hours, hot_days, updated_at
+)
+SELECT
+  CAST(date_trunc('month', date) AS DATE)                AS month,
+  COUNT(*)                                               AS days,
+  AVG(temp_max_c)                                        AS mean_temp_max_c,
+  AVG(temp_min_c)                                        AS mean_temp_min_c,
+  SUM(precip_mm)                                         AS total_precip_mm,
+  SUM(sunshine_sec) / 3600.0                             AS sunshine_hours,
+  COUNT(*) FILTER (WHERE temp_max_c >= 30.0)             AS hot_days,
+  CURRENT_TIMESTAMP                                      AS updated_at
+FROM weather_daily
+WHERE date >= CAST(:period_start AS DATE) AND date < CAST(:period_end AS DATE)
+GROUP BY CAST(date_trunc('month', date) AS DATE)
+ON CONFLICT (month) DO UPDATE SET
+  days=excluded.days,
+  mean_temp_max_c=excluded.mean_temp_max_c,
+  mean_temp_min_c=excluded.mean_temp_min_c,
+  total_precip_mm=excluded.total_precip_mm,
+  sunshine_hours=excluded.sunshine_hours,
+  hot_days=excluded.hot_days,
+  updated_at=excluded.updated_at;
@@ -0,0 +1,51 @@
+-- Set-based UPSERT: src.load.upsert_frame registers the batch as the Arrow relation
+-- ``weather_incoming`` and runs this single statement instead of one INSERT per row.
+INSERT INTO weather_daily (
+  date, temp_max_c, temp_min_c, temp_max_f, temp_min_f,
+  app_temp_max_c, app_temp_min_c,
+  precip_mm, rain_mm, showers_mm, snowfall_mm, precip_hours,
+  sunrise, sunset, daylight_sec, sunshine_sec, shortwave_radiation_mj_m2,
+  wind_max_kmh, wind_gust_max_kmh, wind_dir_deg, weather_code, et0_mm,
+  uv_index_max, uv_index_clear_sky_max, source, ingested_at
+)
+SELECT
+  CAST(date AS DATE),
+  CAST(temp_max_c AS DOUBLE), CAST(temp_min_c AS DOUBLE),
+  CAST(temp_max_f AS DOUBLE), CAST(temp_min_f AS DOUBLE),
+  CAST(app_temp_max_c AS DOUBLE), CAST(app_temp_min_c AS DOUBLE),
+  CAST(precip_mm AS DOUBLE), CAST(rain_mm AS DOUBLE), CAST(showers_mm AS DOUBLE),
+  CAST(snowfall_mm AS DOUBLE), CAST(precip_hours AS DOUBLE),
+  CAST(sunrise AS TIMESTAMP), CAST(sunset AS TIMESTAMP),
+  CAST(daylight_sec AS DOUBLE), CAST(sunshine_sec AS DOUBLE),
+  CAST(shortwave_radiation_mj_m2 AS DOUBLE),
+  CAST(wind_max_kmh AS DOUBLE), CAST(wind_gust_max_kmh AS DOUBLE),
+  CAST(wind_dir_deg AS DOUBLE), CAST(weather_code AS INTEGER), CAST(et0_mm AS DOUBLE),
+  CAST(uv_index_max AS DOUBLE), CAST(uv_index_clear_sky_max AS DOUBLE),
+  source, CAST(ingested_at AS TIMESTAMPTZ)
+FROM weather_incoming
+ON CONFLICT (date) DO UPDATE SET
+  temp_max_c=excluded.temp_max_c,
+  temp_min_c=excluded.temp_min_c,
+  temp_max_f=excluded.temp_max_f,
+  temp_min_f=excluded.temp_min_f,
+  app_temp_max_c=excluded.app_temp_max_c,
+  app_temp_min_c=excluded.app_temp_min_c,
+  precip_mm=excluded.precip_mm,
+  rain_mm=excluded.rain_mm,
+  showers_mm=excluded.showers_mm,
+  snowfall_mm=excluded.snowfall_mm,
+  precip_hours=excluded.precip_hours,
+  sunrise=excluded.sunrise,
+  sunset=excluded.sunset,
+  daylight_sec=excluded.daylight_sec,
+  sunshine_sec=excluded.sunshine_sec,
+  shortwave_radiation_mj_m2=excluded.shortwave_radiation_mj_m2,
+  wind_max_kmh=excluded.wind_max_kmh,
+  wind_gust_max_kmh=excluded.wind_gust_max_kmh,
+  wind_dir_deg=excluded.wind_dir_deg,
+  weather_code=excluded.weather_code,
+  et0_mm=excluded.et0_mm,
+  uv_index_max=excluded.uv_index_max,
+  uv_index_clear_sky_max=excluded.uv_index_clear_sky_max,
+  source=excluded.source,
+  ingested_at=excluded.ingested_at;
@@ -0,0 +1,17 @@
+-- Lease the oldest pending task. SKIP LOCKED lets concurrent workers pass over rows
+-- another transaction is claiming instead of queueing behind its row lock.
+UPDATE work_queue
+SET status = 'leased',
+    lease_owner = :owner,
+    lease_expires_at = :expires_at,
+    attempts = attempts + 1,
+    updated_at = :now
+WHERE task_id = (
+  SELECT task_id
+  FROM work_queue
+  WHERE status = 'pending'
+  ORDER BY start_date, task_id
+  LIMIT 1
+  FOR UPDATE SKIP LOCKED
+)
+RETURNING task_id, latitude, longitude, start_date, end_date, attempts;
@@ -50,6 +50,68 @@ CREATE TABLE IF NOT EXISTS weather_daily (
 
 CREATE INDEX IF NOT EXISTS idx_weather_daily_code ON weather_daily(weather_code);
 
+CREATE TABLE IF NOT EXISTS weather_monthly (
+  month                       DATE PRIMARY KEY,
+  days                        INTEGER NOT NULL,
+  mean_temp_max_c             NUMERIC(5,2),
+  mean_temp_min_c             NUMERIC(5,2),
+  total_precip_mm             NUMERIC(10,2),
+  sunshine_hours              NUMERIC(10,2),
+  hot_days                    INTEGER NOT NULL,
+  updated_at                  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS weather_yearly (
+  year                        INTEGER PRIMARY KEY,
+  days                        INTEGER NOT NULL,
+  mean_temp_max_c             NUMERIC(5,2),
+  mean_temp_min_c             NUMERIC(5,2),
+  total_precip_mm             NUMERIC(10,2),
+  sunshine_hours              NUMERIC(10,2),
+  hot_days                    INTEGER NOT NULL,
+  updated_at                  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS work_queue (
+  task_id                     TEXT PRIMARY KEY,
+  latitude                    DOUBLE PRECISION NOT NULL,
+  longitude                   DOUBLE PRECISION NOT NULL,
+  start_date                  DATE NOT NULL,
+  end_date                    DATE NOT NULL,
+  status                      TEXT NOT NULL DEFAULT 'pending'
+                              CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+  attempts                    INTEGER NOT NULL DEFAULT 0,
+  lease_owner                 TEXT,
+  lease_expires_at            DOUBLE PRECISION,
+  rows_loaded                 INTEGER,
+  last_error                  TEXT,
+  updated_at                  DOUBLE PRECISION
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_status ON work_queue(status, start_date);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+  source                      TEXT PRIMARY KEY,
+  ingested_at                 TEXT NOT NULL,
+  last_date                   TEXT NOT NULL,
+  rows_synced                 BIGINT NOT NULL DEFAULT 0,
+  updated_at                  TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name                  TEXT PRIMARY KEY,
+  version                     TEXT NOT NULL,
+  updated_at                  TEXT NOT NULL
+);
+
+INSERT INTO table_versions (table_name, version, updated_at)
+VALUES (
+  'weather_daily',
+  md5(random()::text || clock_timestamp()::text),
+  to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')
+)
+ON CONFLICT (table_name) DO NOTHING;
+
 CREATE OR REPLACE FUNCTION update_modified_column()
 RETURNS TRIGGER AS $$
 BEGIN
@@ -92,3 +154,15 @@ COMMENT ON COLUMN weather_daily.uv_index_max IS 'Maximum UV index';
 COMMENT ON COLUMN weather_daily.uv_index_clear_sky_max IS 'Maximum UV index under clear sky conditions';
 COMMENT ON COLUMN weather_daily.source IS 'Data source identifier';
 COMMENT ON COLUMN weather_daily.ingested_at IS 'Timestamp when the record was last updated';
+COMMENT ON TABLE weather_monthly IS 'Monthly aggregates of weather_daily, refreshed incrementally by the load stage';
+COMMENT ON COLUMN weather_monthly.month IS 'First day of the aggregated month';
+COMMENT ON COLUMN weather_monthly.hot_days IS 'Days with temp_max_c >= 30';
+COMMENT ON TABLE weather_yearly IS 'Yearly aggregates of weather_daily, refreshed incrementally by the load stage';
+COMMENT ON COLUMN weather_yearly.hot_days IS 'Days with temp_max_c >= 30';
+COMMENT ON TABLE work_queue IS 'Backfill tasks (location x date chunk) claimed by workers under time-limited leases';
+COMMENT ON COLUMN work_queue.task_id IS 'latitude,longitude:start_date:end_date';
+COMMENT ON COLUMN work_queue.lease_expires_at IS 'Unix epoch seconds after which a leased task is requeued';
+COMMENT ON TABLE sync_state IS 'Watermarks of src/sync_db.py: last (ingested_at, date) copied from each source database';
+COMMENT ON COLUMN sync_state.source IS 'Source database URL with the password hidden';
+COMMENT ON TABLE table_versions IS 'Content version of weather_daily, replaced in the same transaction as every write that changes a row';
+COMMENT ON COLUMN table_versions.version IS 'Random token; metric caching (src/analytics.py) keys on it';
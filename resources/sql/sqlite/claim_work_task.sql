@@ -0,0 +1,18 @@
+-- Lease the oldest pending task. The UPDATE takes SQLite's write lock before it reads,
+-- so concurrent workers serialise here; the outer status check keeps a claim that lost
+-- a race from stealing a task that was leased in between.
+UPDATE work_queue
+SET status = 'leased',
+    lease_owner = :owner,
+    lease_expires_at = :expires_at,
+    attempts = attempts + 1,
+    updated_at = :now
+WHERE status = 'pending'
+  AND task_id = (
+    SELECT task_id
+    FROM work_queue
+    WHERE status = 'pending'
+    ORDER BY start_date, task_id
+    LIMIT 1
+  )
+RETURNING task_id, latitude, longitude, start_date, end_date, attempts;
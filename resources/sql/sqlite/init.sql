@@ -38,3 +38,66 @@ CREATE TABLE IF NOT EXISTS weather_daily (
 
 -- Helpful index if you filter by weather code often
 CREATE INDEX IF NOT EXISTS idx_weather_daily_code ON weather_daily(weather_code);
+
+-- Monthly/yearly rollups, refreshed by the load stage for the periods each batch touches
+CREATE TABLE IF NOT EXISTS weather_monthly (
+  month                              DATE PRIMARY KEY,                   -- first day of the month
+  days                               INTEGER NOT NULL,
+  mean_temp_max_c                    REAL,
+  mean_temp_min_c                    REAL,
+  total_precip_mm                    REAL,
+  sunshine_hours                     REAL,
+  hot_days                           INTEGER NOT NULL,                   -- temp_max_c >= 30
+  updated_at                         TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS weather_yearly (
+  year                               INTEGER PRIMARY KEY,
+  days                               INTEGER NOT NULL,
+  mean_temp_max_c                    REAL,
+  mean_temp_min_c                    REAL,
+  total_precip_mm                    REAL,
+  sunshine_hours                     REAL,
+  hot_days                           INTEGER NOT NULL,                   -- temp_max_c >= 30
+  updated_at                         TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+-- Shared backfill queue: one task per (location, date chunk), claimed by workers under
+-- time-limited leases (src/workqueue.py). Times are unix epoch seconds.
+CREATE TABLE IF NOT EXISTS work_queue (
+  task_id                            TEXT PRIMARY KEY,                   -- lat,lon:start:end
+  latitude                           REAL NOT NULL,
+  longitude                          REAL NOT NULL,
+  start_date                         TEXT NOT NULL,
+  end_date                           TEXT NOT NULL,
+  status                             TEXT NOT NULL DEFAULT 'pending'
+                                     CHECK (status IN ('pending', 'leased', 'done', 'failed')),
+  attempts                           INTEGER NOT NULL DEFAULT 0,
+  lease_owner                        TEXT,
+  lease_expires_at                   REAL,
+  rows_loaded                        INTEGER,
+  last_error                         TEXT,
+  updated_at                         REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_status ON work_queue(status, start_date);
+
+-- Per-source watermarks of src/sync_db.py: the last (ingested_at, date) copied here
+CREATE TABLE IF NOT EXISTS sync_state (
+  source                             TEXT PRIMARY KEY,                   -- source database URL
+  ingested_at                        TEXT NOT NULL,                      -- source's ingested_at, UTC
+  last_date                          TEXT NOT NULL,
+  rows_synced                        INTEGER NOT NULL DEFAULT 0,
+  updated_at                         TEXT NOT NULL
+);
+
+-- Content version of weather_daily: a random token replaced in the same transaction as
+-- every write that changes a row (src/load.py); metric caching keys on it
+CREATE TABLE IF NOT EXISTS table_versions (
+  table_name                         TEXT PRIMARY KEY,
+  version                            TEXT NOT NULL,
+  updated_at                         TEXT NOT NULL
+);
+
+INSERT OR IGNORE INTO table_versions (table_name, version, updated_at)
+VALUES ('weather_daily', lower(hex(randomblob(16))), strftime('%Y-%m-%dT%H:%M:%SZ', 'now'));
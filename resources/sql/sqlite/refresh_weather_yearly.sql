@@ -0,0 +1,24 @@
+INSERT INTO weather_yearly (
+  year, days, mean_temp_max_c, mean_temp_min_c,
+  total_precip_mm, sunshine_hours, hot_days, updated_at
+)
+SELECT
+  CAST(strftime('%Y', date) AS INTEGER)                  AS year,
+  COUNT(*)                                               AS days,
+  AVG(temp_max_c)                                        AS mean_temp_max_c,
+  AVG(temp_min_c)                                        AS mean_temp_min_c,
+  SUM(precip_mm)                                         AS total_precip_mm,
+  SUM(sunshine_sec) / 3600.0                             AS sunshine_hours,
+  SUM(CASE WHEN temp_max_c >= 30.0 THEN 1 ELSE 0 END)    AS hot_days,
+  datetime('now')                                        AS updated_at
+FROM weather_daily
+WHERE date >= :period_start AND date < :period_end
+GROUP BY CAST(strftime('%Y', date) AS INTEGER)
+ON CONFLICT(year) DO UPDATE SET
+  days=excluded.days,
+  mean_temp_max_c=excluded.mean_temp_max_c,
+  mean_temp_min_c=excluded.mean_temp_min_c,
+  total_precip_mm=excluded.total_precip_mm,
+  sunshine_hours=excluded.sunshine_hours,
+  hot_days=excluded.hot_days,
+  updated_at=excluded.updated_at;
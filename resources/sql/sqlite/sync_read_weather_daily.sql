@@ -0,0 +1,14 @@
+-- Rows of weather_daily after the (ingested_at, date) watermark and ingested before
+-- the "until" cut-off, oldest first; read by src.sync_db. ingested_at is the
+-- ISO-8601 UTC text written by the load stage.
+SELECT
+  date, temp_max_c, temp_min_c, temp_max_f, temp_min_f,
+  app_temp_max_c, app_temp_min_c,
+  precip_mm, rain_mm, showers_mm, snowfall_mm, precip_hours,
+  sunrise, sunset, daylight_sec, sunshine_sec, shortwave_radiation_mj_m2,
+  wind_max_kmh, wind_gust_max_kmh, wind_dir_deg, weather_code, et0_mm,
+  uv_index_max, uv_index_clear_sky_max, source, ingested_at
+FROM weather_daily
+WHERE (ingested_at > :since OR (ingested_at = :since AND date > :after_date))
+  AND ingested_at < :until
+ORDER BY ingested_at, date;
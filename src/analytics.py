@@ -1,34 +1,159 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+from dataclasses import replace
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Sequence
 
-import pandas as pd
-
-from src.config import PipelineConfig
-from src.load import get_db_engine
-from src.utils.io import ensure_dir, json_default, load_sql_file, utc_isoformat
+from src.config import METRIC_SQL_FILES, PipelineConfig
+from src.load import get_db_engine, read_table_version
+from src.metrics import METRIC_CATALOGUE, Metric, scan_metrics
+from src.utils import jsoncodec
+from src.utils.io import (
+    PROC_FILENAME,
+    bump_data_version,
+    ensure_dir,
+    link_or_copy,
+    load_sql_file,
+    utc_isoformat,
+)
 
 logger = logging.getLogger(__name__)
 
+WATERMARK_TABLE = "weather_daily"
+
+
+def table_watermark(conn) -> str | None:
+    """Return the content version of ``weather_daily``, or ``None`` when untracked.
+
+    The version is replaced in the same transaction as every load or sync write
+    that changes a row (see :func:`src.load.write_daily_rows`), while re-loading
+    identical rows keeps it. Databases without the ``table_versions`` table (e.g.
+    the Parquet view) are never cached.
+    """
+    return read_table_version(conn, WATERMARK_TABLE)
+
+
+def metric_cache_key(
+    backend: str, sql: str, watermark: str, json_format: str = "compact"
+) -> str:
+    """Build the cache key for a metric from its query text and the table watermark.
+
+    ``json_format`` (``compact`` or ``pretty``) keeps a report written with one
+    ``PIPELINE_JSON_PRETTY`` setting from being reused under the other.
+    """
+    digest = hashlib.sha256()
+    for part in (backend, sql, watermark, json_format):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _previous_metric_entries(reports_root: Path) -> tuple[Path | None, dict]:
+    """Return the latest report directory and its manifest entries keyed by name."""
+    if not reports_root.is_dir():
+        return None, {}
+    candidates = sorted(
+        (path for path in reports_root.iterdir() if (path / "metadata.json").is_file()),
+        key=lambda path: path.name,
+        reverse=True,
+    )
+    for report_dir in candidates:
+        try:
+            manifest = jsoncodec.loads((report_dir / "metadata.json").read_bytes())
+        except (OSError, ValueError):
+            continue
+        entries = {
+            entry["name"]: entry
+            for entry in manifest.get("metrics", [])
+            if entry.get("cache_key")
+        }
+        return report_dir, entries
+    return None, {}
+
+
+def configured_metrics(config: PipelineConfig) -> Sequence[str | Metric]:
+    """Return the report selected by ``PIPELINE_METRIC_ENGINE``.
+
+    ``scan`` evaluates :data:`src.metrics.METRIC_CATALOGUE` in one table scan;
+    ``sql`` runs the equivalent ``metrics_*.sql`` files one query each.
+    """
+    return METRIC_CATALOGUE if config.metric_engine == "scan" else METRIC_SQL_FILES
+
 
 def calculate_metrics(
     config: PipelineConfig,
-    query_files: list[str],
+    query_files: Sequence[str | Metric],
     *,
     engine=None,
-):
-    """Execute SQL files, capture their results, and materialise report artefacts."""
+    use_cache: bool = True,
+) -> Path:
+    """Execute SQL files, capture their results, and materialise report artefacts.
+
+    ``query_files`` may also hold catalogue :class:`~src.metrics.Metric` entries;
+    all of those that are not cached are computed together from a single scan of
+    ``weather_daily`` (see :func:`src.metrics.scan_metrics`). When ``use_cache`` is
+    enabled, metrics whose query text (or declaration) and table watermark match
+    the latest report are hard-linked from that report instead of being re-queried.
+    When every metric of the latest report is reused, that report is returned as
+    is: no new directory is written and the data-version marker is left alone.
+    Returns the directory holding the generated report.
+    """
+    import pandas as pd
+
     engine = engine or get_db_engine(config)
+    previous_dir, previous_entries = (
+        _previous_metric_entries(config.reports_root) if use_cache else (None, {})
+    )
 
     datasets = []
     with engine.begin() as conn:
-        for filename in query_files:
-            sql = load_sql_file(config, filename, backend=config.db_backend)
-            name = Path(filename).stem
-            datasets.append((name, pd.read_sql_query(sql, conn)))
+        watermark = table_watermark(conn) if use_cache else None
+        json_format = "pretty" if config.json_pretty else "compact"
+        scanned: list[Metric] = []
+        for query in query_files:
+            if isinstance(query, Metric):
+                name, sql = query.name, repr(query)
+            else:
+                sql = load_sql_file(config, query, backend=config.db_backend)
+                name = Path(query).stem
+            cache_key = (
+                metric_cache_key(config.db_backend, sql, watermark, json_format)
+                if watermark is not None
+                else None
+            )
+            previous = previous_entries.get(name)
+            if (
+                cache_key is not None
+                and previous is not None
+                and previous["cache_key"] == cache_key
+                and (previous_dir / previous["json"]).is_file()
+                and (previous_dir / previous["csv"]).is_file()
+            ):
+                logger.info("Reusing cached results for %s", name)
+                datasets.append((name, cache_key, previous))
+                continue
+            if isinstance(query, Metric):
+                scanned.append(query)
+                datasets.append((name, cache_key, None))
+                continue
+            datasets.append((name, cache_key, pd.read_sql_query(sql, conn)))
+        if scanned:
+            results = scan_metrics(conn, scanned)
+            datasets = [
+                (name, cache_key, results[name] if result is None else result)
+                for name, cache_key, result in datasets
+            ]
+
+    if (
+        previous_dir is not None
+        and all(isinstance(result, dict) for _, _, result in datasets)
+        and [name for name, _, _ in datasets] == list(previous_entries)
+    ):
+        logger.info("All metrics unchanged; keeping %s", previous_dir)
+        return previous_dir
 
     generated_at = datetime.now(UTC)
     reports_dir = ensure_dir(
@@ -37,35 +162,86 @@ def calculate_metrics(
 
     manifest = {
         "generated_utc": utc_isoformat(generated_at),
+        "watermark": watermark,
         "metrics": [],
     }
 
-    for name, frame in datasets:
+    for name, cache_key, result in datasets:
         json_path = reports_dir / f"{name}.json"
-        with json_path.open("w", encoding="utf-8") as handle:
-            json.dump(
-                frame.to_dict(orient="records"),
-                handle,
-                ensure_ascii=False,
-                indent=2,
-                default=json_default,
+        csv_path = reports_dir / f"{name}.csv"
+
+        if isinstance(result, dict):
+            link_or_copy(previous_dir / result["json"], json_path)
+            link_or_copy(previous_dir / result["csv"], csv_path)
+            logger.info("Linked cached %s and %s", json_path, csv_path)
+            rows = result["rows"]
+        else:
+            # Unlink first so a hard-linked artefact of an older report is not
+            # truncated in place when a report directory is rewritten.
+            json_path.unlink(missing_ok=True)
+            csv_path.unlink(missing_ok=True)
+            # Missing values become null with either JSON backend.
+            records = (
+                result.astype(object)
+                .where(result.notna(), None)
+                .to_dict(orient="records")
             )
-        logger.info("Wrote %s", json_path)
+            json_path.write_bytes(jsoncodec.dumps(records, indent=config.json_pretty))
+            logger.info("Wrote %s", json_path)
 
-        csv_path = reports_dir / f"{name}.csv"
-        frame.to_csv(csv_path, index=False)
-        logger.info("Wrote %s", csv_path)
+            result.to_csv(csv_path, index=False)
+            logger.info("Wrote %s", csv_path)
+            rows = len(result)
 
         manifest["metrics"].append(
             {
                 "name": name,
-                "rows": len(frame),
+                "rows": rows,
                 "json": json_path.name,
                 "csv": csv_path.name,
+                "cache_key": cache_key,
+                "cached": isinstance(result, dict),
             }
         )
 
     meta_path = reports_dir / "metadata.json"
-    with meta_path.open("w", encoding="utf-8") as handle:
-        json.dump(manifest, handle, ensure_ascii=False, indent=2, default=json_default)
+    meta_path.write_bytes(jsoncodec.dumps(manifest, indent=True))
     logger.info("Wrote %s", meta_path)
+    bump_data_version(config.data_version_path)
+    return reports_dir
+
+
+def processed_parquet_engine(config: PipelineConfig):
+    """Return an in-memory DuckDB engine exposing ``data/processed`` as ``weather_daily``.
+
+    The view scans the per-day Parquet files directly, so the DuckDB metric SQL runs
+    unchanged without loading a database first. Requires the ``duckdb`` extra.
+    """
+    from sqlalchemy import create_engine, event
+
+    glob = (config.proc_root / "*" / PROC_FILENAME).as_posix().replace("'", "''")
+    view_sql = (
+        "CREATE OR REPLACE VIEW weather_daily AS "
+        "SELECT * REPLACE (CAST(date AS DATE) AS date) "
+        f"FROM read_parquet('{glob}', union_by_name = true)"
+    )
+
+    engine = create_engine("duckdb:///:memory:", future=True)
+
+    @event.listens_for(engine, "connect")
+    def _create_view(dbapi_conn, _record) -> None:
+        dbapi_conn.execute(view_sql)
+
+    return engine
+
+
+def calculate_parquet_metrics(
+    config: PipelineConfig, query_files: Sequence[str | Metric]
+) -> Path:
+    """Run the metric queries straight over the processed Parquet files."""
+    return calculate_metrics(
+        replace(config, db_backend="duckdb"),
+        query_files,
+        engine=processed_parquet_engine(config),
+        use_cache=False,
+    )
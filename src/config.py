@@ -27,12 +27,46 @@ def _env_int(name: str, default: int) -> int:
         raise ValueError(f"Environment variable {name} must be an integer") from exc
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Return a boolean from an environment variable (``1/true/yes/on`` or ``0/false/no/off``)."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    value = raw.strip().lower()
+    if value in {"1", "true", "yes", "on"}:
+        return True
+    if value in {"0", "false", "no", "off"}:
+        return False
+    raise ValueError(f"Environment variable {name} must be a boolean")
+
+
 def _env_str(name: str, default: str) -> str:
     """Return a non-empty string from the environment or the provided default."""
     raw = os.getenv(name)
     return raw if raw is not None and raw.strip() else default
 
 
+DB_BACKENDS = ("sqlite", "postgres", "duckdb")
+
+PROFILE_MODES = ("cpu", "memory", "sample")
+
+
+def parse_profile_modes(raw: str | None) -> frozenset[str]:
+    """Parse a comma-separated profiling mode list (``all`` enables every mode)."""
+    tokens = {
+        token.strip().lower() for token in (raw or "").split(",") if token.strip()
+    }
+    if "all" in tokens:
+        return frozenset(PROFILE_MODES)
+    unknown = tokens - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(
+            f"Unknown profiling modes: {', '.join(sorted(unknown))} "
+            f"(expected any of {', '.join(PROFILE_MODES)} or 'all')"
+        )
+    return frozenset(tokens)
+
+
 @dataclass(frozen=True)
 class PipelineConfig:
     """Configuration container materialised from environment variables."""
@@ -45,21 +79,60 @@ class PipelineConfig:
     db_backend: str
     db_url: str
     fetch_batch_days: int | None
+    extract_engine: str
+    fetch_concurrency: int
+    fetch_rate_per_second: float | None
+    fetch_adaptive: bool
+    fetch_target_seconds: float
+    fetch_min_days: int
+    fetch_max_days: int
+    fetch_stream_days: int | None
+    fetch_hedge_percentile: float | None
+    fetch_timeout_multiplier: float | None
+    fetch_min_timeout: float
+    fetch_max_timeout: float
+    fetch_breaker_error_rate: float | None
+    fetch_breaker_cooldown_seconds: float
+    io_workers: int
+    io_queue_depth: int
+    store_cache_mb: int
+    json_backend: str
+    metric_engine: str
+    json_pretty: bool
+    daemon_interval_seconds: float
+    daemon_jitter_seconds: float
+    daemon_lookback_days: int
+    serve_host: str
+    serve_port: int
+    serve_cache_mb: int
+    queue_lease_seconds: float
+    queue_heartbeat_seconds: float
+    queue_max_attempts: int
+    sync_chunk_rows: int
+    profile_modes: frozenset[str]
     project_root: Path
     data_root: Path
     resources_root: Path
     raw_root: Path
     proc_root: Path
     reports_root: Path
+    profiles_root: Path
+    quarantine_root: Path
+    daemon_stats_path: Path
+    data_version_path: Path
     db_root: Path
     sqlite_root: Path
     pg_root: Path
+    duckdb_root: Path
     db_path: Path
+    duckdb_path: Path
     sql_dir: Path
     sqlite_sql_dir: Path
     pg_sql_dir: Path
+    duckdb_sql_dir: Path
     schema_sqlite: Path
     schema_postgres: Path
+    schema_duckdb: Path
 
     @classmethod
     def from_env(cls) -> "PipelineConfig":
@@ -71,16 +144,49 @@ class PipelineConfig:
         db_root = project_root / "db"
         sqlite_root = db_root / "sqlite"
         pg_root = db_root / "pg"
+        duckdb_root = db_root / "duckdb"
 
         fetch_days_raw = _env_int("PIPELINE_FETCH_BATCH_DAYS", 30)
         fetch_batch_days = fetch_days_raw if fetch_days_raw > 0 else None
 
+        extract_engine = _env_str("PIPELINE_EXTRACT_ENGINE", "sync").lower()
+        if extract_engine not in {"sync", "async"}:
+            raise ValueError("PIPELINE_EXTRACT_ENGINE must be either 'sync' or 'async'")
+
+        fetch_rate = _env_float("PIPELINE_FETCH_RATE", 0.0)
+
+        fetch_min_days = max(1, _env_int("PIPELINE_FETCH_MIN_DAYS", 1))
+        fetch_max_days = max(fetch_min_days, _env_int("PIPELINE_FETCH_MAX_DAYS", 366))
+
+        fetch_stream_days = _env_int("PIPELINE_FETCH_STREAM_DAYS", 0)
+
+        hedge_percentile = min(_env_float("PIPELINE_FETCH_HEDGE_PERCENTILE", 0.0), 99.9)
+        timeout_multiplier = _env_float("PIPELINE_FETCH_TIMEOUT_MULTIPLIER", 0.0)
+        fetch_max_timeout = max(1.0, _env_float("PIPELINE_FETCH_MAX_TIMEOUT", 60.0))
+        breaker_error_rate = min(
+            _env_float("PIPELINE_FETCH_BREAKER_ERROR_RATE", 0.0), 1.0
+        )
+
+        json_backend = _env_str("PIPELINE_JSON_BACKEND", "auto").lower()
+        if json_backend not in {"auto", "orjson", "json"}:
+            raise ValueError(
+                "PIPELINE_JSON_BACKEND must be one of 'auto', 'orjson' or 'json'"
+            )
+
+        metric_engine = _env_str("PIPELINE_METRIC_ENGINE", "scan").lower()
+        if metric_engine not in {"scan", "sql"}:
+            raise ValueError("PIPELINE_METRIC_ENGINE must be either 'scan' or 'sql'")
+
         db_backend = _env_str("PIPELINE_DB_BACKEND", "sqlite").lower()
-        if db_backend not in {"sqlite", "postgres"}:
+        if db_backend not in DB_BACKENDS:
             raise ValueError(
-                "PIPELINE_DB_BACKEND must be either 'sqlite' or 'postgres'"
+                "PIPELINE_DB_BACKEND must be one of 'sqlite', 'postgres' or 'duckdb'"
             )
 
+        queue_lease_seconds = max(
+            1.0, _env_float("PIPELINE_QUEUE_LEASE_SECONDS", 120.0)
+        )
+
         return cls(
             latitude=_env_float("PIPELINE_LATITUDE", 50.45),
             longitude=_env_float("PIPELINE_LONGITUDE", 30.52),
@@ -90,21 +196,78 @@ class PipelineConfig:
             db_backend=db_backend,
             db_url=_env_str("PIPELINE_DB_URL", "").strip(),
             fetch_batch_days=fetch_batch_days,
+            extract_engine=extract_engine,
+            fetch_concurrency=max(1, _env_int("PIPELINE_FETCH_CONCURRENCY", 8)),
+            fetch_rate_per_second=fetch_rate if fetch_rate > 0 else None,
+            fetch_adaptive=_env_bool("PIPELINE_FETCH_ADAPTIVE", False),
+            fetch_target_seconds=max(
+                0.1, _env_float("PIPELINE_FETCH_TARGET_SECONDS", 5.0)
+            ),
+            fetch_min_days=fetch_min_days,
+            fetch_max_days=fetch_max_days,
+            fetch_stream_days=fetch_stream_days if fetch_stream_days > 0 else None,
+            fetch_hedge_percentile=hedge_percentile if hedge_percentile > 0 else None,
+            fetch_timeout_multiplier=(
+                timeout_multiplier if timeout_multiplier > 0 else None
+            ),
+            fetch_min_timeout=min(
+                max(0.1, _env_float("PIPELINE_FETCH_MIN_TIMEOUT", 5.0)),
+                fetch_max_timeout,
+            ),
+            fetch_max_timeout=fetch_max_timeout,
+            fetch_breaker_error_rate=(
+                breaker_error_rate if breaker_error_rate > 0 else None
+            ),
+            fetch_breaker_cooldown_seconds=max(
+                0.0, _env_float("PIPELINE_FETCH_BREAKER_COOLDOWN_SECONDS", 30.0)
+            ),
+            io_workers=max(0, _env_int("PIPELINE_IO_WORKERS", 0)),
+            io_queue_depth=max(1, _env_int("PIPELINE_IO_QUEUE_DEPTH", 64)),
+            store_cache_mb=max(1, _env_int("PIPELINE_STORE_CACHE_MB", 64)),
+            json_backend=json_backend,
+            metric_engine=metric_engine,
+            json_pretty=_env_bool("PIPELINE_JSON_PRETTY", False),
+            daemon_interval_seconds=max(
+                1.0, _env_float("PIPELINE_DAEMON_INTERVAL_SECONDS", 300.0)
+            ),
+            daemon_jitter_seconds=max(
+                0.0, _env_float("PIPELINE_DAEMON_JITTER_SECONDS", 30.0)
+            ),
+            daemon_lookback_days=max(0, _env_int("PIPELINE_DAEMON_LOOKBACK_DAYS", 3)),
+            serve_host=_env_str("PIPELINE_SERVE_HOST", "127.0.0.1"),
+            serve_port=_env_int("PIPELINE_SERVE_PORT", 8080),
+            serve_cache_mb=max(0, _env_int("PIPELINE_SERVE_CACHE_MB", 32)),
+            queue_lease_seconds=queue_lease_seconds,
+            queue_heartbeat_seconds=min(
+                queue_lease_seconds / 2,
+                max(0.1, _env_float("PIPELINE_QUEUE_HEARTBEAT_SECONDS", 30.0)),
+            ),
+            queue_max_attempts=max(1, _env_int("PIPELINE_QUEUE_MAX_ATTEMPTS", 3)),
+            sync_chunk_rows=max(1, _env_int("PIPELINE_SYNC_CHUNK_ROWS", 5000)),
+            profile_modes=parse_profile_modes(os.getenv("PIPELINE_PROFILE")),
             project_root=project_root,
             data_root=data_root,
             resources_root=resources_root,
             raw_root=data_root / "raw",
             proc_root=data_root / "processed",
             reports_root=data_root / "reports",
+            profiles_root=data_root / "profiles",
+            quarantine_root=data_root / "quarantine",
+            daemon_stats_path=data_root / "daemon" / "cycles.jsonl",
+            data_version_path=data_root / "version",
             db_root=db_root,
             sqlite_root=sqlite_root,
             pg_root=pg_root,
+            duckdb_root=duckdb_root,
             db_path=sqlite_root / "weather.db",
+            duckdb_path=duckdb_root / "weather.duckdb",
             sql_dir=resources_root / "sql",
             sqlite_sql_dir=resources_root / "sql" / "sqlite",
             pg_sql_dir=resources_root / "sql" / "pg",
+            duckdb_sql_dir=resources_root / "sql" / "duckdb",
             schema_sqlite=resources_root / "sql" / "sqlite" / "init.sql",
             schema_postgres=resources_root / "sql" / "pg" / "init.sql",
+            schema_duckdb=resources_root / "sql" / "duckdb" / "init.sql",
         )
 
 
@@ -138,3 +301,9 @@ METRIC_SQL_FILES = [
     "metrics_heatwave_streaks.sql",
     "metrics_sunshine_vs_temp.sql",
 ]
+
+
+ROLLUP_SQL_FILES = {
+    "month": "refresh_weather_monthly.sql",
+    "year": "refresh_weather_yearly.sql",
+}
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import random
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics import calculate_metrics, configured_metrics
+from src.config import ALL_DAILY_VARS, DB_BACKENDS, PipelineConfig
+from src.extract import OPEN_METEO_ARCHIVE_URL, fetch_daily_archive, make_retry_session
+from src.load import (
+    ensure_db_and_table,
+    load_rollup_statements,
+    load_upsert_statement,
+    make_artefact_writer,
+    split_save_and_upsert,
+)
+from src.pipeline import make_chunker, make_request_guard
+from src.utils import jsoncodec
+from src.utils.io import ensure_dir, utc_isoformat
+from src.utils.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CycleStats:
+    """Timings and counters for one daemon cycle, appended to the stats file."""
+
+    cycle: int
+    started_at: str
+    window_start: str | None = None
+    window_end: str | None = None
+    batches: int = 0
+    rows: int = 0
+    fetch_seconds: float = 0.0
+    load_seconds: float = 0.0
+    analytics_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+    requests: dict[str, int] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        window = (
+            f"{self.window_start} to {self.window_end}"
+            if self.window_start
+            else "nothing to fetch"
+        )
+        status = f"; failed: {self.error}" if self.error else ""
+        return (
+            f"Cycle {self.cycle} ({window}): {self.rows} rows in {self.batches} "
+            f"batch(es) in {self.elapsed_seconds:.2f}s "
+            f"(fetch {self.fetch_seconds:.2f}s, load {self.load_seconds:.2f}s, "
+            f"analytics {self.analytics_seconds:.2f}s)"
+            f"{status}"
+        )
+
+
+class PipelineDaemon:
+    """Run incremental pipeline cycles on a schedule with warm resources.
+
+    The database engine and its pool, the schema check, the UPSERT/rollup
+    statements, the retrying HTTP session, the adaptive chunker and the set of
+    variables the API rejected are created once and reused by every cycle. Each
+    cycle fetches from the latest loaded day minus ``daemon_lookback_days`` (the
+    archive revises recent days) up to today or ``end_date``, whichever is earlier,
+    and then rebuilds the reports; metrics whose inputs did not change are reused
+    from the previous report, and a cycle that changed no stored row keeps the
+    previous report as is (see :func:`src.analytics.calculate_metrics`).
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        *,
+        url: str = OPEN_METEO_ARCHIVE_URL,
+        today: Callable[[], date] | None = None,
+        rng: random.Random | None = None,
+        history_size: int = 100,
+    ):
+        self.config = config
+        self.url = url
+        self.history: deque[CycleStats] = deque(maxlen=history_size)
+        self._today = today or (lambda: datetime.now(ZoneInfo(config.timezone)).date())
+        self._rng = rng or random.Random()
+        self._stop = threading.Event()
+        self._cycles = 0
+        self._engine = None
+        self._session = None
+        self._upsert_stmt = None
+        self._rollup_stmts = None
+        self._chunker = None
+        self._guard = None
+        self._unsupported: set[str] = set()
+
+    def __enter__(self) -> "PipelineDaemon":
+        self.warm_up()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def warm_up(self) -> None:
+        """Create the long-lived resources shared by every cycle."""
+        if self._engine is not None:
+            return
+        started = time.perf_counter()
+        logger.info("JSON backend: %s", jsoncodec.set_backend(self.config.json_backend))
+        self._engine = ensure_db_and_table(self.config)
+        self._upsert_stmt = load_upsert_statement(self.config)
+        self._rollup_stmts = load_rollup_statements(self.config)
+        self._session = make_retry_session()
+        self._chunker = make_chunker(self.config)
+        self._guard = make_request_guard(self.config)
+        ensure_dir(self.config.daemon_stats_path.parent)
+        logger.info("Daemon resources ready in %.2fs", time.perf_counter() - started)
+
+    def close(self) -> None:
+        """Release the HTTP session and database pool."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._guard is not None:
+            logger.info("Archive requests: %s", self._guard.counters.summary())
+            self._guard.close()
+            self._guard = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+        if self.history:
+            elapsed = [stats.elapsed_seconds for stats in self.history]
+            logger.info(
+                "Daemon stopped after %d cycle(s); recent cycles mean %.2fs, max %.2fs",
+                self._cycles,
+                sum(elapsed) / len(elapsed),
+                max(elapsed),
+            )
+
+    def request_stop(self) -> None:
+        """Ask :meth:`serve` to exit once the current cycle has finished."""
+        self._stop.set()
+
+    def install_signal_handlers(self) -> None:
+        """Stop gracefully on SIGTERM/SIGINT; a second signal interrupts immediately."""
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._handle_signal)
+
+    def _handle_signal(self, signum, _frame) -> None:
+        if self._stop.is_set():
+            raise KeyboardInterrupt
+        logger.info(
+            "Received %s; finishing the current cycle before exiting",
+            signal.Signals(signum).name,
+        )
+        self._stop.set()
+
+    def latest_loaded_day(self) -> date | None:
+        """Return the most recent ``weather_daily`` date, or ``None`` when empty."""
+        from sqlalchemy import text
+
+        with self._engine.connect() as conn:
+            value = conn.execute(text("SELECT MAX(date) FROM weather_daily")).scalar()
+        return None if value is None else date.fromisoformat(str(value)[:10])
+
+    def incremental_window(self) -> tuple[str, str] | None:
+        """Return the inclusive date range the next cycle should fetch, if any."""
+        start = date.fromisoformat(self.config.start_date)
+        end = min(date.fromisoformat(self.config.end_date), self._today())
+        latest = self.latest_loaded_day()
+        if latest is not None:
+            lookback = timedelta(days=self.config.daemon_lookback_days)
+            start = max(start, latest - lookback)
+        if start > end:
+            return None
+        return start.isoformat(), end.isoformat()
+
+    def run_cycle(self) -> CycleStats:
+        """Run one fetch/load/analytics cycle; failures are recorded, not raised."""
+        self.warm_up()
+        self._cycles += 1
+        stats = CycleStats(cycle=self._cycles, started_at=utc_isoformat())
+        started = time.perf_counter()
+        try:
+            window = self.incremental_window()
+            if window is not None:
+                stats.window_start, stats.window_end = window
+                self._extract_and_load(stats, *window)
+            analytics_started = time.perf_counter()
+            calculate_metrics(
+                self.config, configured_metrics(self.config), engine=self._engine
+            )
+            stats.analytics_seconds = time.perf_counter() - analytics_started
+        except Exception as exc:
+            logger.exception("Cycle %d failed", stats.cycle)
+            stats.error = f"{type(exc).__name__}: {exc}"
+        stats.elapsed_seconds = time.perf_counter() - started
+        self.history.append(stats)
+        self._record(stats)
+        return stats
+
+    def _extract_and_load(self, stats: CycleStats, start: str, end: str) -> None:
+        if self._guard is None:
+            self._fetch_and_upsert(stats, start, end)
+            return
+        before = self._guard.counters.as_dict()
+        try:
+            self._fetch_and_upsert(stats, start, end)
+        finally:
+            stats.requests = {
+                name: value - before[name]
+                for name, value in self._guard.counters.as_dict().items()
+            }
+
+    def _fetch_and_upsert(self, stats: CycleStats, start: str, end: str) -> None:
+        fetch_started = time.perf_counter()
+        _, batches = fetch_daily_archive(
+            latitude=self.config.latitude,
+            longitude=self.config.longitude,
+            start_date=start,
+            end_date=end,
+            timezone=self.config.timezone,
+            daily_vars=ALL_DAILY_VARS,
+            batch_days=self.config.fetch_batch_days,
+            adaptive=self._chunker,
+            url=self.url,
+            session=self._session,
+            skip_daily=self._unsupported,
+            stream_window_days=self.config.fetch_stream_days,
+            guard=self._guard,
+        )
+        stats.fetch_seconds += time.perf_counter() - fetch_started
+
+        with make_artefact_writer(self.config) as writer:
+            while True:
+                fetch_started = time.perf_counter()
+                batch = next(batches, None)
+                stats.fetch_seconds += time.perf_counter() - fetch_started
+                if batch is None:
+                    break
+                self._unsupported.update(batch.get("_dropped_daily", []))
+                load_started = time.perf_counter()
+                stats.rows += split_save_and_upsert(
+                    batch,
+                    self.config,
+                    engine=self._engine,
+                    upsert_stmt=self._upsert_stmt,
+                    writer=writer,
+                    rollup_stmts=self._rollup_stmts,
+                )
+                stats.batches += 1
+                stats.load_seconds += time.perf_counter() - load_started
+
+    def _record(self, stats: CycleStats) -> None:
+        logger.info("%s", stats.summary())
+        with open(self.config.daemon_stats_path, "ab") as handle:
+            handle.write(jsoncodec.dumps(asdict(stats)) + b"\n")
+
+    def next_delay(self, cycle_started: float) -> float:
+        """Return seconds until the next cycle, at a fixed rate plus random jitter."""
+        jitter = self._rng.uniform(
+            -self.config.daemon_jitter_seconds, self.config.daemon_jitter_seconds
+        )
+        deadline = cycle_started + self.config.daemon_interval_seconds + jitter
+        return max(0.0, deadline - time.monotonic())
+
+    def serve(self, max_cycles: int | None = None) -> None:
+        """Run cycles until stopped (or ``max_cycles`` have run), then clean up.
+
+        The first cycle starts after a random delay of up to the jitter so that
+        daemons started together do not hit the API in lockstep.
+        """
+        self.warm_up()
+        try:
+            if self._stop.wait(self._rng.uniform(0, self.config.daemon_jitter_seconds)):
+                return
+            while not self._stop.is_set():
+                cycle_started = time.monotonic()
+                self.run_cycle()
+                if max_cycles is not None and self._cycles >= max_cycles:
+                    break
+                delay = self.next_delay(cycle_started)
+                logger.info("Next cycle in %.1fs", delay)
+                if self._stop.wait(delay):
+                    break
+        finally:
+            self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for the long-running incremental pipeline service."""
+    parser = argparse.ArgumentParser(
+        description="Keep weather_daily up to date with scheduled incremental runs"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DB_BACKENDS,
+        help="Override backend (defaults to env-configured backend)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        help="Seconds between cycle starts "
+        "(defaults to PIPELINE_DAEMON_INTERVAL_SECONDS)",
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        help="Random +/- seconds added to each interval "
+        "(defaults to PIPELINE_DAEMON_JITTER_SECONDS)",
+    )
+    parser.add_argument(
+        "--cycles",
+        type=int,
+        default=None,
+        help="Exit after this many cycles (default: run until SIGTERM/SIGINT)",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    config = PipelineConfig.from_env()
+    if args.backend and args.backend != config.db_backend:
+        config = replace(config, db_backend=args.backend)
+    if args.interval is not None:
+        config = replace(config, daemon_interval_seconds=max(1.0, args.interval))
+    if args.jitter is not None:
+        config = replace(config, daemon_jitter_seconds=max(0.0, args.jitter))
+
+    daemon = PipelineDaemon(config)
+    daemon.install_signal_handlers()
+    daemon.serve(max_cycles=args.cycles)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,14 +10,13 @@ from pathlib import Path
 if __package__ is None or __package__ == "":  # pragma: no cover
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-import pandas as pd
-from sqlalchemy import inspect, text
-
-from src.config import PipelineConfig
+from src.config import DB_BACKENDS, PipelineConfig
 from src.load import get_db_engine
 
 logger = logging.getLogger(__name__)
 
+DUMP_SUBDIRS = {"sqlite": "sqlite", "postgres": "pg", "duckdb": "duckdb"}
+
 
 def _timestamped_filename(suffix: str) -> str:
     """Return an ISO-like filename for the exported dataset."""
@@ -27,6 +26,9 @@ def _timestamped_filename(suffix: str) -> str:
 
 def dump_table(config: PipelineConfig, output_root: Path) -> Path:
     """Dump the ``weather_daily`` table to a CSV file and return the path."""
+    import pandas as pd
+    from sqlalchemy import inspect, text
+
     engine = get_db_engine(config)
     inspector = inspect(engine)
     if not inspector.has_table("weather_daily"):
@@ -34,7 +36,7 @@ def dump_table(config: PipelineConfig, output_root: Path) -> Path:
             "Table 'weather_daily' does not exist in the configured database"
         )
 
-    out_dir = output_root / ("sqlite" if config.db_backend == "sqlite" else "pg")
+    out_dir = output_root / DUMP_SUBDIRS[config.db_backend]
     out_dir.mkdir(parents=True, exist_ok=True)
 
     dump_path = out_dir / _timestamped_filename("csv")
@@ -55,7 +57,7 @@ def main() -> None:
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
     parser = argparse.ArgumentParser(
-        description="Dump weather_daily table to CSV in db/sqlite or db/pg"
+        description="Dump weather_daily table to CSV in db/sqlite, db/pg or db/duckdb"
     )
     config = PipelineConfig.from_env()
 
@@ -63,17 +65,17 @@ def main() -> None:
         "--output-root",
         type=Path,
         default=config.db_root,
-        help="Directory that will contain pg/ or sqlite/ dump folders",
+        help="Directory that will contain the pg/, sqlite/ or duckdb/ dump folders",
     )
     parser.add_argument(
         "--backend",
-        choices=("sqlite", "postgres"),
+        choices=DB_BACKENDS,
         help="Override backend (defaults to env-configured backend)",
     )
 
     args = parser.parse_args()
     backend = (args.backend or config.db_backend).lower()
-    if backend not in {"sqlite", "postgres"}:
+    if backend not in DB_BACKENDS:
         raise ValueError(f"Unsupported backend for dump: {backend}")
 
     if backend != config.db_backend:
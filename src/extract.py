@@ -3,34 +3,38 @@ from __future__ import annotations
 import json
 import logging
 import re
+import time
 from datetime import date, timedelta
 from itertools import chain
-from typing import Iterator
+from typing import Iterable, Iterator
 
-import requests
-from requests.adapters import HTTPAdapter
-from requests.exceptions import RetryError
-from urllib3.util.retry import Retry
+from src.utils import jsoncodec
+from src.utils.jsonstream import spool_archive
+from src.utils.resilience import CircuitOpenError, RequestGuard
 
 logger = logging.getLogger(__name__)
 
 OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+STREAM_CHUNK_BYTES = 64 * 1024
 
 
-def http_get_with_retries(
-    url: str, params: dict, max_attempts: int = 5, timeout: int = 60
-):
-    """Perform an HTTP GET with retry/backoff semantics."""
+def make_retry_session(max_attempts: int = 5):
+    """Return a ``requests.Session`` that retries idempotent GETs with backoff."""
     if max_attempts < 1:
         raise ValueError("max_attempts must be at least 1")
 
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
     retry = Retry(
         total=max_attempts - 1,
         connect=max_attempts - 1,
         read=max_attempts - 1,
         status=max_attempts - 1,
         allowed_methods=("GET",),
-        status_forcelist=(429, 500, 502, 503, 504),
+        status_forcelist=RETRY_STATUSES,
         backoff_factor=1,
         respect_retry_after_header=True,
         raise_on_status=False,
@@ -40,13 +44,43 @@ def http_get_with_retries(
     session = requests.Session()
     session.mount("https://", adapter)
     session.mount("http://", adapter)
+    return session
+
+
+def http_get_with_retries(
+    url: str,
+    params: dict,
+    max_attempts: int = 5,
+    timeout: int = 60,
+    *,
+    session=None,
+    stream: bool = False,
+    guard: RequestGuard | None = None,
+):
+    """Perform an HTTP GET with retry/backoff semantics.
+
+    ``session`` (from :func:`make_retry_session`) keeps connections alive across
+    calls; without it a private session is created and closed per request.
+    ``stream`` defers reading the body (see ``requests``' ``stream`` argument).
+    With a ``guard`` the request may be hedged, its timeout follows observed
+    latency instead of ``timeout``, and it fails fast with
+    :class:`~src.utils.resilience.CircuitOpenError` while the breaker is open.
+    """
+    from requests.exceptions import RetryError
+
+    owns_session = session is None
+    if owns_session:
+        session = make_retry_session(max_attempts)
 
     try:
-        return session.get(url, params=params, timeout=timeout)
+        if guard is not None:
+            return guard.get(session, url, params, stream=stream)
+        return session.get(url, params=params, timeout=timeout, stream=stream)
     except RetryError as exc:
         raise RuntimeError("Exhausted retries for HTTP GET") from exc
     finally:
-        session.close()
+        if owns_session:
+            session.close()
 
 
 def parse_unknown_daily_vars(error_text: str) -> set[str]:
@@ -88,6 +122,86 @@ def _iter_date_chunks(start_date: str, end_date: str, chunk_days: int | None):
         current = chunk_end + timedelta(days=1)
 
 
+class AdaptiveChunker:
+    """Size each archive request from the latency and payload size of earlier ones.
+
+    The span starts at ``initial_days`` and is re-estimated after every successful
+    chunk so that a request takes about ``target_seconds`` and returns at most
+    ``target_bytes``, growing by no more than ``max_growth`` per step and staying
+    within ``[min_days, max_days]``. When a chunk fails after the HTTP layer's own
+    retries, the span is halved and the same start date is retried.
+
+    :meth:`iter_chunks` only advances past a chunk once :meth:`record_success` has
+    been called for it; callers must report every chunk through
+    :meth:`record_success` or :meth:`record_failure`.
+    """
+
+    def __init__(
+        self,
+        initial_days: int = 30,
+        *,
+        min_days: int = 1,
+        max_days: int = 366,
+        target_seconds: float = 5.0,
+        target_bytes: int = 8 * 1024 * 1024,
+        max_growth: float = 2.0,
+        smoothing: float = 0.5,
+    ):
+        if min_days < 1 or max_days < min_days:
+            raise ValueError("Require 1 <= min_days <= max_days")
+        self.min_days = min_days
+        self.max_days = max_days
+        self.target_seconds = target_seconds
+        self.target_bytes = target_bytes
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+        self.span_days = min(max(initial_days, min_days), max_days)
+        self.seconds_per_day: float | None = None
+        self.bytes_per_day: float | None = None
+        self._completed = False
+
+    def iter_chunks(self, start_date: str, end_date: str) -> Iterator[tuple[str, str]]:
+        """Yield inclusive date ranges sized by the current span estimate."""
+        current = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        while current <= end:
+            chunk_end = min(current + timedelta(days=self.span_days - 1), end)
+            self._completed = False
+            yield current.isoformat(), chunk_end.isoformat()
+            if self._completed:
+                current = chunk_end + timedelta(days=1)
+
+    def record_success(self, days: int, elapsed: float, payload_bytes: int) -> None:
+        """Fold a successful chunk's timings into the estimate and resize the span."""
+        self._completed = True
+        days = max(days, 1)
+        self.seconds_per_day = self._smooth(self.seconds_per_day, elapsed / days)
+        self.bytes_per_day = self._smooth(self.bytes_per_day, payload_bytes / days)
+
+        ideal = self.target_seconds / max(self.seconds_per_day, 1e-6)
+        if self.bytes_per_day > 0:
+            ideal = min(ideal, self.target_bytes / self.bytes_per_day)
+        ideal = min(ideal, self.span_days * self.max_growth)
+        self.span_days = int(min(max(ideal, self.min_days), self.max_days))
+
+    def record_failure(self) -> bool:
+        """Halve the span after a failed chunk; return ``False`` if it cannot shrink."""
+        self._completed = False
+        if self.span_days <= self.min_days:
+            return False
+        self.span_days = max(self.min_days, self.span_days // 2)
+        return True
+
+    def _smooth(self, previous: float | None, sample: float) -> float:
+        if previous is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * previous
+
+
+def _chunk_days(chunk_start: str, chunk_end: str) -> int:
+    return (date.fromisoformat(chunk_end) - date.fromisoformat(chunk_start)).days + 1
+
+
 def fetch_daily_archive(
     latitude: float,
     longitude: float,
@@ -97,19 +211,57 @@ def fetch_daily_archive(
     daily_vars,
     *,
     batch_days: int | None,
+    adaptive: AdaptiveChunker | None = None,
+    max_attempts: int = 5,
+    url: str = OPEN_METEO_ARCHIVE_URL,
+    session=None,
+    skip_daily: Iterable[str] = (),
+    stream_window_days: int | None = None,
+    guard: RequestGuard | None = None,
 ):
-    """Stream Open-Meteo archive payloads for the given co-ordinates and dates."""
-    remaining_variables = list(daily_vars)
-    removed_all: set[str] = set()
+    """Stream Open-Meteo archive payloads for the given co-ordinates and dates.
+
+    With ``adaptive`` set, chunk spans come from the :class:`AdaptiveChunker`
+    instead of the fixed ``batch_days`` split, and failed chunks are retried at a
+    smaller span. ``session`` is reused for every request, and variables in
+    ``skip_daily`` (rejected by an earlier run) are reported as dropped without
+    asking the API again. With ``stream_window_days`` set, each response body is
+    parsed incrementally (see :mod:`src.utils.jsonstream`) and yielded as payloads
+    of at most that many days, so memory no longer grows with the chunk span.
+    Requests go through ``guard`` when given; while its circuit breaker is open,
+    fetching pauses until a probe is allowed, up to ``max_attempts`` times per
+    chunk, before the :class:`~src.utils.resilience.CircuitOpenError` is raised.
+    """
+    removed_all: set[str] = set(skip_daily) & set(daily_vars)
+    remaining_variables = [
+        variable for variable in daily_vars if variable not in removed_all
+    ]
     requested_daily = list(daily_vars)
     accepted_daily: list[str] | None = None
 
     def chunk_generator() -> Iterator[dict]:
+        nonlocal remaining_variables, removed_all, accepted_daily, session
+        # A streamed body is read after the request returns, so it needs a session
+        # that outlives the call to http_get_with_retries.
+        owns_session = stream_window_days is not None and session is None
+        if owns_session:
+            session = make_retry_session(max_attempts)
+        try:
+            yield from fetch_chunks()
+        finally:
+            if owns_session:
+                session.close()
+
+    def fetch_chunks() -> Iterator[dict]:
         nonlocal remaining_variables, removed_all, accepted_daily
-        for chunk_start, chunk_end in _iter_date_chunks(
-            start_date, end_date, batch_days
-        ):
+        chunks = (
+            adaptive.iter_chunks(start_date, end_date)
+            if adaptive is not None
+            else _iter_date_chunks(start_date, end_date, batch_days)
+        )
+        for chunk_start, chunk_end in chunks:
             logger.info("Fetching archive chunk %s to %s", chunk_start, chunk_end)
+            pauses = 0
             while True:
                 params = {
                     "latitude": latitude,
@@ -119,19 +271,72 @@ def fetch_daily_archive(
                     "timezone": timezone,
                     "daily": ",".join(remaining_variables),
                 }
-                response = http_get_with_retries(OPEN_METEO_ARCHIVE_URL, params=params)
+                started = time.perf_counter()
+                try:
+                    response = http_get_with_retries(
+                        url,
+                        params=params,
+                        max_attempts=max_attempts,
+                        session=session,
+                        stream=stream_window_days is not None,
+                        guard=guard,
+                    )
+                except CircuitOpenError as exc:
+                    pauses += 1
+                    if pauses > max_attempts:
+                        raise
+                    guard.counters.pauses += 1
+                    logger.warning(
+                        "%s; pausing before chunk %s to %s",
+                        exc,
+                        chunk_start,
+                        chunk_end,
+                    )
+                    time.sleep(exc.retry_after)
+                    continue
+                except (RuntimeError, OSError) as exc:
+                    if adaptive is None or not adaptive.record_failure():
+                        raise
+                    logger.warning(
+                        "Chunk %s to %s failed (%s); retrying with %d-day spans",
+                        chunk_start,
+                        chunk_end,
+                        exc,
+                        adaptive.span_days,
+                    )
+                    break
                 if response.status_code == 200:
                     accepted_daily = list(remaining_variables)
-                    response_data = response.json()
-                    response_data["_requested_daily"] = requested_daily
-                    response_data["_accepted_daily"] = accepted_daily
-                    response_data["_dropped_daily"] = sorted(removed_all)
-                    yield response_data
+                    archive = None
+                    if stream_window_days is None:
+                        payloads = [jsoncodec.loads(response.content)]
+                        size = len(response.content)
+                    else:
+                        archive = spool_archive(
+                            response.iter_content(STREAM_CHUNK_BYTES)
+                        )
+                        payloads = archive.iter_windows(stream_window_days)
+                        size = archive.bytes_read
+                    if adaptive is not None:
+                        adaptive.record_success(
+                            _chunk_days(chunk_start, chunk_end),
+                            time.perf_counter() - started,
+                            size,
+                        )
+                    try:
+                        for response_data in payloads:
+                            response_data["_requested_daily"] = requested_daily
+                            response_data["_accepted_daily"] = accepted_daily
+                            response_data["_dropped_daily"] = sorted(removed_all)
+                            yield response_data
+                    finally:
+                        if archive is not None:
+                            archive.close()
                     break
 
                 if response.status_code == 400:
                     try:
-                        payload = response.json()
+                        payload = jsoncodec.loads(response.content)
                         err_text = json.dumps(payload)
                     except Exception:
                         err_text = response.text or ""
@@ -152,8 +357,22 @@ def fetch_daily_archive(
                         )
                     continue
 
+                if (
+                    adaptive is not None
+                    and response.status_code in RETRY_STATUSES
+                    and adaptive.record_failure()
+                ):
+                    logger.warning(
+                        "Chunk %s to %s failed with HTTP %s; retrying with %d-day spans",
+                        chunk_start,
+                        chunk_end,
+                        response.status_code,
+                        adaptive.span_days,
+                    )
+                    break
+
                 try:
-                    response_message = response.json()
+                    response_message = jsoncodec.loads(response.content)
                 except Exception:
                     response_message = response.text
                 raise RuntimeError(
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Iterable
+
+from src.extract import (
+    OPEN_METEO_ARCHIVE_URL,
+    RETRY_STATUSES,
+    _iter_date_chunks,
+    parse_unknown_daily_vars,
+)
+from src.utils import jsoncodec
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 120.0
+
+Location = tuple[float, float]
+
+
+def backoff_delay(attempt: int, backoff_factor: float) -> float:
+    """Return the sleep before retry ``attempt`` using urllib3's exponential schedule."""
+    if attempt <= 1:
+        return 0.0
+    return min(backoff_factor * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Interpret a ``Retry-After`` header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class TokenBucket:
+    """Asynchronous token bucket that admits at most ``rate`` requests per second."""
+
+    def __init__(
+        self, rate: float, capacity: float | None = None, *, clock=time.monotonic
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncArchiveExtractor:
+    """Fetch archive chunks for many locations concurrently on a single event loop.
+
+    Semantics match :func:`src.extract.fetch_daily_archive`: unsupported variables
+    reported through HTTP 400 are dropped for every subsequent request, transient
+    statuses are retried with exponential backoff honouring ``Retry-After``, and each
+    payload carries the ``_requested_daily``/``_accepted_daily``/``_dropped_daily``
+    metadata keys expected by the load stage.
+    """
+
+    def __init__(
+        self,
+        daily_vars: Iterable[str],
+        *,
+        timezone: str,
+        batch_days: int | None,
+        max_concurrency: int = 8,
+        rate_per_second: float | None = None,
+        max_attempts: int = 5,
+        backoff_factor: float = 1.0,
+        timeout: float = 60,
+        url: str = OPEN_METEO_ARCHIVE_URL,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.requested_daily = list(daily_vars)
+        self.timezone = timezone
+        self.batch_days = batch_days
+        self.max_concurrency = max_concurrency
+        self.rate_per_second = rate_per_second
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.url = url
+        self._remaining = list(self.requested_daily)
+        self._removed: set[str] = set()
+
+    @property
+    def metadata(self) -> dict:
+        """Variable negotiation state in the shape returned by the sync extractor."""
+        return {
+            "_requested_daily": list(self.requested_daily),
+            "_accepted_daily": list(self._remaining),
+            "_dropped_daily": sorted(self._removed),
+        }
+
+    async def iter_batches(
+        self, locations: Iterable[Location], start_date: str, end_date: str
+    ) -> AsyncIterator[tuple[Location, dict]]:
+        """Yield ``(location, payload)`` pairs as chunks complete, in completion order."""
+        try:
+            import aiohttp
+        except ImportError as exc:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "The async extract engine requires the optional 'aiohttp' package"
+            ) from exc
+
+        jobs: asyncio.Queue = asyncio.Queue()
+        for location in locations:
+            for chunk in _iter_date_chunks(start_date, end_date, self.batch_days):
+                jobs.put_nowait((location, chunk))
+        if jobs.empty():
+            return
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        bucket = TokenBucket(self.rate_per_second) if self.rate_per_second else None
+        worker_count = min(self.max_concurrency, jobs.qsize())
+        done = object()
+
+        async def worker(session) -> None:
+            try:
+                while True:
+                    try:
+                        location, (chunk_start, chunk_end) = jobs.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    payload = await self._fetch_chunk(
+                        session, bucket, location, chunk_start, chunk_end
+                    )
+                    await results.put((location, payload))
+            except Exception as exc:
+                await results.put(exc)
+            finally:
+                await results.put(done)
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=timeout
+        ) as session:
+            workers = [
+                asyncio.create_task(worker(session)) for _ in range(worker_count)
+            ]
+            try:
+                finished = 0
+                while finished < worker_count:
+                    item = await results.get()
+                    if item is done:
+                        finished += 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _fetch_chunk(
+        self,
+        session,
+        bucket: TokenBucket | None,
+        location: Location,
+        chunk_start: str,
+        chunk_end: str,
+    ) -> dict:
+        """Fetch a single chunk, negotiating variables and retrying transient errors."""
+        import aiohttp
+
+        latitude, longitude = location
+        attempt = 0
+        logger.info(
+            "Fetching archive chunk %s to %s for %s,%s",
+            chunk_start,
+            chunk_end,
+            latitude,
+            longitude,
+        )
+        while True:
+            variables = list(self._remaining)
+            params = {
+                "latitude": latitude,
+                "longitude": longitude,
+                "start_date": chunk_start,
+                "end_date": chunk_end,
+                "timezone": self.timezone,
+                "daily": ",".join(variables),
+            }
+            if bucket is not None:
+                await bucket.acquire()
+            try:
+                async with session.get(self.url, params=params) as response:
+                    status = response.status
+                    body = await response.read()
+                    retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                attempt += 1
+                if attempt >= self.max_attempts:
+                    raise RuntimeError("Exhausted retries for HTTP GET") from exc
+                await asyncio.sleep(backoff_delay(attempt, self.backoff_factor))
+                continue
+
+            if status == 200:
+                payload = jsoncodec.loads(body)
+                payload["_requested_daily"] = list(self.requested_daily)
+                payload["_accepted_daily"] = variables
+                payload["_dropped_daily"] = sorted(self._removed)
+                return payload
+
+            text = body.decode("utf-8", errors="replace")
+            if status == 400:
+                try:
+                    err_text = json.dumps(json.loads(text))
+                except ValueError:
+                    err_text = text
+                unknown = parse_unknown_daily_vars(err_text)
+                if not unknown:
+                    raise RuntimeError(
+                        f"Open-Meteo 400 error: {err_text or 'Bad Request'}"
+                    )
+                self._removed.update(unknown)
+                self._remaining = [
+                    variable for variable in self._remaining if variable not in unknown
+                ]
+                if not self._remaining:
+                    raise RuntimeError(
+                        f"All daily variables were rejected by the API. Error: {err_text}"
+                    )
+                continue
+
+            if status in RETRY_STATUSES:
+                attempt += 1
+                if attempt < self.max_attempts:
+                    delay = parse_retry_after(retry_after)
+                    if delay is None:
+                        delay = backoff_delay(attempt, self.backoff_factor)
+                    await asyncio.sleep(min(delay, MAX_BACKOFF_SECONDS))
+                    continue
+
+            raise RuntimeError(f"Open-Meteo error {status}: {text}")
+
+
+async def fetch_daily_archive_async(
+    latitude: float,
+    longitude: float,
+    start_date: str,
+    end_date: str,
+    timezone: str,
+    daily_vars,
+    *,
+    batch_days: int | None,
+    max_concurrency: int = 8,
+    rate_per_second: float | None = None,
+    url: str = OPEN_METEO_ARCHIVE_URL,
+) -> AsyncIterator[dict]:
+    """Async counterpart of :func:`src.extract.fetch_daily_archive` for one location."""
+    extractor = AsyncArchiveExtractor(
+        daily_vars,
+        timezone=timezone,
+        batch_days=batch_days,
+        max_concurrency=max_concurrency,
+        rate_per_second=rate_per_second,
+        url=url,
+    )
+    async for _, payload in extractor.iter_batches(
+        [(latitude, longitude)], start_date, end_date
+    ):
+        yield payload
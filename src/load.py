@@ -1,28 +1,83 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
-import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import URL
-
-from src.config import PipelineConfig, _env_int, _env_str
-from src.transform import transform_to_dataframe
+from src.config import ROLLUP_SQL_FILES, PipelineConfig, _env_int, _env_str
+from src.store import invalidate_days
+from src.transform import records_to_dataframe, transform_day_payload
+from src.utils import jsoncodec
 from src.utils.io import (
+    ArtefactWriter,
+    bump_data_version,
     ensure_dir,
-    ensure_proc_outpath,
-    ensure_raw_outpath,
     load_sql_file,
+    proc_outpath,
+    raw_outpath,
     utc_isoformat,
 )
+from src.validate import quarantine_invalid_rows
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+NUMERIC_COLUMNS = [
+    "temp_max_c",
+    "temp_min_c",
+    "temp_max_f",
+    "temp_min_f",
+    "app_temp_max_c",
+    "app_temp_min_c",
+    "precip_mm",
+    "rain_mm",
+    "showers_mm",
+    "snowfall_mm",
+    "precip_hours",
+    "daylight_sec",
+    "sunshine_sec",
+    "shortwave_radiation_mj_m2",
+    "wind_max_kmh",
+    "wind_gust_max_kmh",
+    "wind_dir_deg",
+    "weather_code",
+    "et0_mm",
+    "uv_index_max",
+    "uv_index_clear_sky_max",
+]
+
+# Dates are compared in slices so the IN list stays within every driver's limit.
+CONTENT_DAYS_PER_QUERY = 500
+
+READ_TABLE_VERSION_SQL = (
+    "SELECT version FROM table_versions WHERE table_name = :table_name"
+)
+
+BUMP_TABLE_VERSION_SQL = """
+UPDATE table_versions SET version = :version, updated_at = :now
+WHERE table_name = :table_name
+"""
+
+_BATCH_ONLY_KEYS = (
+    "daily",
+    "hourly",
+    "current",
+    "_requested_daily",
+    "_accepted_daily",
+    "_dropped_daily",
+)
+
 
 def get_db_engine(config: PipelineConfig):
     """Return a SQLAlchemy engine for the configured backend."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import URL
+
     if config.db_backend == "sqlite":
         ensure_dir(config.db_path.parent)
         return create_engine(f"sqlite:///{config.db_path}", future=True)
@@ -47,17 +102,27 @@ def get_db_engine(config: PipelineConfig):
         )
         return create_engine(url, future=True)
 
+    if config.db_backend == "duckdb":
+        try:
+            import duckdb_engine  # noqa: F401
+        except ImportError as exc:  # pragma: no cover - depends on the environment
+            raise RuntimeError(
+                "The duckdb backend requires the optional 'duckdb' and "
+                "'duckdb-engine' packages"
+            ) from exc
+        ensure_dir(config.duckdb_path.parent)
+        return create_engine(f"duckdb:///{config.duckdb_path}", future=True)
+
     raise ValueError(f"Unsupported database backend: {config.db_backend}")
 
 
 def ensure_db_and_table(config: PipelineConfig, engine=None):
     """Create the database (if needed) and ensure the weather table exists."""
     engine = engine or get_db_engine(config)
-    schema_path = (
-        config.schema_sqlite
-        if config.db_backend == "sqlite"
-        else config.schema_postgres
-    )
+    schema_path = {
+        "sqlite": config.schema_sqlite,
+        "duckdb": config.schema_duckdb,
+    }.get(config.db_backend, config.schema_postgres)
     schema_text = schema_path.read_text(encoding="utf-8")
 
     with engine.begin() as conn:
@@ -65,73 +130,350 @@ def ensure_db_and_table(config: PipelineConfig, engine=None):
         dbapi_conn = getattr(raw, "driver_connection", raw)
         if config.db_backend == "sqlite":
             dbapi_conn.executescript(schema_text)
+        elif config.db_backend == "duckdb":
+            dbapi_conn.execute(schema_text)
         else:
             with dbapi_conn.cursor() as cursor:
                 cursor.execute(schema_text)
 
+    _backfill_empty_rollups(config, engine)
     return engine
 
 
+def _backfill_empty_rollups(config: PipelineConfig, engine) -> None:
+    """Populate the rollup tables from ``weather_daily`` when either one is empty.
+
+    The check only reads; a write transaction is opened just for the backfill.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        has_daily, has_monthly, has_yearly = (
+            conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() is not None
+            for table in ("weather_daily", "weather_monthly", "weather_yearly")
+        )
+    if has_daily and not (has_monthly and has_yearly):
+        logger.info("Backfilling weather_monthly/weather_yearly from weather_daily")
+        with engine.begin() as conn:
+            refresh_rollups(conn, load_rollup_statements(config))
+
+
 def load_upsert_statement(config: PipelineConfig):
-    """Load the parametrised UPSERT statement for the ``weather_daily`` table."""
-    return text(load_sql_file(config, "upsert_weather_daily.sql"))
+    """Load the UPSERT statement for the ``weather_daily`` table.
+
+    SQLite and Postgres share a parametrised per-row statement; DuckDB uses a
+    set-based statement over the batch relation (see :func:`upsert_frame`).
+    """
+    from sqlalchemy import text
+
+    backend = "duckdb" if config.db_backend == "duckdb" else None
+    return text(load_sql_file(config, "upsert_weather_daily.sql", backend=backend))
+
+
+def load_rollup_statements(config: PipelineConfig) -> dict:
+    """Load the backend-specific rollup refresh statements keyed by granularity."""
+    from sqlalchemy import text
+
+    return {
+        granularity: text(load_sql_file(config, filename, backend=config.db_backend))
+        for granularity, filename in ROLLUP_SQL_FILES.items()
+    }
+
+
+def rollup_periods(days: Iterable[str], granularity: str) -> list[dict]:
+    """Return half-open ``period_start``/``period_end`` bounds covering ``days``."""
+    starts: set[date] = set()
+    for day in days:
+        parsed = date.fromisoformat(str(day)[:10])
+        if granularity == "month":
+            starts.add(parsed.replace(day=1))
+        elif granularity == "year":
+            starts.add(parsed.replace(month=1, day=1))
+        else:
+            raise ValueError(f"Unsupported rollup granularity: {granularity}")
+
+    periods = []
+    for start in sorted(starts):
+        if granularity == "year":
+            end = start.replace(year=start.year + 1)
+        elif start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+        periods.append(
+            {"period_start": start.isoformat(), "period_end": end.isoformat()}
+        )
+    return periods
+
+
+def refresh_rollups(
+    conn, rollup_stmts: dict, days: Iterable[str] | None = None
+) -> None:
+    """Recompute the rollup rows for the months/years containing ``days``.
+
+    With ``days=None`` every rollup row is rebuilt from ``weather_daily``.
+    """
+    days = list(days) if days is not None else None
+    for granularity, statement in rollup_stmts.items():
+        if days is None:
+            params = [{"period_start": "0001-01-01", "period_end": "9999-12-31"}]
+        else:
+            params = rollup_periods(days, granularity)
+        if params:
+            conn.execute(statement, params)
 
 
 def df_rows_for_upsert(data_frame: pd.DataFrame):
-    """Yield serialisable mappings for the provided single-row ``DataFrame``."""
-    record = data_frame.iloc[0].to_dict()
+    """Yield serialisable UPSERT mappings for every row of ``data_frame``."""
+    import pandas as pd
+
+    ingested_at = utc_isoformat()
+    for record in data_frame.to_dict(orient="records"):
+        record["date"] = (
+            pd.to_datetime(record.get("date"), errors="coerce").date().isoformat()
+            if record.get("date")
+            else None
+        )
+
+        for ts_col in ("sunrise", "sunset"):
+            value = record.get(ts_col)
+            if pd.isna(value):
+                record[ts_col] = None
+            elif hasattr(value, "isoformat"):
+                record[ts_col] = value.isoformat()
+            else:
+                record[ts_col] = str(value)
+
+        for column in NUMERIC_COLUMNS:
+            value = record.get(column)
+            if pd.isna(value):
+                record[column] = None
+                continue
+            if column == "weather_code":
+                record[column] = int(value)
+            else:
+                record[column] = float(value)
+
+        record["source"] = "open-meteo"
+        record["ingested_at"] = ingested_at
+        yield record
+
+
+def require_single_location(
+    locations: Iterable[tuple[float, float]],
+) -> tuple[float, float]:
+    """Return the only location in ``locations`` or raise ``ValueError``.
+
+    ``weather_daily`` and the raw/processed artefacts are keyed by date alone, so
+    a second location's batches would overwrite the first one's rows and files.
+    Each location needs its own database and data directories.
+    """
+    unique = list(dict.fromkeys(locations))
+    if len(unique) != 1:
+        raise ValueError(
+            "weather_daily and the day artefacts are keyed by date alone; "
+            f"load exactly one location per database (got {len(unique)})"
+        )
+    return unique[0]
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Rows written by :func:`upsert_frame` and how many of them changed content."""
+
+    rows: int = 0
+    changed: int = 0
+
+
+def read_table_version(conn, table_name: str = "weather_daily") -> str | None:
+    """Return the content version of ``table_name``, or ``None`` when it is untracked."""
+    from sqlalchemy import inspect, text
+
+    if not inspect(conn).has_table("table_versions"):
+        return None
+    return conn.execute(
+        text(READ_TABLE_VERSION_SQL), {"table_name": table_name}
+    ).scalar()
+
+
+def bump_table_version(conn, table_name: str = "weather_daily") -> str:
+    """Give ``table_name`` a new random content version inside ``conn``'s transaction."""
+    from sqlalchemy import text
 
-    record["date"] = (
-        pd.to_datetime(record.get("date"), errors="coerce").date().isoformat()
-        if record.get("date")
-        else None
+    version = uuid.uuid4().hex
+    conn.execute(
+        text(BUMP_TABLE_VERSION_SQL),
+        {"table_name": table_name, "version": version, "now": utc_isoformat()},
     )
+    return version
 
-    for ts_col in ("sunrise", "sunset"):
-        value = record.get(ts_col)
-        if pd.isna(value):
-            record[ts_col] = None
-        elif hasattr(value, "isoformat"):
-            record[ts_col] = value.isoformat()
-        else:
-            record[ts_col] = str(value)
-
-    numeric_columns = [
-        "temp_max_c",
-        "temp_min_c",
-        "temp_max_f",
-        "temp_min_f",
-        "app_temp_max_c",
-        "app_temp_min_c",
-        "precip_mm",
-        "rain_mm",
-        "showers_mm",
-        "snowfall_mm",
-        "precip_hours",
-        "daylight_sec",
-        "sunshine_sec",
-        "shortwave_radiation_mj_m2",
-        "wind_max_kmh",
-        "wind_gust_max_kmh",
-        "wind_dir_deg",
-        "weather_code",
-        "et0_mm",
-        "uv_index_max",
-        "uv_index_clear_sky_max",
-    ]
-    for column in numeric_columns:
-        value = record.get(column)
-        if pd.isna(value):
-            record[column] = None
-            continue
-        if column == "weather_code":
-            record[column] = int(value)
+
+def daily_content(conn, days: Iterable[str]) -> dict[str, tuple]:
+    """Return the stored ``weather_daily`` values of ``days`` keyed by date.
+
+    ``ingested_at`` is left out: every UPSERT rewrites it, so it says nothing about
+    whether the row's content changed.
+    """
+    from sqlalchemy import bindparam, text
+
+    statement = text("SELECT * FROM weather_daily WHERE date IN :days").bindparams(
+        bindparam("days", expanding=True)
+    )
+    days = sorted(set(days))
+    content = {}
+    for index in range(0, len(days), CONTENT_DAYS_PER_QUERY):
+        result = conn.execute(
+            statement, {"days": days[index : index + CONTENT_DAYS_PER_QUERY]}
+        )
+        columns = list(result.keys())
+        for row in result:
+            values = dict(zip(columns, row))
+            values.pop("ingested_at", None)
+            content[str(values["date"])[:10]] = tuple(values.values())
+    return content
+
+
+def write_daily_rows(conn, days: list[str], write: Callable[..., None]) -> int:
+    """Run ``write`` on ``conn`` and return how many of ``days`` it changed.
+
+    The rows of ``days`` are read before and after the write; when any differs,
+    the ``weather_daily`` content version is bumped in the same transaction, so
+    re-loading identical data keeps cached metrics valid while any real change,
+    whatever its ``ingested_at``, invalidates them.
+    """
+    before = daily_content(conn, days)
+    write(conn)
+    after = daily_content(conn, days)
+    changed = sum(1 for day in after if after[day] != before.get(day))
+    changed += sum(1 for day in before if day not in after)
+    if changed:
+        bump_table_version(conn)
+    return changed
+
+
+def make_artefact_writer(config: PipelineConfig) -> ArtefactWriter:
+    """Build the artefact writer configured by ``PIPELINE_IO_WORKERS``/``_QUEUE_DEPTH``."""
+    return ArtefactWriter(
+        max_workers=config.io_workers, max_pending=config.io_queue_depth
+    )
+
+
+def split_daily_payload(full_json: dict) -> Iterator[tuple[str, dict]]:
+    """Yield ``(day, per_day_payload)`` slices of a multi-day archive payload."""
+    daily = (full_json or {}).get("daily")
+    if not daily or "time" not in daily:
+        raise RuntimeError("Response missing 'daily.time' to split by day")
+
+    day_identifiers = daily["time"]
+    total_days = len(day_identifiers)
+    envelope = {
+        key: value for key, value in full_json.items() if key not in _BATCH_ONLY_KEYS
+    }
+
+    for index, day in enumerate(day_identifiers):
+        per_day = {
+            **envelope,
+            "daily": {},
+            "_requested_daily": full_json.get("_requested_daily", []),
+            "_accepted_daily": full_json.get("_accepted_daily", []),
+            "_dropped_daily": full_json.get("_dropped_daily", []),
+        }
+        for variable, values in daily.items():
+            if variable == "time":
+                per_day["daily"]["time"] = [day]
+                continue
+            if isinstance(values, list) and len(values) == total_days:
+                per_day["daily"][variable] = [values[index]]
+            else:
+                per_day["daily"][variable] = [None]
+        yield day, per_day
+
+
+def save_batch_artefacts(
+    full_json: dict, config: PipelineConfig, writer: ArtefactWriter
+) -> pd.DataFrame:
+    """Write raw/processed artefacts for each day and return the batch ``DataFrame``.
+
+    No database connection is held here; queued writes are flushed before returning
+    so the artefacts are on disk before the rows are committed.
+    """
+    days = list(split_daily_payload(full_json))
+    writer.ensure_dirs(
+        [config.raw_root / day for day, _ in days]
+        + [config.proc_root / day for day, _ in days]
+    )
+
+    records = []
+    for day, per_day in days:
+        raw_path = raw_outpath(config.raw_root, day)
+        writer.write_bytes(
+            raw_path, jsoncodec.dumps(per_day, indent=config.json_pretty)
+        )
+        logger.info("Saved raw: %s", raw_path)
+
+        record = transform_day_payload(per_day)
+        records.append(record)
+
+        proc_path = proc_outpath(config.proc_root, day)
+        writer.write_parquet(proc_path, records_to_dataframe([record]))
+        logger.info("Saved processed: %s", proc_path)
+
+    writer.flush()
+    invalidate_days([day for day, _ in days])
+    return records_to_dataframe(records)
+
+
+def upsert_frame(
+    engine, upsert_stmt, data_frame: pd.DataFrame, *, rollup_stmts: dict | None = None
+) -> UpsertResult:
+    """UPSERT every row of ``data_frame`` in one short bulk transaction.
+
+    When ``rollup_stmts`` is given, the monthly/yearly rollups for the periods the
+    batch touches are refreshed inside the same transaction. The ``weather_daily``
+    content version is bumped with them when any row changed (see
+    :func:`write_daily_rows`).
+    """
+    records = list(df_rows_for_upsert(data_frame))
+    if not records:
+        return UpsertResult()
+    days = [record["date"] for record in records if record["date"]]
+
+    def write(conn) -> None:
+        if conn.dialect.name == "duckdb":
+            _duckdb_bulk_upsert(conn, upsert_stmt, records)
         else:
-            record[column] = float(value)
+            conn.execute(upsert_stmt, records)
+
+    with engine.begin() as conn:
+        changed = write_daily_rows(conn, days, write)
+        if rollup_stmts:
+            refresh_rollups(conn, rollup_stmts, days)
+    logger.info(
+        "Upserted %d rows into database (%s to %s), %d changed",
+        len(records),
+        records[0]["date"],
+        records[-1]["date"],
+        changed,
+    )
+    return UpsertResult(rows=len(records), changed=changed)
 
-    record["source"] = "open-meteo"
-    record["ingested_at"] = utc_isoformat()
-    yield record
+
+def _duckdb_bulk_upsert(conn, upsert_stmt, records: list[dict]) -> None:
+    """Expose ``records`` to DuckDB as ``weather_incoming`` and run one UPSERT.
+
+    DuckDB executes ``executemany`` one statement at a time, so the batch is handed
+    over as an Arrow table instead; Arrow keeps ``None`` as SQL NULL rather than
+    the NaN a pandas float column would carry.
+    """
+    import pyarrow as pa
+
+    raw = conn.connection
+    dbapi_conn = getattr(raw, "driver_connection", raw)
+    dbapi_conn.register("weather_incoming", pa.Table.from_pylist(records))
+    try:
+        conn.execute(upsert_stmt)
+    finally:
+        dbapi_conn.unregister("weather_incoming")
 
 
 def split_save_and_upsert(
@@ -140,61 +482,38 @@ def split_save_and_upsert(
     *,
     engine=None,
     upsert_stmt=None,
-) -> None:
-    """Persist artefacts and upsert each day present within the API batch payload."""
+    writer: ArtefactWriter | None = None,
+    rollup_stmts: dict | None = None,
+) -> int:
+    """Persist artefacts and upsert each day present within the API batch payload.
+
+    Splitting, transformation and artefact persistence all happen before the
+    database is touched, so the write transaction only covers a single bulk
+    UPSERT plus the refresh of the rollup periods it touched. Artefacts go through
+    ``writer`` (a private writer built from the config when not supplied). Rows
+    that would violate the schema constraints are quarantined (see
+    :func:`src.validate.quarantine_invalid_rows`) rather than aborting the batch.
+    The data-version marker is bumped after a batch that changed stored rows
+    commits. Returns the number of upserted rows.
+    """
     if engine is None:
         engine = get_db_engine(config)
     if upsert_stmt is None:
         upsert_stmt = load_upsert_statement(config)
+    if rollup_stmts is None:
+        rollup_stmts = load_rollup_statements(config)
 
-    daily = (full_json or {}).get("daily")
-    if not daily or "time" not in daily:
-        raise RuntimeError("Response missing 'daily.time' to split by day")
-
-    day_identifiers = daily["time"]
-    total_days = len(day_identifiers)
+    owns_writer = writer is None
+    if owns_writer:
+        writer = make_artefact_writer(config)
+    try:
+        data_frame = save_batch_artefacts(full_json, config, writer)
+        data_frame = quarantine_invalid_rows(data_frame, config, writer)
+    finally:
+        if owns_writer:
+            writer.close()
 
-    with engine.begin() as conn:
-        for index, day in enumerate(day_identifiers):
-            per_day = {
-                **{
-                    key: value
-                    for key, value in full_json.items()
-                    if key
-                    not in (
-                        "daily",
-                        "hourly",
-                        "current",
-                        "_requested_daily",
-                        "_accepted_daily",
-                        "_dropped_daily",
-                    )
-                },
-                "daily": {},
-                "_requested_daily": full_json.get("_requested_daily", []),
-                "_accepted_daily": full_json.get("_accepted_daily", []),
-                "_dropped_daily": full_json.get("_dropped_daily", []),
-            }
-            for variable, values in daily.items():
-                if variable == "time":
-                    per_day["daily"]["time"] = [day]
-                    continue
-                if isinstance(values, list) and len(values) == total_days:
-                    per_day["daily"][variable] = [values[index]]
-                else:
-                    per_day["daily"][variable] = [None]
-
-            raw_path = ensure_raw_outpath(config.raw_root, day)
-            with raw_path.open("w", encoding="utf-8") as handle:
-                json.dump(per_day, handle, ensure_ascii=False, indent=2)
-            logger.info("Saved raw: %s", raw_path)
-
-            data_frame = transform_to_dataframe(per_day)
-
-            proc_path = ensure_proc_outpath(config.proc_root, day)
-            data_frame.to_parquet(proc_path, index=False, engine="pyarrow")
-            logger.info("Saved processed: %s", proc_path)
-
-            upsert_params = list(df_rows_for_upsert(data_frame))
-            conn.execute(upsert_stmt, upsert_params)
-            logger.info("Upserted into database for %s", day)
+    result = upsert_frame(engine, upsert_stmt, data_frame, rollup_stmts=rollup_stmts)
+    if result.changed:
+        bump_data_version(config.data_version_path)
+    return result.rows
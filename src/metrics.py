@@ -0,0 +1,171 @@
+"""Metric catalogue computed from a single scan of ``weather_daily``.
+
+Each ``metrics_*.sql`` file scans the table on its own, so the cost of a report
+grows with every metric added. Metrics declared here instead name the columns they
+need and compute their result from a shared in-memory frame: :func:`scan_metrics`
+reads the union of those columns once, in date order, and evaluates every metric
+on it with vectorised pandas operations. :data:`METRIC_CATALOGUE` declares the
+default report with the same names and output columns as the SQL files;
+parameterised variants (other windows or thresholds) are one line each and add no
+table scan.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class Metric(ABC):
+    """Base class of catalogue entries: a report ``name`` computed from columns."""
+
+    name: str
+
+    @property
+    @abstractmethod
+    def columns(self) -> tuple[str, ...]:
+        """``weather_daily`` columns (besides ``date``) the metric reads."""
+
+    @abstractmethod
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Return the metric's result table from the date-ordered ``frame``."""
+
+
+@dataclass(frozen=True)
+class RollingWindow(Metric):
+    """Trailing ``window``-row means and sums, one output row per day.
+
+    Like ``AVG``/``SUM ... OVER (ROWS BETWEEN window - 1 PRECEDING AND CURRENT
+    ROW)``: missing values are skipped and a window without any value is null.
+    """
+
+    name: str
+    window: int
+    mean: tuple[str, ...] = ("temp_max_c", "temp_min_c")
+    sum: tuple[str, ...] = ("precip_mm",)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (*self.mean, *self.sum)
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        import pandas as pd
+
+        result = pd.DataFrame({"date": frame["date"]})
+        for column in self.mean:
+            rolling = frame[column].rolling(self.window, min_periods=1)
+            result[f"ma{self.window}_{column}"] = rolling.mean()
+        for column in self.sum:
+            rolling = frame[column].rolling(self.window, min_periods=1)
+            result[f"sum{self.window}_{column}"] = rolling.sum()
+        return result
+
+
+@dataclass(frozen=True)
+class HeatwaveStreaks(Metric):
+    """Runs of consecutive rows with ``column >= threshold`` lasting ``min_days``.
+
+    Streaks are numbered (``grp_id``) in date order, counting the short ones that
+    are filtered out, and sorted longest first. A day without a value ends a
+    streak, as in the Postgres and DuckDB queries; the SQLite query skips such a
+    day and lets the streak continue.
+    """
+
+    name: str
+    threshold: float = 30.0
+    min_days: int = 3
+    column: str = "temp_max_c"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.column,)
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        import numpy as np
+
+        hot = (frame[self.column] >= self.threshold).to_numpy()
+        starts = hot & ~np.concatenate(([False], hot[:-1]))
+        days = frame.loc[hot, ["date", self.column]].assign(
+            grp_id=np.cumsum(starts)[hot]
+        )
+        streaks = (
+            days.groupby("grp_id", sort=True)
+            .agg(
+                start_date=("date", "first"),
+                end_date=("date", "last"),
+                days=("date", "size"),
+                **{
+                    f"avg_{self.column}": (self.column, "mean"),
+                    f"peak_{self.column}": (self.column, "max"),
+                },
+            )
+            .reset_index()
+        )
+        streaks = streaks[streaks["days"] >= self.min_days]
+        return streaks.sort_values(
+            ["days", "start_date"], ascending=[False, True], kind="stable"
+        ).reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class LinearFit(Metric):
+    """Least-squares ``y = beta0 + beta1 * x`` over rows where both are present."""
+
+    name: str
+    x: str = "temp_max_c"
+    y: str = "sunshine_sec"
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return (self.x, self.y)
+
+    def compute(self, frame: pd.DataFrame) -> pd.DataFrame:
+        import pandas as pd
+
+        valid = frame[[self.x, self.y]].dropna()
+        x = valid[self.x].to_numpy(dtype=float)
+        y = valid[self.y].to_numpy(dtype=float)
+        slope = intercept = None
+        if len(valid):
+            mean_x, mean_y = x.mean(), y.mean()
+            variance = (x * x).mean() - mean_x * mean_x
+            if variance != 0:
+                slope = float(((x * y).mean() - mean_x * mean_y) / variance)
+                intercept = float(mean_y - slope * mean_x)
+        return pd.DataFrame(
+            [{"n": len(valid), "beta1_slope": slope, "beta0_intercept": intercept}]
+        )
+
+
+METRIC_CATALOGUE: tuple[Metric, ...] = (
+    RollingWindow("metrics_rolling_7d", 7),
+    HeatwaveStreaks("metrics_heatwave_streaks", threshold=30.0, min_days=3),
+    LinearFit("metrics_sunshine_vs_temp", x="temp_max_c", y="sunshine_sec"),
+)
+
+
+def scan_sql(metrics: Iterable[Metric]) -> str:
+    """Return the single query reading every column ``metrics`` need."""
+    columns = dict.fromkeys(column for metric in metrics for column in metric.columns)
+    return (
+        f"SELECT {', '.join(['date', *columns])} FROM weather_daily "
+        "WHERE date IS NOT NULL ORDER BY date"
+    )
+
+
+def scan_metrics(conn, metrics: Iterable[Metric]) -> dict[str, pd.DataFrame]:
+    """Compute ``metrics`` from one scan of ``weather_daily`` on ``conn``."""
+    import pandas as pd
+
+    metrics = list(metrics)
+    if not metrics:
+        return {}
+    frame = pd.read_sql_query(scan_sql(metrics), conn)
+    for column in frame.columns.drop("date"):
+        # Postgres NUMERIC columns arrive as Decimal objects.
+        frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    return {metric.name: metric.compute(frame) for metric in metrics}
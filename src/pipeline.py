@@ -1,36 +1,45 @@
 #!/usr/bin/env python3
 
-
+import argparse
 import logging
 import sys
+from dataclasses import replace
+from datetime import UTC, datetime
 from pathlib import Path
 
 if __package__ is None or __package__ == "":
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.analytics import calculate_metrics
-from src.config import ALL_DAILY_VARS, METRIC_SQL_FILES, PipelineConfig
-from src.extract import fetch_daily_archive
-from src.load import ensure_db_and_table, load_upsert_statement, split_save_and_upsert
+from src.analytics import calculate_metrics, configured_metrics
+from src.config import (
+    ALL_DAILY_VARS,
+    DB_BACKENDS,
+    PipelineConfig,
+    parse_profile_modes,
+)
+from src.extract import (
+    OPEN_METEO_ARCHIVE_URL,
+    AdaptiveChunker,
+    fetch_daily_archive,
+)
+from src.load import (
+    ensure_db_and_table,
+    load_rollup_statements,
+    load_upsert_statement,
+    make_artefact_writer,
+    require_single_location,
+    split_save_and_upsert,
+)
+from src.utils import jsoncodec
 from src.utils.logging import setup_logging
+from src.utils.profiling import StageProfiler
+from src.utils.resilience import CircuitBreaker, RequestGuard
 
 logger = logging.getLogger(__name__)
 
 
-def run() -> None:
-    """Execute the end-to-end pipeline from data extraction to analytics."""
-    setup_logging()
-    config = PipelineConfig.from_env()
-
-    metadata, batch_iterator = fetch_daily_archive(
-        latitude=config.latitude,
-        longitude=config.longitude,
-        start_date=config.start_date,
-        end_date=config.end_date,
-        timezone=config.timezone,
-        daily_vars=ALL_DAILY_VARS,
-        batch_days=config.fetch_batch_days,
-    )
+def _log_variable_negotiation(metadata: dict) -> None:
+    """Log which daily variables the API accepted or rejected."""
     dropped_variables = metadata.get("_dropped_daily", [])
     if dropped_variables:
         logger.info("Dropped unsupported daily vars: %s", ", ".join(dropped_variables))
@@ -39,19 +48,189 @@ def run() -> None:
         ", ".join(metadata.get("_accepted_daily", [])),
     )
 
-    engine = ensure_db_and_table(config)
-    upsert_statement = load_upsert_statement(config)
-    for batch in batch_iterator:
-        split_save_and_upsert(
-            batch, config, engine=engine, upsert_stmt=upsert_statement
+
+async def _load_async_batches(
+    config: PipelineConfig,
+    engine,
+    upsert_statement,
+    rollup_statements,
+    writer,
+    locations: list[tuple[float, float]],
+    *,
+    url: str = OPEN_METEO_ARCHIVE_URL,
+) -> None:
+    """Consume the async extract engine, loading each batch off the event loop.
+
+    Storage is keyed by date alone, so ``locations`` must hold a single location
+    (see :func:`src.load.require_single_location`).
+    """
+    import asyncio
+
+    from src.extract_async import AsyncArchiveExtractor
+
+    location = require_single_location(locations)
+    extractor = AsyncArchiveExtractor(
+        ALL_DAILY_VARS,
+        timezone=config.timezone,
+        batch_days=config.fetch_batch_days,
+        max_concurrency=config.fetch_concurrency,
+        rate_per_second=config.fetch_rate_per_second,
+        url=url,
+    )
+    async for _, batch in extractor.iter_batches(
+        [location], config.start_date, config.end_date
+    ):
+        await asyncio.to_thread(
+            split_save_and_upsert,
+            batch,
+            config,
+            engine=engine,
+            upsert_stmt=upsert_statement,
+            writer=writer,
+            rollup_stmts=rollup_statements,
         )
+    _log_variable_negotiation(extractor.metadata)
 
-    calculate_metrics(config, METRIC_SQL_FILES, engine=engine)
+
+def make_chunker(config: PipelineConfig) -> AdaptiveChunker | None:
+    """Return an adaptive chunker when ``PIPELINE_FETCH_ADAPTIVE`` is enabled."""
+    if not config.fetch_adaptive:
+        return None
+    return AdaptiveChunker(
+        config.fetch_batch_days or config.fetch_max_days,
+        min_days=config.fetch_min_days,
+        max_days=config.fetch_max_days,
+        target_seconds=config.fetch_target_seconds,
+    )
 
 
-def main() -> None:
+def make_request_guard(config: PipelineConfig) -> RequestGuard | None:
+    """Return the tail-latency guard for archive requests, unless all are disabled."""
+    breaker = None
+    if config.fetch_breaker_error_rate is not None:
+        breaker = CircuitBreaker(
+            error_rate=config.fetch_breaker_error_rate,
+            cooldown_seconds=config.fetch_breaker_cooldown_seconds,
+        )
+    if (
+        breaker is None
+        and config.fetch_hedge_percentile is None
+        and config.fetch_timeout_multiplier is None
+    ):
+        return None
+    return RequestGuard(
+        hedge_percentile=config.fetch_hedge_percentile,
+        timeout_multiplier=config.fetch_timeout_multiplier,
+        min_timeout=config.fetch_min_timeout,
+        max_timeout=config.fetch_max_timeout,
+        breaker=breaker,
+    )
+
+
+def make_profiler(config: PipelineConfig) -> StageProfiler:
+    """Build the per-run stage profiler selected by ``PIPELINE_PROFILE``/``--profile``."""
+    run_id = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    return StageProfiler(config.profile_modes, config.profiles_root / run_id)
+
+
+def run(config: PipelineConfig | None = None) -> None:
+    """Execute the end-to-end pipeline from data extraction to analytics."""
+    setup_logging()
+    config = config or PipelineConfig.from_env()
+    logger.info("JSON backend: %s", jsoncodec.set_backend(config.json_backend))
+    profiler = make_profiler(config)
+    guard = None
+
+    try:
+        if config.extract_engine == "async":
+            import asyncio
+
+            with profiler.stage("load"):
+                engine = ensure_db_and_table(config)
+                upsert_statement = load_upsert_statement(config)
+                rollup_statements = load_rollup_statements(config)
+            with profiler.stage("extract_load"), make_artefact_writer(config) as writer:
+                asyncio.run(
+                    _load_async_batches(
+                        config,
+                        engine,
+                        upsert_statement,
+                        rollup_statements,
+                        writer,
+                        [(config.latitude, config.longitude)],
+                    )
+                )
+        else:
+            guard = make_request_guard(config)
+            with profiler.stage("extract"):
+                metadata, batch_iterator = fetch_daily_archive(
+                    latitude=config.latitude,
+                    longitude=config.longitude,
+                    start_date=config.start_date,
+                    end_date=config.end_date,
+                    timezone=config.timezone,
+                    daily_vars=ALL_DAILY_VARS,
+                    batch_days=config.fetch_batch_days,
+                    adaptive=make_chunker(config),
+                    stream_window_days=config.fetch_stream_days,
+                    guard=guard,
+                )
+            _log_variable_negotiation(metadata)
+
+            with profiler.stage("load"):
+                engine = ensure_db_and_table(config)
+                upsert_statement = load_upsert_statement(config)
+                rollup_statements = load_rollup_statements(config)
+            with make_artefact_writer(config) as writer:
+                for batch in profiler.wrap_iterator("extract", batch_iterator):
+                    with profiler.stage("load"):
+                        split_save_and_upsert(
+                            batch,
+                            config,
+                            engine=engine,
+                            upsert_stmt=upsert_statement,
+                            writer=writer,
+                            rollup_stmts=rollup_statements,
+                        )
+            if guard is not None:
+                logger.info("Archive requests: %s", guard.counters.summary())
+
+        with profiler.stage("analytics"):
+            calculate_metrics(config, configured_metrics(config), engine=engine)
+    finally:
+        if guard is not None:
+            guard.close()
+        profiler.finish()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse pipeline command-line options."""
+    parser = argparse.ArgumentParser(
+        description="Fetch Open-Meteo archives, load weather_daily and build reports"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DB_BACKENDS,
+        help="Override backend (defaults to env-configured backend)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="MODES",
+        help="Profile each stage: comma-separated cpu, memory, sample or 'all' "
+        "(defaults to PIPELINE_PROFILE)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
     """Entry point used when invoking the module as a script."""
-    run()
+    args = parse_args(argv)
+    config = PipelineConfig.from_env()
+    if args.backend and args.backend != config.db_backend:
+        config = replace(config, db_backend=args.backend)
+    if args.profile is not None:
+        config = replace(config, profile_modes=parse_profile_modes(args.profile))
+    run(config)
 
 
 if __name__ == "__main__":
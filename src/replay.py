@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import DB_BACKENDS, PipelineConfig
+from src.load import (
+    ensure_db_and_table,
+    load_rollup_statements,
+    load_upsert_statement,
+    upsert_frame,
+)
+from src.transform import records_to_dataframe, transform_day_payload
+from src.utils import jsoncodec
+from src.utils.io import (
+    PROC_FILENAME,
+    RAW_FILENAME,
+    bump_data_version,
+    proc_outpath,
+    raw_outpath,
+)
+from src.utils.logging import setup_logging
+from src.validate import quarantine_invalid_rows
+
+logger = logging.getLogger(__name__)
+
+REPLAY_SOURCES = ("raw", "processed")
+_DAY_DIR = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass
+class ReplayStats:
+    """Counters and timings reported by :func:`replay`."""
+
+    source: str
+    days: int = 0
+    rows: int = 0
+    quarantined: int = 0
+    read_seconds: float = 0.0
+    load_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Replayed {self.rows} rows from {self.days} {self.source} day(s) in "
+            f"{self.elapsed_seconds:.2f}s ({self.rows_per_second:,.0f} rows/s; "
+            f"read+transform {self.read_seconds:.2f}s across workers, "
+            f"load {self.load_seconds:.2f}s)"
+            + (f"; {self.quarantined} row(s) quarantined" if self.quarantined else "")
+        )
+
+
+def discover_days(
+    config: PipelineConfig,
+    source: str = "raw",
+    start: str | None = None,
+    end: str | None = None,
+) -> list[str]:
+    """Return the sorted days that have a ``source`` artefact within ``start``..``end``."""
+    root, filename = _source_root(config, source)
+    if not root.is_dir():
+        return []
+    return sorted(
+        entry.name
+        for entry in os.scandir(root)
+        if _DAY_DIR.match(entry.name)
+        and (start is None or entry.name >= start)
+        and (end is None or entry.name <= end)
+        and os.path.isfile(os.path.join(entry.path, filename))
+    )
+
+
+def _source_root(config: PipelineConfig, source: str) -> tuple[Path, str]:
+    if source == "processed":
+        return config.proc_root, PROC_FILENAME
+    if source == "raw":
+        return config.raw_root, RAW_FILENAME
+    raise ValueError(f"Unsupported replay source: {source}")
+
+
+def read_day_records(
+    source: str, root: Path | str, days: list[str]
+) -> tuple[list[dict], float]:
+    """Read and transform the artefacts for ``days``; return records and CPU time.
+
+    Raw payloads go through :func:`transform_day_payload` exactly as during
+    ingestion; processed files are already transformed and are read as-is. Runs in
+    worker processes, so it only takes picklable arguments.
+    """
+    started = time.process_time()
+    records: list[dict] = []
+    if source == "raw":
+        for day in days:
+            with open(raw_outpath(root, day), "rb") as handle:
+                payload = jsoncodec.loads(handle.read())
+                records.append(dict(transform_day_payload(payload)))
+    else:
+        import pyarrow.parquet as pq
+
+        for day in days:
+            # ParquetFile skips the dataset discovery done by read_table, which
+            # dominates the cost of reading many tiny single-row files.
+            parquet_file = pq.ParquetFile(proc_outpath(root, day))
+            records.extend(parquet_file.read(use_threads=False).to_pylist())
+    return records, time.process_time() - started
+
+
+def _chunks(days: list[str], size: int) -> list[list[str]]:
+    return [days[index : index + size] for index in range(0, len(days), size)]
+
+
+def replay(
+    config: PipelineConfig,
+    *,
+    source: str = "raw",
+    start: str | None = None,
+    end: str | None = None,
+    workers: int | None = None,
+    chunk_days: int = 365,
+    engine=None,
+) -> ReplayStats:
+    """Rebuild ``weather_daily`` (and its rollups) from local artefacts without HTTP.
+
+    Days are read and transformed in ``chunk_days`` groups on a process pool of
+    ``workers`` processes (``0``/``1`` reads in-process) while the calling process
+    upserts each completed group with :func:`src.load.upsert_frame`, in date
+    order, so only one connection ever writes.
+    """
+    root, _ = _source_root(config, source)
+    days = discover_days(config, source, start, end)
+    stats = ReplayStats(source=source)
+    started = time.perf_counter()
+
+    engine = ensure_db_and_table(config, engine)
+    upsert_stmt = load_upsert_statement(config)
+    rollup_stmts = load_rollup_statements(config)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks(days, max(1, chunk_days))
+    workers = min(workers, len(chunks))
+
+    def load(records: list[dict], cpu_seconds: float) -> None:
+        stats.read_seconds += cpu_seconds
+        load_started = time.perf_counter()
+        data_frame = records_to_dataframe(records)
+        valid = quarantine_invalid_rows(data_frame, config)
+        stats.quarantined += len(data_frame) - len(valid)
+        stats.rows += upsert_frame(
+            engine, upsert_stmt, valid, rollup_stmts=rollup_stmts
+        ).rows
+        stats.load_seconds += time.perf_counter() - load_started
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            for records, cpu_seconds in pool.map(
+                read_day_records, [source] * len(chunks), [root] * len(chunks), chunks
+            ):
+                load(records, cpu_seconds)
+    else:
+        for chunk in chunks:
+            load(*read_day_records(source, root, chunk))
+
+    if stats.rows:
+        bump_data_version(config.data_version_path)
+    stats.days = len(days)
+    stats.elapsed_seconds = time.perf_counter() - started
+    logger.info("%s", stats.summary())
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for rebuilding the database from ``data/raw`` or ``data/processed``."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild weather_daily from local artefacts without calling the API"
+    )
+    parser.add_argument(
+        "--source",
+        choices=REPLAY_SOURCES,
+        default="raw",
+        help="Artefacts to replay: raw API JSON (default, fastest to decode) or "
+        "processed parquet",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DB_BACKENDS,
+        help="Override backend (defaults to env-configured backend)",
+    )
+    parser.add_argument("--start", help="First day to replay (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day to replay (YYYY-MM-DD)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Reader processes (defaults to the CPU count; 1 reads in-process)",
+    )
+    parser.add_argument(
+        "--chunk-days",
+        type=int,
+        default=365,
+        help="Days read and upserted per transaction (default: 365)",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    config = PipelineConfig.from_env()
+    if args.backend and args.backend != config.db_backend:
+        config = replace(config, db_backend=args.backend)
+    jsoncodec.set_backend(config.json_backend)
+
+    replay(
+        config,
+        source=args.source,
+        start=args.start,
+        end=args.end,
+        workers=args.workers,
+        chunk_days=args.chunk_days,
+    )
+
+
+if __name__ == "__main__":
+    main()
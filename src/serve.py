@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import DB_BACKENDS, PipelineConfig
+from src.load import get_db_engine
+from src.utils import jsoncodec
+from src.utils.logging import setup_logging
+from src.utils.schema import KEEP_ORDER
+
+logger = logging.getLogger(__name__)
+
+DAILY_COLUMNS = (*KEEP_ORDER, "source", "ingested_at")
+MANIFEST_FILENAME = "metadata.json"
+
+
+class ServiceError(Exception):
+    """A request that maps to an HTTP error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A JSON body and its strong ETag (a digest of the body)."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedResponse":
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(body=body, etag=f'"{digest}"')
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return True when an ``If-None-Match`` header covers ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class ReadService:
+    """Serve the latest metric reports and ``weather_daily`` ranges from memory.
+
+    Responses are cached as encoded JSON bodies in an LRU bounded by
+    ``cache_bytes`` (``0`` disables caching). Before each lookup the service
+    compares the data-version marker (bumped by the load, analytics and replay
+    stages) with the one it last saw and drops the whole cache when it changed,
+    so a pipeline run in another process invalidates responses at the cost of
+    one ``stat`` per request.
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        *,
+        engine=None,
+        cache_bytes: int | None = None,
+    ):
+        self.config = config
+        self.engine = engine or get_db_engine(config)
+        self.cache_bytes = (
+            config.serve_cache_mb * 1024 * 1024 if cache_bytes is None else cache_bytes
+        )
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._version = self._version_signature()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, query: dict[str, str] | None = None) -> CachedResponse:
+        """Return the response for ``path``; raise :class:`ServiceError` otherwise."""
+        query = query or {}
+        if path.rstrip("/") == "/health":
+            return CachedResponse.from_body(
+                jsoncodec.dumps({"status": "ok", "cache": self.cache_info()})
+            )
+        key = path + "?" + "&".join(f"{k}={query[k]}" for k in sorted(query))
+        self._check_version()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            self._misses += 1
+            generation = self._invalidations
+        response = CachedResponse.from_body(self._render(path, query))
+        self._store(key, response, generation)
+        return response
+
+    def invalidate(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._cache.clear()
+            self._size = 0
+            self._invalidations += 1
+
+    def cache_info(self) -> dict:
+        """Return hit/miss/invalidation counters and the cache footprint."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+                "entries": len(self._cache),
+                "bytes": self._size,
+            }
+
+    def _version_signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = os.stat(self.config.data_version_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _check_version(self) -> None:
+        version = self._version_signature()
+        if version != self._version:
+            self._version = version
+            self.invalidate()
+            logger.info("Data version changed; response cache cleared")
+
+    def _store(self, key: str, response: CachedResponse, generation: int) -> None:
+        size = len(response.body) + len(key)
+        if size > self.cache_bytes:
+            return
+        with self._lock:
+            if generation != self._invalidations:
+                # The data changed while this response was rendered.
+                return
+            previous = self._cache.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body) + len(key)
+            self._cache[key] = response
+            self._size += size
+            while self._size > self.cache_bytes:
+                old_key, old = self._cache.popitem(last=False)
+                self._size -= len(old.body) + len(old_key)
+
+    def _render(self, path: str, query: dict[str, str]) -> bytes:
+        parts = [part for part in path.split("/") if part]
+        if parts == ["metrics"]:
+            report_dir = self._latest_report()
+            manifest = jsoncodec.loads((report_dir / MANIFEST_FILENAME).read_bytes())
+            return jsoncodec.dumps({"report": report_dir.name, **manifest})
+        if len(parts) == 2 and parts[0] == "metrics":
+            return self._metric_body(parts[1])
+        if parts == ["daily"]:
+            return self._daily_body(query)
+        raise ServiceError(404, f"Unknown resource {path!r}")
+
+    def _latest_report(self) -> Path:
+        """Return the newest report directory whose manifest has been written."""
+        try:
+            with os.scandir(self.config.reports_root) as entries:
+                names = sorted(
+                    (entry.name for entry in entries if entry.is_dir()), reverse=True
+                )
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            report_dir = self.config.reports_root / name
+            if (report_dir / MANIFEST_FILENAME).is_file():
+                return report_dir
+        raise ServiceError(404, "No reports have been generated yet")
+
+    def _metric_body(self, name: str) -> bytes:
+        report_dir = self._latest_report()
+        manifest = jsoncodec.loads((report_dir / MANIFEST_FILENAME).read_bytes())
+        for entry in manifest.get("metrics", []):
+            if entry["name"] == name:
+                return (report_dir / entry["json"]).read_bytes()
+        raise ServiceError(404, f"Unknown metric {name!r}")
+
+    def _daily_body(self, query: dict[str, str]) -> bytes:
+        from sqlalchemy import text
+
+        try:
+            start = date.fromisoformat(query["start"])
+            end = date.fromisoformat(query.get("end", query["start"]))
+        except KeyError as exc:
+            raise ServiceError(400, "'start' (YYYY-MM-DD) is required") from exc
+        except ValueError as exc:
+            raise ServiceError(400, f"Invalid date: {exc}") from exc
+        if end < start:
+            raise ServiceError(400, "'end' must not be before 'start'")
+
+        columns = [c for c in query.get("columns", "").split(",") if c] or list(
+            DAILY_COLUMNS
+        )
+        unknown = sorted(set(columns) - set(DAILY_COLUMNS))
+        if unknown:
+            raise ServiceError(400, f"Unknown column(s): {', '.join(unknown)}")
+        if "date" not in columns:
+            columns.insert(0, "date")
+
+        sql = text(
+            f"SELECT {', '.join(columns)} FROM weather_daily "
+            "WHERE date BETWEEN :start AND :end ORDER BY date"
+        )
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                sql, {"start": start.isoformat(), "end": end.isoformat()}
+            )
+            rows = [dict(zip(columns, row)) for row in result]
+        return jsoncodec.dumps(rows)
+
+
+def make_handler(service: ReadService) -> type[BaseHTTPRequestHandler]:
+    """Build a request handler class bound to ``service``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Keep-alive responses are small; without TCP_NODELAY each one can stall
+        # ~40 ms on Nagle's algorithm meeting the client's delayed ACK.
+        disable_nagle_algorithm = True
+
+        def do_GET(self):  # noqa: N802 - http.server naming
+            url = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                response = service.get(url.path, query)
+            except ServiceError as exc:
+                self._send(exc.status, jsoncodec.dumps({"error": str(exc)}))
+                return
+            except Exception:
+                logger.exception("Failed to serve %s", self.path)
+                self._send(500, jsoncodec.dumps({"error": "internal error"}))
+                return
+            if etag_matches(self.headers.get("If-None-Match"), response.etag):
+                self._send(304, b"", etag=response.etag)
+            else:
+                self._send(200, response.body, etag=response.etag)
+
+        def _send(self, status: int, body: bytes, *, etag: str | None = None) -> None:
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            if status != 304:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+        def log_message(self, format, *args):  # noqa: A002 - http.server naming
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
+
+
+class _ReadServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+def make_server(
+    service: ReadService, host: str = "127.0.0.1", port: int = 8080
+) -> ThreadingHTTPServer:
+    """Return a threaded HTTP server for ``service`` (``port=0`` picks a free port)."""
+    return _ReadServer((host, port), make_handler(service))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for the read-only HTTP service."""
+    parser = argparse.ArgumentParser(
+        description="Serve the latest metric reports and weather_daily ranges over HTTP"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DB_BACKENDS,
+        help="Override backend (defaults to env-configured backend)",
+    )
+    parser.add_argument("--host", help="Bind address (defaults to PIPELINE_SERVE_HOST)")
+    parser.add_argument(
+        "--port", type=int, help="Port to listen on (defaults to PIPELINE_SERVE_PORT)"
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    config = PipelineConfig.from_env()
+    if args.backend and args.backend != config.db_backend:
+        config = replace(config, db_backend=args.backend)
+    jsoncodec.set_backend(config.json_backend)
+
+    service = ReadService(config)
+    server = make_server(
+        service, args.host or config.serve_host, args.port or config.serve_port
+    )
+    host, port = server.server_address[:2]
+    logger.info(
+        "Serving on http://%s:%d (cache %d MiB)", host, port, config.serve_cache_mb
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+from src.config import PipelineConfig
+from src.utils.io import proc_outpath
+from src.utils.schema import KEEP_ORDER
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_ENTRY_OVERHEAD_BYTES = 120
+_MISSING = object()
+_LIVE_STORES: "weakref.WeakSet[WeatherStore]" = weakref.WeakSet()
+
+
+def invalidate_days(days: Iterable[str] | None = None) -> None:
+    """Drop cached blocks for ``days`` (or everything) from every live store.
+
+    The load stage calls this after rewriting processed artefacts so in-process
+    readers never serve stale values.
+    """
+    days = list(days) if days is not None else None
+    for store in list(_LIVE_STORES):
+        store.invalidate(days)
+
+
+class WeatherStore:
+    """Date-range reader over ``data/processed/<day>/data.parquet`` with an LRU cache.
+
+    Decoded values are cached per ``(day, column)`` block and evicted least recently
+    used once the estimated cache size exceeds ``cache_bytes``. Only the requested
+    columns are decoded from each file. With ``check_files`` enabled every read
+    compares the file's mtime/size to the cached signature, which also catches
+    rewrites made by other processes; disable it to rely solely on
+    :func:`invalidate_days` and skip the ``stat`` calls.
+    """
+
+    def __init__(
+        self,
+        proc_root: Path | str,
+        *,
+        cache_bytes: int = 64 * 1024 * 1024,
+        check_files: bool = True,
+    ):
+        self.proc_root = Path(proc_root)
+        self.cache_bytes = cache_bytes
+        self.check_files = check_files
+        self._blocks: OrderedDict[tuple[str, str], tuple[object, int]] = OrderedDict()
+        self._signatures: dict[str, tuple[int, int] | None] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+        _LIVE_STORES.add(self)
+
+    @classmethod
+    def from_config(cls, config: PipelineConfig, **kwargs) -> "WeatherStore":
+        """Build a store over the configured processed-data root."""
+        kwargs.setdefault("cache_bytes", config.store_cache_mb * 1024 * 1024)
+        return cls(config.proc_root, **kwargs)
+
+    def get_day(self, day: str, columns: Iterable[str] | None = None) -> pd.DataFrame:
+        """Return the single-row frame for ``day``; raise ``KeyError`` when absent."""
+        frame = self.get_range(day, day, columns)
+        if frame.empty:
+            raise KeyError(day)
+        return frame
+
+    def get_range(
+        self, start: str, end: str, columns: Iterable[str] | None = None
+    ) -> pd.DataFrame:
+        """Return the rows between ``start`` and ``end`` (inclusive), ordered by date."""
+        import pandas as pd
+
+        wanted = [
+            column
+            for column in (list(columns) if columns is not None else KEEP_ORDER)
+            if column != "date"
+        ]
+        first = date.fromisoformat(start)
+        last = date.fromisoformat(end)
+
+        data: dict[str, list] = {"date": []}
+        data.update({column: [] for column in wanted})
+        day = first
+        while day <= last:
+            day_str = day.isoformat()
+            values = self._day_values(day_str, wanted)
+            if values is not None:
+                data["date"].append(day_str)
+                for column in wanted:
+                    data[column].append(values[column])
+            day += timedelta(days=1)
+
+        frame = pd.DataFrame(data, columns=["date", *wanted])
+        for column in ("sunrise", "sunset"):
+            if column in frame and frame[column].notna().any():
+                # Naive local times (PIPELINE_TIMEZONE), as in the processed files.
+                frame[column] = pd.to_datetime(frame[column], errors="coerce")
+        return frame
+
+    def invalidate(self, days: Iterable[str] | None = None) -> None:
+        """Forget cached blocks for ``days``, or the whole cache when ``None``."""
+        with self._lock:
+            if days is None:
+                self._blocks.clear()
+                self._signatures.clear()
+                self._size = 0
+                return
+            targets = set(days)
+            for key in [key for key in self._blocks if key[0] in targets]:
+                self._size -= self._blocks.pop(key)[1]
+            for day in targets:
+                self._signatures.pop(day, None)
+
+    def cache_info(self) -> dict:
+        """Return hit/miss counters and the current cache footprint."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._blocks),
+                "bytes": self._size,
+                "max_bytes": self.cache_bytes,
+            }
+
+    def _signature(self, path: Path) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _day_values(self, day: str, columns: list[str]) -> dict | None:
+        """Return ``column -> value`` for ``day``, decoding only uncached columns."""
+        path = proc_outpath(self.proc_root, day)
+        with self._lock:
+            if self.check_files or day not in self._signatures:
+                signature = self._signature(path)
+                if self._signatures.get(day, _MISSING) != signature:
+                    self.invalidate([day])
+                    self._signatures[day] = signature
+            if self._signatures[day] is None:
+                return None
+
+            values: dict = {}
+            missing = []
+            for column in columns:
+                block = self._blocks.get((day, column))
+                if block is None:
+                    missing.append(column)
+                    continue
+                self._blocks.move_to_end((day, column))
+                values[column] = block[0]
+            if not missing:
+                self._hits += 1
+                return values
+            self._misses += 1
+
+        decoded = self._read_columns(path, missing)
+        with self._lock:
+            for column in missing:
+                value = decoded.get(column)
+                values[column] = value
+                self._store_block((day, column), value)
+        return values
+
+    def _read_columns(self, path: Path, columns: list[str]) -> dict:
+        """Decode ``columns`` from a processed file, tolerating absent columns."""
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        present = [name for name in columns if name in parquet_file.schema_arrow.names]
+        if not present:
+            return {}
+        table = parquet_file.read(columns=present)
+        return {
+            name: values[0] if values else None
+            for name, values in table.to_pydict().items()
+        }
+
+    def _store_block(self, key: tuple[str, str], value) -> None:
+        size = sys.getsizeof(value) + _ENTRY_OVERHEAD_BYTES
+        previous = self._blocks.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+        self._blocks[key] = (value, size)
+        self._size += size
+        while self._size > self.cache_bytes and self._blocks:
+            _, (_, evicted_size) = self._blocks.popitem(last=False)
+            self._size -= evicted_size
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import io
+import logging
+import sys
+import time
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import DB_BACKENDS, PipelineConfig
+from src.load import (
+    _duckdb_bulk_upsert,
+    ensure_db_and_table,
+    get_db_engine,
+    load_rollup_statements,
+    load_sql_file,
+    load_upsert_statement,
+    refresh_rollups,
+    write_daily_rows,
+)
+from src.utils.io import bump_data_version, utc_isoformat
+from src.utils.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+SYNC_COLUMNS = (
+    "date",
+    "temp_max_c",
+    "temp_min_c",
+    "temp_max_f",
+    "temp_min_f",
+    "app_temp_max_c",
+    "app_temp_min_c",
+    "precip_mm",
+    "rain_mm",
+    "showers_mm",
+    "snowfall_mm",
+    "precip_hours",
+    "sunrise",
+    "sunset",
+    "daylight_sec",
+    "sunshine_sec",
+    "shortwave_radiation_mj_m2",
+    "wind_max_kmh",
+    "wind_gust_max_kmh",
+    "wind_dir_deg",
+    "weather_code",
+    "et0_mm",
+    "uv_index_max",
+    "uv_index_clear_sky_max",
+    "source",
+    "ingested_at",
+)
+
+# (ingested_at, date) before any real row.
+WATERMARK_START = ("0001-01-01T00:00:00Z", "0001-01-01")
+
+READ_WATERMARK_SQL = """
+SELECT ingested_at, last_date FROM sync_state WHERE source = :source
+"""
+
+SAVE_WATERMARK_SQL = """
+INSERT INTO sync_state (source, ingested_at, last_date, rows_synced, updated_at)
+VALUES (:source, :ingested_at, :last_date, :rows, :now)
+ON CONFLICT (source) DO UPDATE SET
+  ingested_at = excluded.ingested_at,
+  last_date = excluded.last_date,
+  rows_synced = sync_state.rows_synced + excluded.rows_synced,
+  updated_at = excluded.updated_at
+"""
+
+PG_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS weather_daily_incoming
+(LIKE weather_daily INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+
+PG_COPY_SQL = (
+    f"COPY weather_daily_incoming ({', '.join(SYNC_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+
+@dataclass
+class SyncStats:
+    """Counters and timings reported by :func:`sync`."""
+
+    source: str
+    target: str
+    rows: int = 0
+    changed: int = 0
+    chunks: int = 0
+    read_seconds: float = 0.0
+    write_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    watermark: tuple[str, str] | None = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        if not self.rows:
+            return f"{self.target} is up to date with {self.source}"
+        return (
+            f"Synced {self.rows} rows from {self.source} to {self.target} in "
+            f"{self.chunks} chunk(s), {self.elapsed_seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s; read {self.read_seconds:.2f}s, "
+            f"write {self.write_seconds:.2f}s); watermark {self.watermark[0]} "
+            f"/ {self.watermark[1]}"
+        )
+
+
+def _utc_text(value: datetime) -> str:
+    """Format ``value`` like the load stage's ``ingested_at``, keeping microseconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
+
+
+def upsert_record(row) -> dict:
+    """Convert a source row into the plain mapping every target's UPSERT accepts.
+
+    Postgres hands back ``Decimal``/``date``/``datetime`` values and DuckDB
+    ``date``/``datetime``; they become floats and ISO strings, with ``ingested_at``
+    normalised to UTC so watermarks compare the same way on every backend.
+    """
+    record = {}
+    for column, value in zip(SYNC_COLUMNS, row):
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, datetime):
+            value = _utc_text(value) if column == "ingested_at" else value.isoformat()
+        elif isinstance(value, date):
+            value = value.isoformat()
+        record[column] = value
+    return record
+
+
+def _copy_into_postgres(conn, merge_stmt, records: list[dict]) -> None:
+    """COPY ``records`` into a session staging table and merge it into the target."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [record[column] for column in SYNC_COLUMNS] for record in records
+    )
+    buffer.seek(0)
+
+    raw = conn.connection
+    dbapi_conn = getattr(raw, "driver_connection", raw)
+    with dbapi_conn.cursor() as cursor:
+        cursor.execute(PG_STAGING_SQL)
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(PG_COPY_SQL, buffer)
+        else:  # psycopg 3
+            with cursor.copy(PG_COPY_SQL) as copy:
+                copy.write(buffer.getvalue())
+    conn.execute(merge_stmt)
+
+
+def read_watermark(engine, source: str) -> tuple[str, str] | None:
+    """Return the ``(ingested_at, date)`` synced from ``source`` into ``engine``."""
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        row = conn.execute(text(READ_WATERMARK_SQL), {"source": source}).first()
+    return (row[0], row[1]) if row else None
+
+
+def sync(
+    source_config: PipelineConfig,
+    target_config: PipelineConfig,
+    *,
+    chunk_rows: int | None = None,
+    full: bool = False,
+    until: str | None = None,
+) -> SyncStats:
+    """Copy ``weather_daily`` rows from the source backend into the target backend.
+
+    Rows are read in ``(ingested_at, date)`` order from one streaming query and
+    written ``chunk_rows`` at a time: Postgres targets through ``COPY`` into a
+    staging table merged with one ``INSERT ... ON CONFLICT``, SQLite through a
+    bulk ``executemany`` of the shared UPSERT, DuckDB through its Arrow UPSERT.
+    Each chunk commits together with the rollup refresh for its days and the
+    source's watermark in the target's ``sync_state`` table, so an interrupted
+    sync resumes after the last committed chunk and a later one only copies rows
+    ingested since. ``full`` ignores the stored watermark. Rows keep the source's
+    ``ingested_at``, which may be older than the target's own loads, so the
+    target's ``weather_daily`` content version is bumped in the chunk's
+    transaction whenever the chunk changed a row (see
+    :func:`src.load.write_daily_rows`), and the data-version marker after a sync
+    that changed any.
+
+    SQLite stores ``ingested_at`` to the second, so a row written later in the
+    same second as the watermark could sort before it. Only rows ingested before
+    ``until`` (default: the start of the current second) are copied; newer ones
+    wait for the next run.
+    """
+    from sqlalchemy import inspect, text
+
+    if source_config.db_backend == target_config.db_backend:
+        raise ValueError("Source and target backends must differ")
+    chunk_rows = max(1, chunk_rows or source_config.sync_chunk_rows)
+
+    source_engine = get_db_engine(source_config)
+    if not inspect(source_engine).has_table("weather_daily"):
+        raise RuntimeError(
+            "Table 'weather_daily' does not exist in the source database"
+        )
+    target_engine = ensure_db_and_table(target_config)
+    read_stmt = text(
+        load_sql_file(
+            source_config,
+            "sync_read_weather_daily.sql",
+            backend=source_config.db_backend,
+        )
+    )
+    upsert_stmt = load_upsert_statement(target_config)
+    rollup_stmts = load_rollup_statements(target_config)
+    merge_stmt = None
+    if target_config.db_backend == "postgres":
+        merge_stmt = text(
+            load_sql_file(
+                target_config, "sync_merge_weather_daily.sql", backend="postgres"
+            )
+        )
+
+    source_id = source_engine.url.render_as_string(hide_password=True)
+    watermark = None if full else read_watermark(target_engine, source_id)
+    since, after_date = watermark or WATERMARK_START
+    until = until or utc_isoformat()
+    logger.info(
+        "Syncing weather_daily from %s to %s after %s / %s",
+        source_config.db_backend,
+        target_config.db_backend,
+        since,
+        after_date,
+    )
+
+    stats = SyncStats(source_config.db_backend, target_config.db_backend)
+    started = time.perf_counter()
+    try:
+        with source_engine.connect() as source_conn:
+            result = source_conn.execution_options(stream_results=True).execute(
+                read_stmt, {"since": since, "after_date": after_date, "until": until}
+            )
+            partitions = result.partitions(chunk_rows)
+            while True:
+                read_started = time.perf_counter()
+                rows = next(partitions, None)
+                stats.read_seconds += time.perf_counter() - read_started
+                if rows is None:
+                    break
+
+                write_started = time.perf_counter()
+                records = [upsert_record(row) for row in rows]
+                last = records[-1]
+                days = [record["date"] for record in records]
+
+                def write(conn, records=records) -> None:
+                    if merge_stmt is not None:
+                        _copy_into_postgres(conn, merge_stmt, records)
+                    elif conn.dialect.name == "duckdb":
+                        _duckdb_bulk_upsert(conn, upsert_stmt, records)
+                    else:
+                        conn.execute(upsert_stmt, records)
+
+                with target_engine.begin() as conn:
+                    stats.changed += write_daily_rows(conn, days, write)
+                    refresh_rollups(conn, rollup_stmts, days)
+                    conn.execute(
+                        text(SAVE_WATERMARK_SQL),
+                        {
+                            "source": source_id,
+                            "ingested_at": last["ingested_at"],
+                            "last_date": last["date"],
+                            "rows": len(records),
+                            "now": utc_isoformat(),
+                        },
+                    )
+                stats.write_seconds += time.perf_counter() - write_started
+                stats.rows += len(records)
+                stats.chunks += 1
+                stats.watermark = (last["ingested_at"], last["date"])
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    "Synced %d rows (%d total, %.0f rows/s) up to %s",
+                    len(records),
+                    stats.rows,
+                    stats.rows / elapsed if elapsed else 0.0,
+                    last["ingested_at"],
+                )
+    finally:
+        source_engine.dispose()
+        target_engine.dispose()
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    if stats.changed:
+        bump_data_version(target_config.data_version_path)
+    return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for copying weather_daily between configured backends."""
+    parser = argparse.ArgumentParser(
+        description="Stream weather_daily from one configured backend into another"
+    )
+    parser.add_argument(
+        "--source",
+        choices=DB_BACKENDS,
+        help="Backend to read from (defaults to env-configured backend)",
+    )
+    parser.add_argument(
+        "--target", choices=DB_BACKENDS, required=True, help="Backend to write to"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="Rows written per transaction (defaults to PIPELINE_SYNC_CHUNK_ROWS)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Copy every row instead of resuming from the stored watermark",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    config = PipelineConfig.from_env()
+    source_config = replace(config, db_backend=args.source or config.db_backend)
+    target_config = replace(config, db_backend=args.target)
+    if source_config.db_backend == target_config.db_backend:
+        parser.error("--source and --target must name different backends")
+
+    stats = sync(
+        source_config, target_config, chunk_rows=args.chunk_rows, full=args.full
+    )
+    logger.info("%s", stats.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from typing import Any
-
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
 
 from src.utils.schema import FIELD_MAP, KEEP_ORDER
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def _c_to_f(celsius: float | None) -> float | None:
     """Convert Celsius to Fahrenheit, returning ``None`` when the input is missing."""
@@ -39,13 +40,22 @@ def transform_day_payload(per_day_json: dict) -> OrderedDict[str, Any]:
     return ordered
 
 
-def transform_to_dataframe(per_day_json: dict) -> pd.DataFrame:
-    """Return a single-row ``DataFrame`` built from :func:`transform_day_payload`."""
-    cleaned = transform_day_payload(per_day_json)
-    data_frame = pd.DataFrame([cleaned])
+def records_to_dataframe(records: Iterable[Mapping[str, Any]]) -> pd.DataFrame:
+    """Build a ``DataFrame`` from transformed day records, parsing sunrise/sunset."""
+    import pandas as pd
+
+    data_frame = pd.DataFrame(list(records))
     for timestamp_column in ("sunrise", "sunset"):
-        if data_frame[timestamp_column].notna().any():
+        if (
+            timestamp_column in data_frame
+            and data_frame[timestamp_column].notna().any()
+        ):
             data_frame[timestamp_column] = pd.to_datetime(
                 data_frame[timestamp_column], errors="coerce"
             )
     return data_frame
+
+
+def transform_to_dataframe(per_day_json: dict) -> pd.DataFrame:
+    """Return a single-row ``DataFrame`` built from :func:`transform_day_payload`."""
+    return records_to_dataframe([transform_day_payload(per_day_json)])
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
+import io
+import math
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import UTC, date, datetime
+from decimal import Decimal
 from pathlib import Path
-
-import pandas as pd
+from typing import TYPE_CHECKING, Iterable
 
 from src.config import PipelineConfig
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+RAW_FILENAME = "response.json"
+PROC_FILENAME = "data.parquet"
+
 
 def ensure_dir(path: Path | str) -> Path:
     """Create ``path`` (including parents) and return it as a ``Path`` object."""
@@ -15,16 +28,161 @@ def ensure_dir(path: Path | str) -> Path:
     return directory
 
 
+def raw_outpath(base_dir: Path | str, day_str: str) -> Path:
+    """Return the file path for a raw JSON artefact without touching the filesystem."""
+    return Path(base_dir) / day_str / RAW_FILENAME
+
+
+def proc_outpath(base_dir: Path | str, day_str: str) -> Path:
+    """Return the file path for a processed parquet artefact without touching disk."""
+    return Path(base_dir) / day_str / PROC_FILENAME
+
+
 def ensure_raw_outpath(base_dir: Path | str, day_str: str) -> Path:
     """Return the file path for a raw JSON artefact, creating the day folder."""
-    out_dir = ensure_dir(Path(base_dir) / day_str)
-    return out_dir / "response.json"
+    path = raw_outpath(base_dir, day_str)
+    ensure_dir(path.parent)
+    return path
 
 
 def ensure_proc_outpath(base_dir: Path | str, day_str: str) -> Path:
     """Return the file path for a processed parquet artefact, creating the folder."""
-    out_dir = ensure_dir(Path(base_dir) / day_str)
-    return out_dir / "data.parquet"
+    path = proc_outpath(base_dir, day_str)
+    ensure_dir(path.parent)
+    return path
+
+
+def _file_mode() -> int:
+    """Return the mode ``open()`` would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Read once: changing the umask to read it is not safe next to writer threads.
+_FILE_MODE = _file_mode()
+
+
+def atomic_write_bytes(path: Path | str, data: bytes) -> Path:
+    """Write ``data`` to a temporary sibling of ``path`` and rename it into place.
+
+    Readers observe either the previous file or the complete new one, never a
+    truncated artefact, even if the process dies mid-write. The data is flushed
+    to disk before the rename, and the file gets the usual umask-based mode
+    rather than the private ``0600`` of :func:`tempfile.mkstemp`.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, _FILE_MODE)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return path
+
+
+def parquet_bytes(data_frame: pd.DataFrame) -> bytes:
+    """Serialise ``data_frame`` to Parquet in memory using the pyarrow engine."""
+    buffer = io.BytesIO()
+    data_frame.to_parquet(buffer, index=False, engine="pyarrow")
+    return buffer.getvalue()
+
+
+class ArtefactWriter:
+    """Batch-oriented writer for raw and processed artefacts.
+
+    Directories are created once per writer rather than once per file, every file
+    is written atomically, and with ``max_workers > 0`` the writes are handed to a
+    background thread pool whose backlog is capped at ``max_pending`` files.
+    Serialisation happens on the calling thread; only the filesystem work is
+    deferred. Call :meth:`flush` to wait for outstanding writes and surface errors.
+    """
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 64):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self._created: set[Path] = set()
+        self._executor = (
+            ThreadPoolExecutor(max_workers, thread_name_prefix="artefact-writer")
+            if max_workers > 0
+            else None
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._futures: list[Future] = []
+
+    def ensure_dirs(self, directories: Iterable[Path | str]) -> None:
+        """Create each directory that this writer has not created yet."""
+        for directory in map(Path, directories):
+            if directory not in self._created:
+                directory.mkdir(parents=True, exist_ok=True)
+                self._created.add(directory)
+
+    def write_bytes(self, path: Path | str, data: bytes) -> None:
+        """Atomically write ``data`` to ``path``, possibly on a background thread."""
+        path = Path(path)
+        self.ensure_dirs([path.parent])
+        if self._executor is None:
+            atomic_write_bytes(path, data)
+            return
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(atomic_write_bytes, path, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def write_parquet(self, path: Path | str, data_frame: pd.DataFrame) -> None:
+        """Serialise ``data_frame`` to Parquet and write it atomically."""
+        self.write_bytes(path, parquet_bytes(data_frame))
+
+    def flush(self) -> None:
+        """Block until queued writes finish, re-raising the first failure."""
+        futures, self._futures = self._futures, []
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def close(self) -> None:
+        """Flush outstanding writes and stop the background pool."""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ArtefactWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def link_or_copy(source: Path | str, destination: Path | str) -> Path:
+    """Hard-link ``source`` to ``destination``, copying when links are unsupported."""
+    source = Path(source)
+    destination = Path(destination)
+    if destination.exists():
+        if destination.samefile(source):
+            return destination
+        destination.unlink()
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
 
 
 def load_sql_file(
@@ -35,6 +193,8 @@ def load_sql_file(
         base_dir = config.sqlite_sql_dir
     elif backend == "postgres":
         base_dir = config.pg_sql_dir
+    elif backend == "duckdb":
+        base_dir = config.duckdb_sql_dir
     else:
         base_dir = config.sql_dir
 
@@ -42,12 +202,35 @@ def load_sql_file(
     return path.read_text(encoding="utf-8")
 
 
+def bump_data_version(path: Path | str) -> Path:
+    """Atomically replace the data-version marker at ``path``.
+
+    Writers call this after changing ``weather_daily`` or publishing a report;
+    long-lived readers such as the HTTP read service watch the marker and drop
+    their caches when it changes.
+    """
+    path = Path(path)
+    ensure_dir(path.parent)
+    return atomic_write_bytes(path, f"{utc_isoformat()} {os.getpid()}\n".encode())
+
+
 def json_default(value):
     """Serialize pandas-aware values for JSON dumps used throughout the project."""
     if isinstance(value, (datetime, date)):
         return value.isoformat()
-    if pd.isna(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, Decimal):
+        # Postgres NUMERIC columns come back from the driver as Decimal.
+        return None if value.is_nan() else float(value)
+
+    import numpy as np
+    import pandas as pd
+
+    if pd.api.types.is_scalar(value) and pd.isna(value):
         return None
+    if isinstance(value, np.generic):
+        return value.item()
     raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from src.utils.io import json_default
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+
+class _StdlibCodec:
+    """Codec backed by the standard library ``json`` module."""
+
+    name = "json"
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, indent: bool, default: Callable) -> bytes:
+        if indent:
+            text = json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+        else:
+            text = json.dumps(
+                obj, ensure_ascii=False, separators=(",", ":"), default=default
+            )
+        return text.encode("utf-8")
+
+
+class _OrjsonCodec:
+    """Codec backed by the optional ``orjson`` extension."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._compact = orjson.OPT_SERIALIZE_NUMPY
+        self._indented = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+
+    def loads(self, data: bytes | bytearray | memoryview | str) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any, *, indent: bool, default: Callable) -> bytes:
+        option = self._indented if indent else self._compact
+        return self._orjson.dumps(obj, default=default, option=option)
+
+
+_codec: _StdlibCodec | _OrjsonCodec | None = None
+
+
+def resolve_codec(name: str = "auto") -> _StdlibCodec | _OrjsonCodec:
+    """Return the codec for ``name``; ``auto`` prefers orjson when it is installed."""
+    if name not in JSON_BACKENDS:
+        raise ValueError(
+            f"Unknown JSON backend {name!r} (expected one of {', '.join(JSON_BACKENDS)})"
+        )
+    if name in {"auto", "orjson"}:
+        try:
+            return _OrjsonCodec()
+        except ImportError as exc:
+            if name == "orjson":
+                raise RuntimeError(
+                    "The orjson JSON backend requires the optional 'orjson' package"
+                ) from exc
+    return _StdlibCodec()
+
+
+def set_backend(name: str = "auto") -> str:
+    """Select the process-wide codec and return the name of the backend in use."""
+    global _codec
+    _codec = resolve_codec(name)
+    return _codec.name
+
+
+def backend_name() -> str:
+    """Return the name of the active backend (``orjson`` or ``json``)."""
+    return _active().name
+
+
+def _active() -> _StdlibCodec | _OrjsonCodec:
+    global _codec
+    if _codec is None:
+        _codec = resolve_codec("auto")
+    return _codec
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode a JSON document from UTF-8 bytes or text."""
+    return _active().loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False, default: Callable = json_default) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON bytes, compact unless ``indent`` is set.
+
+    Both backends emit non-ASCII characters verbatim, indent by two spaces when
+    asked to, and hand values they cannot encode natively (pandas timestamps and
+    missing values) to ``default``.
+    """
+    return _active().dumps(obj, indent=indent, default=default)
@@ -0,0 +1,274 @@
+"""Incremental parsing of archive responses into bounded windows of days.
+
+The archive API returns ``daily`` column by column (``{"time": [...],
+"temperature_2m_max": [...], ...}``), so no day is complete until the last column
+has arrived. :func:`spool_archive` therefore reads the body chunk by chunk and
+appends every array element, still encoded, as one line of a per-column spool (in
+memory up to ``spool_bytes``, on disk beyond).
+:meth:`SpooledArchive.iter_windows` then decodes ``window_days`` lines of every
+column at a time. Peak memory is one network chunk, the in-memory part of the
+spools and a single window, whatever the size of the requested range.
+"""
+
+from __future__ import annotations
+
+import re
+import tempfile
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator
+
+from src.utils import jsoncodec
+
+SPOOL_MAX_BYTES = 256 * 1024
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+_SCALAR = re.compile(rb'"(?:[^"\\]|\\.)*"|-?[0-9][0-9.eE+\-]*|null|true|false')
+_NOT_STRUCTURAL = re.compile(rb'[^"{}\[\]]*')
+# One array element plus the delimiter after it. JSON strings cannot hold a raw
+# newline, so each element fits on one spool line.
+_ARRAY_ITEM = re.compile(
+    rb'[ \t\r\n]*("(?:[^"\\]|\\.)*"|-?[0-9][0-9.eE+\-]*|null|true|false)'
+    rb"[ \t\r\n]*([,\]])"
+)
+
+
+class _ChunkReader:
+    """A byte buffer over an iterable of chunks, refilled on demand."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self.buf = b""
+        self.pos = 0
+        self.bytes_read = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk, dropping consumed bytes; False at EOF."""
+        for chunk in self._chunks:
+            if chunk:
+                self.buf = self.buf[self.pos :] + chunk
+                self.pos = 0
+                self.bytes_read += len(chunk)
+                return True
+        self.eof = True
+        return False
+
+    def error(self, message: str) -> ValueError:
+        offset = self.bytes_read - len(self.buf) + self.pos
+        return ValueError(f"Malformed archive JSON at byte {offset}: {message}")
+
+    def peek(self) -> bytes:
+        """Return the next non-whitespace byte without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos : self.pos + 1]
+            if not self.fill():
+                raise self.error("unexpected end of stream")
+
+    def expect(self, char: bytes) -> None:
+        if self.peek() != char:
+            raise self.error(f"expected {char.decode()!r}")
+        self.pos += 1
+
+    def separator(self, closing: bytes) -> bool:
+        """Consume ``,`` (return True) or ``closing`` (return False)."""
+        char = self.peek()
+        self.pos += 1
+        if char == b",":
+            return True
+        if char == closing:
+            return False
+        raise self.error(f"expected ',' or {closing.decode()!r}")
+
+    def scalar(self) -> bytes:
+        """Return the encoded string, number or literal at the cursor."""
+        self.peek()
+        while True:
+            match = _SCALAR.match(self.buf, self.pos)
+            # A token touching the end of the buffer may continue in the next chunk.
+            if match and match.end() < len(self.buf):
+                self.pos = match.end()
+                return match.group()
+            if not self.fill():
+                if match:
+                    self.pos = match.end()
+                    return match.group()
+                raise self.error("expected a value")
+
+    def value(self) -> bytes:
+        """Return the encoded value at the cursor, including nested containers."""
+        if self.peek() not in (b"{", b"["):
+            return self.scalar()
+        parts: list[bytes] = []
+        depth = 0
+        while True:
+            end = _NOT_STRUCTURAL.match(self.buf, self.pos).end()
+            parts.append(self.buf[self.pos : end])
+            self.pos = end
+            if end == len(self.buf):
+                if not self.fill():
+                    raise self.error("unexpected end of stream")
+                continue
+            char = self.buf[end : end + 1]
+            if char == b'"':
+                match = _STRING.match(self.buf, end)
+                if match is None:
+                    if not self.fill():
+                        raise self.error("unterminated string")
+                    continue
+                parts.append(match.group())
+                self.pos = match.end()
+                continue
+            parts.append(char)
+            self.pos += 1
+            depth += 1 if char in (b"{", b"[") else -1
+            if depth == 0:
+                return b"".join(parts)
+
+    def finish(self) -> None:
+        """Consume the rest of the stream, which may only hold whitespace."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                raise self.error("trailing data after the top-level object")
+            if not self.fill():
+                return
+
+    def spool_array(self, out: IO[bytes]) -> int:
+        """Copy the elements of the array at the cursor to ``out``, one per line."""
+        self.expect(b"[")
+        if self.peek() == b"]":
+            self.pos += 1
+            return 0
+        count = 0
+        while True:
+            end = self.buf.find(b"]", self.pos)
+            stop = end if end >= 0 else self.buf.rfind(b",", self.pos)
+            if stop >= 0 and b'"' not in self.buf[self.pos : stop]:
+                # Numbers and literals only: split everything up to the closing
+                # bracket (or the last complete element) in one go.
+                segment = self.buf[self.pos : stop].translate(None, b" \t\r\n")
+                items = segment.split(b",")
+                if b"" in items:
+                    raise self.error("empty array element")
+                out.write(b"\n".join(items) + b"\n")
+                count += len(items)
+                self.pos = stop + 1
+                if stop == end:
+                    return count
+                continue
+
+            items = []
+            match = _ARRAY_ITEM.match(self.buf, self.pos)
+            while match is not None:
+                items.append(match.group(1))
+                self.pos = match.end()
+                if match.group(2) == b"]":
+                    break
+                match = _ARRAY_ITEM.match(self.buf, self.pos)
+            if items:
+                out.write(b"\n".join(items) + b"\n")
+                count += len(items)
+            if match is not None:
+                return count
+            if not self.fill():
+                raise self.error("unterminated array")
+
+
+class SpooledArchive:
+    """An archive response whose ``daily`` columns are spooled line by line."""
+
+    def __init__(
+        self,
+        meta: dict[str, Any],
+        columns: dict[str, tuple[IO[bytes], int]],
+        bytes_read: int,
+    ):
+        self.meta = meta
+        self.columns = columns
+        self.bytes_read = bytes_read
+        counts = {name: count for name, (_, count) in columns.items()}
+        self.days = counts.get("time", max(counts.values(), default=0))
+
+    def __enter__(self) -> "SpooledArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def iter_windows(self, window_days: int) -> Iterator[dict]:
+        """Yield payloads shaped like the response, ``window_days`` days at a time.
+
+        Each payload carries the top-level fields of the response and a ``daily``
+        object with the window's slice of every column.
+        """
+        window_days = max(1, window_days)
+        for spool, _ in self.columns.values():
+            spool.seek(0)
+        for offset in range(0, self.days, window_days):
+            size = min(window_days, self.days - offset)
+            daily = {}
+            for name, (spool, count) in self.columns.items():
+                lines = islice(spool, max(0, min(size, count - offset)))
+                daily[name] = jsoncodec.loads(
+                    b"[" + b",".join(line[:-1] for line in lines) + b"]"
+                )
+            yield {**self.meta, "daily": daily}
+
+    def close(self) -> None:
+        for spool, _ in self.columns.values():
+            spool.close()
+
+
+def spool_archive(
+    chunks: Iterable[bytes], *, spool_bytes: int = SPOOL_MAX_BYTES
+) -> SpooledArchive:
+    """Parse an archive response body from ``chunks`` into a :class:`SpooledArchive`.
+
+    Top-level fields other than ``daily`` (co-ordinates, units, ...) are small and
+    decoded as usual; every ``daily`` array is spooled without being decoded.
+    """
+    reader = _ChunkReader(chunks)
+    meta: dict[str, Any] = {}
+    columns: dict[str, tuple[IO[bytes], int]] = {}
+    try:
+        reader.expect(b"{")
+        if reader.peek() == b"}":
+            reader.pos += 1
+        else:
+            while True:
+                key = jsoncodec.loads(reader.scalar())
+                reader.expect(b":")
+                if key == "daily" and reader.peek() == b"{":
+                    _spool_daily(reader, columns, spool_bytes)
+                else:
+                    meta[key] = jsoncodec.loads(reader.value())
+                if not reader.separator(b"}"):
+                    break
+        reader.finish()
+    except BaseException:
+        for spool, _ in columns.values():
+            spool.close()
+        raise
+    return SpooledArchive(meta, columns, reader.bytes_read)
+
+
+def _spool_daily(
+    reader: _ChunkReader,
+    columns: dict[str, tuple[IO[bytes], int]],
+    spool_bytes: int,
+) -> None:
+    reader.expect(b"{")
+    if reader.peek() == b"}":
+        reader.pos += 1
+        return
+    while True:
+        name = jsoncodec.loads(reader.scalar())
+        reader.expect(b":")
+        spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        columns[name] = (spool, 0)  # registered first so a failure still closes it
+        columns[name] = (spool, reader.spool_array(spool))
+        if not reader.separator(b"}"):
+            return
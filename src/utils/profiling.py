@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class _FrameSampler:
+    """Background thread counting the functions a target thread is executing."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.self_counts: Counter[str] = Counter()
+        self.total_counts: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profiling-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_counts[_frame_label(frame)] += 1
+            seen = set()
+            while frame is not None:
+                label = _frame_label(frame)
+                if label not in seen:
+                    self.total_counts[label] += 1
+                    seen.add(label)
+                frame = frame.f_back
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+@dataclass
+class _StageStats:
+    wall_seconds: float = 0.0
+    calls: int = 0
+    profile: cProfile.Profile | None = None
+    peak_bytes: int = 0
+    snapshot: tracemalloc.Snapshot | None = None
+    self_samples: Counter = field(default_factory=Counter)
+    total_samples: Counter = field(default_factory=Counter)
+    samples: int = 0
+
+
+class StageProfiler:
+    """Opt-in per-stage profiling for the pipeline.
+
+    Each :meth:`stage` block can collect a cProfile profile (``cpu``), the peak
+    traced allocation size plus a tracemalloc snapshot (``memory``) and a sampled
+    histogram of the functions running on the calling thread (``sample``). Re-entering
+    a stage accumulates into the same statistics; nested stages are attributed to
+    the outer one. :meth:`finish` writes the results under ``output_dir`` and logs a
+    short top-N summary. With no modes enabled every method is a cheap no-op.
+    """
+
+    def __init__(
+        self,
+        modes: Iterable[str],
+        output_dir: Path | str,
+        *,
+        top_n: int = 10,
+        sample_interval: float = 0.005,
+    ):
+        self.modes = frozenset(modes)
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.sample_interval = sample_interval
+        self._stages: dict[str, _StageStats] = {}
+        self._active: str | None = None
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.modes)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as part of stage ``name``."""
+        if not self.enabled or self._active is not None:
+            yield
+            return
+
+        stats = self._stages.setdefault(name, _StageStats())
+        self._active = name
+        sampler = None
+        if "memory" in self.modes:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(25)
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+        if "sample" in self.modes:
+            sampler = _FrameSampler(threading.get_ident(), self.sample_interval)
+            sampler.start()
+        if "cpu" in self.modes:
+            stats.profile = stats.profile or cProfile.Profile()
+            stats.profile.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.wall_seconds += time.perf_counter() - started
+            stats.calls += 1
+            if stats.profile is not None:
+                stats.profile.disable()
+            if sampler is not None:
+                sampler.stop()
+                stats.self_samples.update(sampler.self_counts)
+                stats.total_samples.update(sampler.total_counts)
+                stats.samples += sampler.samples
+            if "memory" in self.modes:
+                peak = tracemalloc.get_traced_memory()[1]
+                if peak >= stats.peak_bytes:
+                    stats.peak_bytes = peak
+                    stats.snapshot = tracemalloc.take_snapshot()
+            self._active = None
+
+    def wrap_iterator(self, name: str, iterator: Iterable) -> Iterator:
+        """Yield from ``iterator`` while attributing each ``next()`` call to ``name``."""
+        iterator = iter(iterator)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def finish(self) -> Path | None:
+        """Write per-stage artefacts, log a summary and return the output directory."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if not self.enabled or not self._stages:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for name, stats in self._stages.items():
+            summary = [
+                f"stage {name}: {stats.wall_seconds:.3f}s over {stats.calls} call(s)"
+            ]
+            if stats.profile is not None:
+                stats.profile.dump_stats(self.output_dir / f"{name}.prof")
+                buffer = io.StringIO()
+                pstats.Stats(stats.profile, stream=buffer).sort_stats(
+                    "cumulative"
+                ).print_stats(self.top_n)
+                (self.output_dir / f"{name}.cpu.txt").write_text(
+                    buffer.getvalue(), encoding="utf-8"
+                )
+                summary.append(_top_cumulative(stats.profile, self.top_n))
+            if stats.snapshot is not None:
+                top = stats.snapshot.statistics("lineno")[: self.top_n]
+                lines = [
+                    f"peak traced memory: {stats.peak_bytes / 1024 / 1024:.2f} MiB"
+                ]
+                lines.extend(str(stat) for stat in top)
+                (self.output_dir / f"{name}.memory.txt").write_text(
+                    "\n".join(lines) + "\n", encoding="utf-8"
+                )
+                summary.append(lines[0])
+            if stats.samples:
+                lines = [f"{stats.samples} samples"]
+                lines.append("self:")
+                lines.extend(
+                    f"  {count:6d}  {label}"
+                    for label, count in stats.self_samples.most_common(self.top_n)
+                )
+                lines.append("inclusive:")
+                lines.extend(
+                    f"  {count:6d}  {label}"
+                    for label, count in stats.total_samples.most_common(self.top_n)
+                )
+                (self.output_dir / f"{name}.samples.txt").write_text(
+                    "\n".join(lines) + "\n", encoding="utf-8"
+                )
+                hottest = ", ".join(
+                    f"{label} ({count})"
+                    for label, count in stats.self_samples.most_common(3)
+                )
+                summary.append(f"hottest sampled frames: {hottest}")
+            logger.info("Profile %s", "\n  ".join(summary))
+
+        logger.info("Wrote profiling output to %s", self.output_dir)
+        return self.output_dir
+
+
+def _top_cumulative(profile: cProfile.Profile, top_n: int) -> str:
+    """Format the ``top_n`` functions by cumulative time as compact lines."""
+    stats = pstats.Stats(profile)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[
+        :top_n
+    ]
+    lines = ["top functions by cumulative time:"]
+    for (filename, lineno, function), (_, ncalls, tottime, cumtime, _) in rows:
+        lines.append(
+            f"  {cumtime:8.3f}s cum {tottime:8.3f}s self {ncalls:7d}x  "
+            f"{Path(filename).name}:{lineno}({function})"
+        )
+    return "\n  ".join(lines)
@@ -0,0 +1,320 @@
+"""Tail-latency controls for archive requests: hedging, adaptive timeouts, breaker.
+
+:class:`RequestGuard` wraps ``session.get`` for
+:func:`src.extract.http_get_with_retries`. It keeps a rolling window of response
+latencies per endpoint (:class:`LatencyTracker`) and uses it twice:
+
+- a request still unanswered after the ``hedge_percentile`` latency gets one
+  duplicate on a second thread, and whichever response arrives first is used;
+- the timeout of every request is ``timeout_multiplier`` times the 99th
+  percentile latency, clamped to ``[min_timeout, max_timeout]``.
+
+Until ``min_samples`` latencies are known neither applies, and requests use
+``max_timeout`` as before. A :class:`CircuitBreaker` opens when the share of
+failed requests in its window reaches ``error_rate``; while open, requests fail
+at once with :class:`CircuitOpenError` instead of reaching the network. Every
+decision is counted in :class:`RequestCounters`.
+
+A guard is not thread-safe; give each fetching thread its own.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+FAILURE_STATUSES = (429, 500, 502, 503, 504)
+# Losing attempts keep a thread until they finish or time out, so the pool must
+# leave room for a few of them next to the current request and its hedge.
+HEDGE_THREADS = 8
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"Circuit breaker open; archive requests paused for {retry_after:.1f}s"
+        )
+        self.retry_after = retry_after
+
+
+@dataclass
+class RequestCounters:
+    """What a :class:`RequestGuard` did, cumulated over its lifetime."""
+
+    requests: int = 0
+    sent: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    rejected: int = 0
+    breaker_trips: int = 0
+    pauses: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={value}" for name, value in asdict(self).items())
+
+
+class LatencyTracker:
+    """Most recent ``window`` latencies (seconds) of each endpoint."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        samples = self._samples.get(endpoint)
+        if samples is None:
+            samples = self._samples[endpoint] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def count(self, endpoint: str) -> int:
+        return len(self._samples.get(endpoint, ()))
+
+    def percentile(self, endpoint: str, percentile: float) -> float | None:
+        """Return the nearest-rank ``percentile`` (0-100) latency, if any."""
+        samples = self._samples.get(endpoint)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(1, -(-len(ordered) * percentile // 100))
+        return ordered[int(min(rank, len(ordered))) - 1]
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over the outcomes of the last ``window`` requests.
+
+    The breaker opens once at least ``min_requests`` outcomes are known and the
+    failed share reaches ``error_rate``. After ``cooldown_seconds`` it lets one
+    probe request through (half-open): success closes it with a fresh window,
+    failure opens it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        *,
+        error_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 5,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 0 < error_rate <= 1:
+            raise ValueError("error_rate must be in (0, 1]")
+        self.error_rate = error_rate
+        self.min_requests = min(max(1, min_requests), window)
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._probing else "open"
+
+    def retry_after(self) -> float:
+        """Seconds until a request is allowed through (0 when it is now)."""
+        if self._opened_at is None or self._probing:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown_seconds - self.clock())
+
+    def before_request(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a request may be sent now."""
+        if self._opened_at is None:
+            return
+        wait = self.retry_after()
+        if self._probing or wait > 0:
+            raise CircuitOpenError(wait or self.cooldown_seconds)
+        self._probing = True
+
+    def record(self, success: bool) -> bool:
+        """Record an outcome; return ``True`` when it opened the breaker."""
+        if self._opened_at is not None:
+            self._probing = False
+            if success:
+                self._opened_at = None
+                self._outcomes.clear()
+                logger.info("Circuit breaker closed after a successful probe")
+                return False
+            self._opened_at = self.clock()
+            return True
+        self._outcomes.append(success)
+        known = len(self._outcomes)
+        failures = self._outcomes.count(False)
+        if known >= self.min_requests and failures >= self.error_rate * known:
+            self._opened_at = self.clock()
+            logger.warning(
+                "Circuit breaker opened: %d of the last %d requests failed",
+                failures,
+                known,
+            )
+            return True
+        return False
+
+
+def _is_timeout(exc: BaseException) -> bool:
+    """Whether ``exc`` (or the urllib3 error behind it) is a timeout."""
+    from requests.exceptions import Timeout
+    from urllib3.exceptions import TimeoutError as Urllib3Timeout
+
+    if isinstance(exc, Timeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, Urllib3Timeout)
+
+
+class RequestGuard:
+    """Hedged GETs with adaptive timeouts behind a circuit breaker.
+
+    ``hedge_percentile=None`` disables hedging, ``timeout_multiplier=None`` keeps
+    the fixed ``max_timeout`` and ``breaker=None`` never fails fast.
+    """
+
+    def __init__(
+        self,
+        *,
+        hedge_percentile: float | None = 95.0,
+        timeout_multiplier: float | None = 4.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 60.0,
+        min_samples: int = 10,
+        breaker: CircuitBreaker | None = None,
+        tracker: LatencyTracker | None = None,
+        failure_statuses: Iterable[int] = FAILURE_STATUSES,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.max_timeout = max_timeout
+        self.min_samples = max(1, min_samples)
+        self.breaker = breaker
+        self.tracker = tracker or LatencyTracker()
+        self.failure_statuses = frozenset(failure_statuses)
+        self.counters = RequestCounters()
+        self._pool = None
+
+    def timeout(self, endpoint: str) -> float:
+        """Per-request timeout for ``endpoint`` from its observed latency."""
+        if (
+            self.timeout_multiplier is None
+            or self.tracker.count(endpoint) < self.min_samples
+        ):
+            return self.max_timeout
+        p99 = self.tracker.percentile(endpoint, 99)
+        timeout = max(self.timeout_multiplier * p99, self.min_timeout)
+        return min(timeout, self.max_timeout)
+
+    def hedge_delay(self, endpoint: str) -> float | None:
+        """Seconds to wait before hedging ``endpoint`` (``None``: never)."""
+        if (
+            self.hedge_percentile is None
+            or self.tracker.count(endpoint) < self.min_samples
+        ):
+            return None
+        return self.tracker.percentile(endpoint, self.hedge_percentile)
+
+    def get(self, session, url: str, params: dict, *, stream: bool = False):
+        """``session.get(url, params=...)`` under the guard's policies."""
+        self.counters.requests += 1
+        if self.breaker is not None:
+            try:
+                self.breaker.before_request()
+            except CircuitOpenError:
+                self.counters.rejected += 1
+                raise
+        try:
+            response = self._send(session, url, params, stream)
+        except Exception as exc:
+            self.counters.failures += 1
+            if _is_timeout(exc):
+                self.counters.timeouts += 1
+            self._record_outcome(False)
+            raise
+        failed = response.status_code in self.failure_statuses
+        if failed:
+            self.counters.failures += 1
+        self._record_outcome(not failed)
+        return response
+
+    def close(self) -> None:
+        """Stop the hedging thread pool; in-flight losers are abandoned."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _record_outcome(self, success: bool) -> None:
+        if self.breaker is not None and self.breaker.record(success):
+            self.counters.breaker_trips += 1
+
+    def _attempt(self, session, url: str, params: dict, stream: bool, timeout: float):
+        started = time.perf_counter()
+        response = session.get(url, params=params, timeout=timeout, stream=stream)
+        return response, time.perf_counter() - started
+
+    def _send(self, session, url: str, params: dict, stream: bool):
+        timeout = self.timeout(url)
+        delay = self.hedge_delay(url)
+        if delay is None:
+            self.counters.sent += 1
+            response, elapsed = self._attempt(session, url, params, stream, timeout)
+            if response.status_code == 200:
+                self.tracker.record(url, elapsed)
+            return response
+
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                HEDGE_THREADS, thread_name_prefix="archive-hedge"
+            )
+        pending = {
+            self._pool.submit(self._attempt, session, url, params, stream, timeout)
+        }
+        self.counters.sent += 1
+        done, _ = wait(pending, timeout=delay)
+        hedge = None
+        if not done:
+            hedge = self._pool.submit(
+                self._attempt, session, url, params, stream, timeout
+            )
+            pending.add(hedge)
+            self.counters.sent += 1
+            self.counters.hedged += 1
+            logger.info("Hedging archive request after %.2fs", delay)
+
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response, elapsed = future.result()
+                except Exception as exc:
+                    error = exc
+                    continue
+                for loser in pending | (done - {future}):
+                    loser.add_done_callback(_close_response)
+                if future is hedge:
+                    self.counters.hedge_wins += 1
+                if response.status_code == 200:
+                    self.tracker.record(url, elapsed)
+                return response
+        raise error
+
+
+def _close_response(future) -> None:
+    """Release the connection of a hedged request whose twin already answered."""
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].close()
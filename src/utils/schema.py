@@ -78,3 +78,29 @@ KEEP_ORDER = [
     "uv_index_max",
     "uv_index_clear_sky_max",
 ]
+
+
+# Column CHECK constraints of ``weather_daily`` as ``(lower_op, lower, upper_op, upper)``.
+# They mirror ``resources/sql/<backend>/init.sql``; NULL always passes.
+_Bounds = tuple[str | None, float | None, str | None, float | None]
+CHECK_CONSTRAINTS: dict[str, _Bounds] = {
+    "temp_max_c": (">", -100, "<", 70),
+    "temp_min_c": (">", -120, "<", 70),
+    "app_temp_max_c": (">", -120, "<", 80),
+    "app_temp_min_c": (">", -120, "<", 80),
+    "precip_mm": (">=", 0, None, None),
+    "rain_mm": (">=", 0, None, None),
+    "showers_mm": (">=", 0, None, None),
+    "snowfall_mm": (">=", 0, None, None),
+    "precip_hours": (">=", 0, "<=", 24),
+    "daylight_sec": (">=", 0, "<=", 86400),
+    "sunshine_sec": (">=", 0, "<=", 86400),
+    "shortwave_radiation_mj_m2": (">=", 0, None, None),
+    "wind_max_kmh": (">=", 0, None, None),
+    "wind_gust_max_kmh": (">=", 0, None, None),
+    "wind_dir_deg": (">=", 0, "<=", 360),
+    "weather_code": (">=", 0, "<=", 99),
+    "et0_mm": (">=", 0, None, None),
+    "uv_index_max": (">=", 0, None, None),
+    "uv_index_clear_sky_max": (">=", 0, None, None),
+}
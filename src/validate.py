@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import operator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.config import PipelineConfig
+from src.utils.io import (
+    ArtefactWriter,
+    atomic_write_bytes,
+    ensure_dir,
+    parquet_bytes,
+    utc_isoformat,
+)
+from src.utils.schema import CHECK_CONSTRAINTS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REASONS_COLUMN = "reasons"
+
+_OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+
+def validate_frame(data_frame: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split ``data_frame`` into rows the database will accept and rows it would reject.
+
+    Each check runs over a whole column at once and mirrors ``weather_daily``: the
+    ``date`` key must parse, and every column in ``CHECK_CONSTRAINTS`` must be null
+    or numeric within its bounds. Rejected rows keep their original values plus a
+    ``reasons`` column listing every violated constraint.
+    """
+    import numpy as np
+    import pandas as pd
+
+    failures: list[tuple[np.ndarray, str, pd.Series | None]] = []
+
+    if "date" in data_frame:
+        dates = pd.to_datetime(data_frame["date"], errors="coerce", format="ISO8601")
+        failures.append((dates.isna().to_numpy(), "date is missing or invalid", None))
+    else:
+        failures.append(
+            (np.ones(len(data_frame), dtype=bool), "date is missing or invalid", None)
+        )
+
+    for column, (lower_op, lower, upper_op, upper) in CHECK_CONSTRAINTS.items():
+        if column not in data_frame:
+            continue
+        raw = data_frame[column]
+        values = pd.to_numeric(raw, errors="coerce")
+        present = values.notna()
+        not_numeric = (raw.notna() & ~present).to_numpy()
+        failures.append((not_numeric, f"{column} {{value!r}} is not numeric", raw))
+        for op, bound in ((lower_op, lower), (upper_op, upper)):
+            if op is None:
+                continue
+            violated = present & ~_OPERATORS[op](values, bound)
+            failures.append(
+                (
+                    violated.to_numpy(),
+                    f"{column} {{value}} violates {op} {bound}",
+                    values,
+                )
+            )
+
+    bad = np.logical_or.reduce([mask for mask, _, _ in failures])
+    if not bad.any():
+        return data_frame, data_frame.iloc[0:0].assign(**{REASONS_COLUMN: []})
+
+    positions = np.flatnonzero(bad)
+    reasons = []
+    for position in positions:
+        messages = []
+        for mask, message, values in failures:
+            if mask[position]:
+                value = None if values is None else values.iloc[position]
+                messages.append(message.format(value=value))
+        reasons.append("; ".join(messages))
+
+    rejected = data_frame.iloc[positions].assign(**{REASONS_COLUMN: reasons})
+    return data_frame.iloc[np.flatnonzero(~bad)], rejected
+
+
+def quarantine_path(quarantine_root: Path, rejected: pd.DataFrame) -> Path:
+    """Return the Parquet path for ``rejected``, named by UTC time and its dates."""
+    stamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    dates = rejected["date"].dropna().astype(str) if "date" in rejected else []
+    span = f"{min(dates)}_{max(dates)}" if len(dates) else "undated"
+    return Path(quarantine_root) / f"{stamp}_{span}.parquet"
+
+
+def write_quarantine(
+    rejected: pd.DataFrame,
+    quarantine_root: Path,
+    writer: ArtefactWriter | None = None,
+) -> Path:
+    """Persist ``rejected`` rows with their reasons and a ``quarantined_at`` stamp.
+
+    Columns that hold the offending non-numeric values are written as text so a
+    single bad cell cannot make the Parquet write itself fail.
+    """
+    import pandas as pd
+
+    frame = rejected.assign(quarantined_at=utc_isoformat())
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = frame[column].map(
+                lambda value: None if pd.isna(value) else str(value)
+            )
+
+    path = quarantine_path(quarantine_root, rejected)
+    payload = parquet_bytes(frame)
+    if writer is None:
+        ensure_dir(path.parent)
+        atomic_write_bytes(path, payload)
+    else:
+        writer.write_bytes(path, payload)
+        writer.flush()
+    return path
+
+
+def quarantine_invalid_rows(
+    data_frame: pd.DataFrame,
+    config: PipelineConfig,
+    writer: ArtefactWriter | None = None,
+) -> pd.DataFrame:
+    """Return the rows of ``data_frame`` that pass validation, quarantining the rest.
+
+    Rejected rows are written under ``config.quarantine_root`` instead of failing
+    the whole batch at UPSERT time.
+    """
+    valid, rejected = validate_frame(data_frame)
+    if not rejected.empty:
+        path = write_quarantine(rejected, config.quarantine_root, writer)
+        logger.warning(
+            "Quarantined %d of %d row(s) failing schema checks to %s (first: %s)",
+            len(rejected),
+            len(data_frame),
+            path,
+            rejected[REASONS_COLUMN].iloc[0],
+        )
+    return valid
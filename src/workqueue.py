@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterable
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.analytics import calculate_metrics, configured_metrics
+from src.config import ALL_DAILY_VARS, DB_BACKENDS, PipelineConfig
+from src.extract import (
+    OPEN_METEO_ARCHIVE_URL,
+    _iter_date_chunks,
+    fetch_daily_archive,
+    make_retry_session,
+)
+from src.load import (
+    ensure_db_and_table,
+    load_rollup_statements,
+    load_sql_file,
+    load_upsert_statement,
+    make_artefact_writer,
+    require_single_location,
+    split_save_and_upsert,
+)
+from src.pipeline import make_request_guard
+from src.utils import jsoncodec
+from src.utils.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("pending", "leased", "done", "failed")
+
+ENQUEUE_SQL = """
+INSERT INTO work_queue (task_id, latitude, longitude, start_date, end_date, updated_at)
+VALUES (:task_id, :latitude, :longitude, :start_date, :end_date, :now)
+ON CONFLICT (task_id) DO NOTHING
+"""
+
+HEARTBEAT_SQL = """
+UPDATE work_queue
+SET lease_expires_at = :expires_at, updated_at = :now
+WHERE task_id = :task_id AND lease_owner = :owner AND status = 'leased'
+RETURNING task_id
+"""
+
+COMPLETE_SQL = """
+UPDATE work_queue
+SET status = 'done', rows_loaded = :rows, lease_expires_at = NULL,
+    last_error = NULL, updated_at = :now
+WHERE task_id = :task_id AND lease_owner = :owner AND status = 'leased'
+RETURNING task_id
+"""
+
+FAIL_SQL = """
+UPDATE work_queue
+SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+    lease_owner = NULL, lease_expires_at = NULL, last_error = :error, updated_at = :now
+WHERE task_id = :task_id AND lease_owner = :owner AND status = 'leased'
+RETURNING status
+"""
+
+REQUEUE_EXPIRED_SQL = """
+UPDATE work_queue
+SET status = CASE WHEN attempts >= :max_attempts THEN 'failed' ELSE 'pending' END,
+    lease_owner = NULL, lease_expires_at = NULL,
+    last_error = 'lease expired (owner ' || lease_owner || ')', updated_at = :now
+WHERE status = 'leased' AND lease_expires_at < :now
+RETURNING task_id
+"""
+
+
+def task_id_for(latitude: float, longitude: float, start: str, end: str) -> str:
+    """Return the stable queue key of one (location, date chunk) task."""
+    return f"{latitude:.4f},{longitude:.4f}:{start}:{end}"
+
+
+def default_worker_id() -> str:
+    """Return a worker name that is unique across hosts and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass(frozen=True)
+class Task:
+    """A leased (location, date chunk) unit of backfill work."""
+
+    task_id: str
+    latitude: float
+    longitude: float
+    start_date: str
+    end_date: str
+    attempts: int
+
+
+class WorkQueue:
+    """Lease-based task queue kept in the ``work_queue`` table of the pipeline DB.
+
+    Claiming a task sets its lease owner and an expiry ``lease_seconds`` ahead;
+    the owner extends it with :meth:`heartbeat` while it works and releases it
+    with :meth:`complete` or :meth:`fail`. Every update after the claim is
+    conditioned on the owner still holding the lease, so a worker whose lease
+    expired (and was requeued by :meth:`requeue_expired`) cannot overwrite the
+    outcome of the worker that took the task over. Lease times come from the
+    workers' clocks, which are assumed to agree to well within a lease.
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        engine,
+        *,
+        clock: Callable[[], float] = time.time,
+    ):
+        from sqlalchemy import text
+
+        self.config = config
+        self.engine = engine
+        self.clock = clock
+        self._claim = text(
+            load_sql_file(config, "claim_work_task.sql", backend=config.db_backend)
+        )
+        self._enqueue = text(ENQUEUE_SQL)
+        self._heartbeat = text(HEARTBEAT_SQL)
+        self._complete = text(COMPLETE_SQL)
+        self._fail = text(FAIL_SQL)
+        self._requeue = text(REQUEUE_EXPIRED_SQL)
+
+    def enqueue(
+        self,
+        locations: Iterable[tuple[float, float]],
+        start_date: str,
+        end_date: str,
+        chunk_days: int | None,
+    ) -> int:
+        """Add one task per location and date chunk; return how many were new.
+
+        Tasks are keyed by location and range, so enqueueing the same backfill
+        again (from any node) leaves existing tasks and their progress alone.
+        ``weather_daily`` and the day artefacts are keyed by date alone, so a
+        queue holds a single location: another one raises ``ValueError``.
+        """
+        from sqlalchemy import text
+
+        latitude, longitude = require_single_location(locations)
+        now = self.clock()
+        params = [
+            {
+                "task_id": task_id_for(latitude, longitude, start, end),
+                "latitude": latitude,
+                "longitude": longitude,
+                "start_date": start,
+                "end_date": end,
+                "now": now,
+            }
+            for start, end in _iter_date_chunks(start_date, end_date, chunk_days)
+        ]
+        count = text("SELECT COUNT(*) FROM work_queue")
+        with self.engine.begin() as conn:
+            queued = conn.execute(
+                text("SELECT DISTINCT latitude, longitude FROM work_queue")
+            ).all()
+            for other_lat, other_lon in queued:
+                if (float(other_lat), float(other_lon)) != (latitude, longitude):
+                    raise ValueError(
+                        f"work_queue already holds {other_lat},{other_lon}; "
+                        "weather_daily is keyed by date alone, so use a separate "
+                        "database per location"
+                    )
+            before = conn.execute(count).scalar()
+            if params:
+                conn.execute(self._enqueue, params)
+            return conn.execute(count).scalar() - before
+
+    def claim(self, owner: str, lease_seconds: float) -> Task | None:
+        """Lease the next pending task to ``owner``, or return ``None`` when idle."""
+        now = self.clock()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                self._claim,
+                {"owner": owner, "expires_at": now + lease_seconds, "now": now},
+            ).first()
+        if row is None:
+            return None
+        return Task(
+            task_id=row[0],
+            latitude=float(row[1]),
+            longitude=float(row[2]),
+            start_date=str(row[3])[:10],
+            end_date=str(row[4])[:10],
+            attempts=int(row[5]),
+        )
+
+    def heartbeat(self, task: Task, owner: str, lease_seconds: float) -> bool:
+        """Extend ``owner``'s lease on ``task``; return False if it was lost."""
+        now = self.clock()
+        return self._update(
+            self._heartbeat,
+            task_id=task.task_id,
+            owner=owner,
+            expires_at=now + lease_seconds,
+            now=now,
+        )
+
+    def complete(self, task: Task, owner: str, rows: int) -> bool:
+        """Mark ``task`` done; return False if ``owner`` no longer held the lease."""
+        return self._update(
+            self._complete,
+            task_id=task.task_id,
+            owner=owner,
+            rows=rows,
+            now=self.clock(),
+        )
+
+    def fail(self, task: Task, owner: str, error: str, max_attempts: int) -> bool:
+        """Release ``task`` for a retry, or fail it once ``max_attempts`` are used."""
+        return self._update(
+            self._fail,
+            task_id=task.task_id,
+            owner=owner,
+            error=error[:1000],
+            max_attempts=max_attempts,
+            now=self.clock(),
+        )
+
+    def requeue_expired(self, max_attempts: int) -> int:
+        """Return leased tasks whose lease ran out to the queue; return the count."""
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                self._requeue, {"max_attempts": max_attempts, "now": self.clock()}
+            ).fetchall()
+        if rows:
+            logger.warning(
+                "Requeued %d task(s) whose lease expired: %s",
+                len(rows),
+                ", ".join(row[0] for row in rows),
+            )
+        return len(rows)
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of tasks in each status."""
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT status, COUNT(*) FROM work_queue GROUP BY status")
+            ).fetchall()
+        found = {status: int(count) for status, count in rows}
+        return {status: found.get(status, 0) for status in STATUSES}
+
+    def _update(self, statement, **params) -> bool:
+        with self.engine.begin() as conn:
+            return conn.execute(statement, params).first() is not None
+
+
+class _Heartbeat:
+    """Background thread that keeps a task's lease alive while it is processed."""
+
+    def __init__(
+        self, queue: WorkQueue, task: Task, owner: str, config: PipelineConfig
+    ):
+        self.queue = queue
+        self.task = task
+        self.owner = owner
+        self.config = config
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"heartbeat-{task.task_id}", daemon=True
+        )
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.config.queue_heartbeat_seconds):
+            try:
+                alive = self.queue.heartbeat(
+                    self.task, self.owner, self.config.queue_lease_seconds
+                )
+            except Exception:
+                # A missed beat is survivable as long as a later one lands in time.
+                logger.exception("Heartbeat for %s failed", self.task.task_id)
+                continue
+            if not alive:
+                logger.warning(
+                    "Lost the lease on %s; another worker will redo it",
+                    self.task.task_id,
+                )
+                self.lost.set()
+                return
+
+
+@dataclass
+class WorkerStats:
+    """Counters for one :class:`QueueWorker` run."""
+
+    worker_id: str
+    tasks: int = 0
+    failed: int = 0
+    lost: int = 0
+    rows: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Worker {self.worker_id}: {self.tasks} task(s) done, {self.failed} "
+            f"failed, {self.lost} lease(s) lost, {self.rows} rows in "
+            f"{self.elapsed_seconds:.2f}s"
+        )
+
+
+class QueueWorker:
+    """Claim backfill tasks from :class:`WorkQueue` and run extract + load for each.
+
+    Like the daemon, the worker keeps its engine, statements, HTTP session and the
+    variables the API rejected warm across tasks. Loads are idempotent UPSERTs,
+    so a task redone after a lost lease only rewrites the same rows.
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        *,
+        worker_id: str | None = None,
+        url: str = OPEN_METEO_ARCHIVE_URL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.config = config
+        self.worker_id = worker_id or default_worker_id()
+        self.url = url
+        self.clock = clock
+        self.queue: WorkQueue | None = None
+        self._engine = None
+        self._session = None
+        self._guard = None
+        self._upsert_stmt = None
+        self._rollup_stmts = None
+        self._unsupported: set[str] = set()
+        self._stop = threading.Event()
+
+    def __enter__(self) -> "QueueWorker":
+        self.warm_up()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def warm_up(self) -> None:
+        """Create the engine, statements and HTTP session shared by every task."""
+        if self._engine is not None:
+            return
+        jsoncodec.set_backend(self.config.json_backend)
+        self._engine = ensure_db_and_table(self.config)
+        self.queue = WorkQueue(self.config, self._engine, clock=self.clock)
+        self._upsert_stmt = load_upsert_statement(self.config)
+        self._rollup_stmts = load_rollup_statements(self.config)
+        self._session = make_retry_session()
+        self._guard = make_request_guard(self.config)
+
+    def close(self) -> None:
+        """Release the HTTP session and database pool."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._guard is not None:
+            logger.info("Archive requests: %s", self._guard.counters.summary())
+            self._guard.close()
+            self._guard = None
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def request_stop(self) -> None:
+        """Ask :meth:`run` to exit once the current task has finished."""
+        self._stop.set()
+
+    def run(self, max_tasks: int | None = None) -> WorkerStats:
+        """Process tasks until the queue is drained (or ``max_tasks`` were taken).
+
+        While other workers still hold leases the worker keeps polling every
+        heartbeat interval, so it can pick up their tasks if those leases expire.
+        """
+        self.warm_up()
+        stats = WorkerStats(worker_id=self.worker_id)
+        started = time.perf_counter()
+        taken = 0
+        while not self._stop.is_set():
+            if max_tasks is not None and taken >= max_tasks:
+                break
+            self.queue.requeue_expired(self.config.queue_max_attempts)
+            task = self.queue.claim(self.worker_id, self.config.queue_lease_seconds)
+            if task is None:
+                counts = self.queue.counts()
+                if counts["pending"] == counts["leased"] == 0:
+                    break
+                if counts["pending"] == 0:
+                    self._stop.wait(self.config.queue_heartbeat_seconds)
+                continue
+            taken += 1
+            self._process(task, stats)
+        stats.elapsed_seconds = time.perf_counter() - started
+        logger.info("%s", stats.summary())
+        return stats
+
+    def _process(self, task: Task, stats: WorkerStats) -> None:
+        logger.info(
+            "Worker %s leased %s (attempt %d)",
+            self.worker_id,
+            task.task_id,
+            task.attempts,
+        )
+        with _Heartbeat(self.queue, task, self.worker_id, self.config) as heartbeat:
+            try:
+                rows = self._extract_and_load(task)
+            except Exception as exc:
+                logger.exception("Task %s failed", task.task_id)
+                stats.failed += 1
+                self.queue.fail(
+                    task,
+                    self.worker_id,
+                    f"{type(exc).__name__}: {exc}",
+                    self.config.queue_max_attempts,
+                )
+                return
+        if heartbeat.lost.is_set() or not self.queue.complete(
+            task, self.worker_id, rows
+        ):
+            stats.lost += 1
+            return
+        stats.tasks += 1
+        stats.rows += rows
+
+    def _extract_and_load(self, task: Task) -> int:
+        _, batches = fetch_daily_archive(
+            latitude=task.latitude,
+            longitude=task.longitude,
+            start_date=task.start_date,
+            end_date=task.end_date,
+            timezone=self.config.timezone,
+            daily_vars=ALL_DAILY_VARS,
+            batch_days=None,
+            url=self.url,
+            session=self._session,
+            skip_daily=self._unsupported,
+            stream_window_days=self.config.fetch_stream_days,
+            guard=self._guard,
+        )
+        rows = 0
+        with make_artefact_writer(self.config) as writer:
+            for batch in batches:
+                self._unsupported.update(batch.get("_dropped_daily", []))
+                rows += split_save_and_upsert(
+                    batch,
+                    self.config,
+                    engine=self._engine,
+                    upsert_stmt=self._upsert_stmt,
+                    writer=writer,
+                    rollup_stmts=self._rollup_stmts,
+                )
+        return rows
+
+
+def run_worker(
+    config: PipelineConfig,
+    url: str = OPEN_METEO_ARCHIVE_URL,
+    worker_id: str | None = None,
+) -> WorkerStats:
+    """Run one worker to completion (the target of each ``work`` process)."""
+    setup_logging()
+    with QueueWorker(config, worker_id=worker_id, url=url) as worker:
+        return worker.run()
+
+
+def run_workers(config: PipelineConfig, processes: int, url: str) -> dict[str, int]:
+    """Run ``processes`` local worker processes against the queue; return counts."""
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker, args=(config, url), name=f"worker-{index}")
+        for index in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    engine = ensure_db_and_table(config)
+    try:
+        return WorkQueue(config, engine).counts()
+    finally:
+        engine.dispose()
+
+
+def parse_location(value: str) -> tuple[float, float]:
+    """Parse a ``LAT,LON`` command-line location."""
+    try:
+        latitude, longitude = (float(part) for part in value.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected LAT,LON, got {value!r}") from exc
+    return latitude, longitude
+
+
+def main(argv: list[str] | None = None) -> None:
+    """CLI entry point for enqueueing and working a shared backfill."""
+    parser = argparse.ArgumentParser(
+        description="Share a backfill between workers through a lease-based DB queue"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=DB_BACKENDS,
+        help="Override backend (defaults to env-configured backend)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser(
+        "enqueue", help="Add (location, date chunk) tasks for a backfill"
+    )
+    enqueue.add_argument(
+        "--location",
+        type=parse_location,
+        help="LAT,LON to backfill; one per database "
+        "(defaults to PIPELINE_LATITUDE/PIPELINE_LONGITUDE)",
+    )
+    enqueue.add_argument("--start", help="First day (defaults to PIPELINE_START_DATE)")
+    enqueue.add_argument("--end", help="Last day (defaults to PIPELINE_END_DATE)")
+
+    work = commands.add_parser("work", help="Process tasks until the queue drains")
+    work.add_argument(
+        "--processes", type=int, default=1, help="Local worker processes (default 1)"
+    )
+    work.add_argument(
+        "--no-analytics",
+        action="store_true",
+        help="Skip the metric reports once the queue has drained",
+    )
+
+    commands.add_parser("status", help="Print the number of tasks in each status")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    config = PipelineConfig.from_env()
+    if args.backend and args.backend != config.db_backend:
+        config = replace(config, db_backend=args.backend)
+
+    if args.command == "work":
+        if config.db_backend == "duckdb" and args.processes > 1:
+            parser.error("DuckDB allows a single writing process; use --processes 1")
+        if args.processes > 1:
+            counts = run_workers(config, args.processes, OPEN_METEO_ARCHIVE_URL)
+        else:
+            run_worker(config)
+            engine = ensure_db_and_table(config)
+            counts = WorkQueue(config, engine).counts()
+            engine.dispose()
+        logger.info("Queue: %s", counts)
+        if not args.no_analytics and counts["pending"] == counts["leased"] == 0:
+            calculate_metrics(config, configured_metrics(config))
+        return
+
+    engine = ensure_db_and_table(config)
+    try:
+        queue = WorkQueue(config, engine)
+        if args.command == "enqueue":
+            location = args.location or (config.latitude, config.longitude)
+            try:
+                added = queue.enqueue(
+                    [location],
+                    args.start or config.start_date,
+                    args.end or config.end_date,
+                    config.fetch_batch_days,
+                )
+            except ValueError as exc:
+                parser.error(str(exc))
+            logger.info("Enqueued %d new task(s)", added)
+        print(jsoncodec.dumps(queue.counts()).decode())
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
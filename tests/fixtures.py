@@ -0,0 +1,46 @@
+"""Shared sample payloads and configurations for the test modules."""
+
+import os
+from dataclasses import replace
+from pathlib import Path
+
+from src.config import PipelineConfig
+
+
+def sample_batch(days: list[str]) -> dict:
+    """Return an archive-shaped payload covering ``days``."""
+    return {
+        "latitude": 50.45,
+        "longitude": 30.52,
+        "timezone": "Europe/Kyiv",
+        "daily": {
+            "time": days,
+            "temperature_2m_max": [25.0 + index for index in range(len(days))],
+            "temperature_2m_min": [12.0 for _ in days],
+            "precipitation_sum": [0.5 for _ in days],
+            "sunshine_duration": [36000.0 for _ in days],
+        },
+        "_requested_daily": ["temperature_2m_max"],
+        "_accepted_daily": ["temperature_2m_max"],
+        "_dropped_daily": [],
+    }
+
+
+def temp_config(tmp: Path) -> PipelineConfig:
+    """Return a SQLite configuration rooted in the temporary directory ``tmp``."""
+    return replace(
+        PipelineConfig.from_env(),
+        db_backend="sqlite",
+        db_path=tmp / "weather.db",
+        raw_root=tmp / "raw",
+        proc_root=tmp / "processed",
+        reports_root=tmp / "reports",
+        quarantine_root=tmp / "quarantine",
+        data_version_path=tmp / "version",
+    )
+
+
+def data_version(config: PipelineConfig) -> tuple[int, int]:
+    """Return the data-version marker's identity as the serve cache sees it."""
+    stat = os.stat(config.data_version_path)
+    return stat.st_ino, stat.st_mtime_ns
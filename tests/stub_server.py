@@ -0,0 +1,97 @@
+"""Local HTTP stub of the Open-Meteo archive endpoint used by extract tests."""
+
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def archive_payload(params: dict) -> dict:
+    """Build a deterministic archive payload for the requested days and variables.
+
+    Values depend on the day alone, so re-fetching a day returns the same row.
+    """
+    start = date.fromisoformat(params["start_date"])
+    end = date.fromisoformat(params["end_date"])
+    days = [
+        (start + timedelta(days=offset)).isoformat()
+        for offset in range((end - start).days + 1)
+    ]
+    daily = {"time": days}
+    for variable in filter(None, params.get("daily", "").split(",")):
+        daily[variable] = [float(date.fromisoformat(day).day) for day in days]
+    return {
+        "latitude": float(params["latitude"]),
+        "longitude": float(params["longitude"]),
+        "timezone": params.get("timezone"),
+        "daily": daily,
+    }
+
+
+class ArchiveStubServer:
+    """Threaded HTTP server whose responses are produced by ``responder(params)``.
+
+    ``responder`` returns ``(status, headers, body)``; the default serves
+    :func:`archive_payload`. The server records every request's query parameters and
+    the peak number of requests in flight.
+    """
+
+    def __init__(self, responder=None, *, delay: float = 0.0):
+        self.responder = responder or (
+            lambda params: (200, {}, archive_payload(params))
+        )
+        self.delay = delay
+        self.requests: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802 - http.server naming
+                params = {
+                    key: values[-1]
+                    for key, values in parse_qs(urlparse(self.path).query).items()
+                }
+                with stub._lock:
+                    stub.requests.append(params)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    status, headers, body = stub.responder(params)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+                encoded = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/archive"
+
+    def __enter__(self) -> "ArchiveStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -5,8 +5,12 @@ import unittest
 from dataclasses import replace
 from pathlib import Path
 
+from fixtures import data_version, sample_batch, temp_config
+from sqlalchemy import text
+
 from src.analytics import calculate_metrics
 from src.config import METRIC_SQL_FILES, PipelineConfig
+from src.load import ensure_db_and_table, split_save_and_upsert, write_daily_rows
 
 
 class AnalyticsTests(unittest.TestCase):
@@ -21,7 +25,10 @@ class AnalyticsTests(unittest.TestCase):
 
             # Create simple SQL query file for testing
             query_name = "test_metric.sql"
-            (sql_dir / query_name).write_text("SELECT 42 AS answer", encoding="utf-8")
+            (sql_dir / query_name).write_text(
+                "SELECT 42 AS answer, 1.5 AS ratio UNION ALL SELECT 7, NULL",
+                encoding="utf-8",
+            )
 
             # Prepare empty SQLite database
             sqlite3.connect(db_path).close()
@@ -34,6 +41,7 @@ class AnalyticsTests(unittest.TestCase):
                 pg_root=tmp,
                 db_path=db_path,
                 reports_root=reports_root,
+                data_version_path=tmp / "version",
                 sql_dir=sql_dir,
                 sqlite_sql_dir=sql_dir,
             )
@@ -46,8 +54,83 @@ class AnalyticsTests(unittest.TestCase):
 
             manifest = json.loads((report_dir / "metadata.json").read_text("utf-8"))
             self.assertEqual(manifest["metrics"][0]["name"], "test_metric")
-            self.assertTrue((report_dir / "test_metric.json").exists())
             self.assertTrue((report_dir / "test_metric.csv").exists())
+            # Compact, strictly valid JSON: missing floats are null, never NaN.
+            raw = (report_dir / "test_metric.json").read_text("utf-8")
+            self.assertNotIn("\n", raw)
+            self.assertEqual(
+                json.loads(raw),
+                [{"answer": 42, "ratio": 1.5}, {"answer": 7, "ratio": None}],
+            )
+
+    def test_calculate_metrics_reuses_results_until_table_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            sql_dir = tmp / "sql"
+            sql_dir.mkdir()
+            query_name = "temp_metric.sql"
+            (sql_dir / query_name).write_text(
+                "SELECT COUNT(*) AS days, MAX(temp_max_c) AS hottest FROM weather_daily",
+                encoding="utf-8",
+            )
+            load_config = temp_config(tmp)
+            test_config = replace(load_config, sqlite_sql_dir=sql_dir)
+            engine = ensure_db_and_table(load_config)
+            batch = sample_batch(["2025-08-01", "2025-08-02"])
+            split_save_and_upsert(batch, load_config, engine=engine)
+
+            first_dir = calculate_metrics(test_config, [query_name], engine=engine)
+            version = data_version(load_config)
+            # Re-loading identical rows rewrites ingested_at but not the content,
+            # so the latest report is kept and nothing is invalidated.
+            split_save_and_upsert(batch, load_config, engine=engine)
+            second_dir = calculate_metrics(test_config, [query_name], engine=engine)
+            self.assertEqual(second_dir, first_dir)
+            self.assertEqual(data_version(load_config), version)
+
+            pretty_config = replace(test_config, json_pretty=True)
+            pretty_dir = calculate_metrics(pretty_config, [query_name], engine=engine)
+            manifest = json.loads((pretty_dir / "metadata.json").read_text("utf-8"))
+            self.assertFalse(manifest["metrics"][0]["cached"])
+            self.assertIn("\n", (pretty_dir / "temp_metric.json").read_text("utf-8"))
+
+            # A new metric is computed; the unchanged one is linked from before.
+            (sql_dir / "count_metric.sql").write_text(
+                "SELECT COUNT(*) AS days FROM weather_daily", encoding="utf-8"
+            )
+            mixed_dir = calculate_metrics(
+                pretty_config, [query_name, "count_metric.sql"], engine=engine
+            )
+            manifest = json.loads((mixed_dir / "metadata.json").read_text("utf-8"))
+            self.assertEqual(
+                [entry["cached"] for entry in manifest["metrics"]], [True, False]
+            )
+            pretty_rows = json.loads((pretty_dir / "temp_metric.json").read_bytes())
+            self.assertEqual(
+                json.loads((mixed_dir / "temp_metric.json").read_bytes()), pretty_rows
+            )
+
+            # Same row count, and an older ingested_at than the first load: only
+            # the content changed.
+            with engine.begin() as conn:
+                write_daily_rows(
+                    conn,
+                    ["2025-08-02"],
+                    lambda conn: conn.execute(
+                        text(
+                            "UPDATE weather_daily SET temp_max_c = 40.0, "
+                            "ingested_at = '2000-01-01T00:00:00Z' "
+                            "WHERE date = '2025-08-02'"
+                        )
+                    ),
+                )
+
+            third_dir = calculate_metrics(test_config, [query_name], engine=engine)
+            engine.dispose()
+            manifest = json.loads((third_dir / "metadata.json").read_text("utf-8"))
+            self.assertFalse(manifest["metrics"][0]["cached"])
+            rows = json.loads((third_dir / "temp_metric.json").read_text("utf-8"))
+            self.assertEqual(rows, [{"days": 2, "hottest": 40.0}])
 
 
 if __name__ == "__main__":
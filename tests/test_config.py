@@ -10,6 +10,21 @@ class PipelineConfigTests(unittest.TestCase):
         "PIPELINE_FETCH_BATCH_DAYS",
         "PIPELINE_DB_BACKEND",
         "PIPELINE_DB_URL",
+        "PIPELINE_EXTRACT_ENGINE",
+        "PIPELINE_FETCH_CONCURRENCY",
+        "PIPELINE_FETCH_RATE",
+        "PIPELINE_PROFILE",
+        "PIPELINE_FETCH_ADAPTIVE",
+        "PIPELINE_FETCH_TARGET_SECONDS",
+        "PIPELINE_FETCH_MIN_DAYS",
+        "PIPELINE_FETCH_MAX_DAYS",
+        "PIPELINE_JSON_BACKEND",
+        "PIPELINE_JSON_PRETTY",
+        "PIPELINE_FETCH_HEDGE_PERCENTILE",
+        "PIPELINE_FETCH_TIMEOUT_MULTIPLIER",
+        "PIPELINE_FETCH_MIN_TIMEOUT",
+        "PIPELINE_FETCH_MAX_TIMEOUT",
+        "PIPELINE_FETCH_BREAKER_ERROR_RATE",
     }
 
     def setUp(self):
@@ -45,6 +60,99 @@ class PipelineConfigTests(unittest.TestCase):
         self.assertEqual(config.db_backend, "postgres")
         self.assertEqual(config.db_url, "postgresql://example")
 
+    def test_duckdb_backend_paths(self):
+        os.environ["PIPELINE_DB_BACKEND"] = "duckdb"
+        config = PipelineConfig.from_env()
+        self.assertEqual(config.db_backend, "duckdb")
+        self.assertEqual(
+            config.duckdb_path, config.db_root / "duckdb" / "weather.duckdb"
+        )
+        self.assertEqual(config.schema_duckdb, config.duckdb_sql_dir / "init.sql")
+
+        os.environ["PIPELINE_DB_BACKEND"] = "mysql"
+        with self.assertRaises(ValueError):
+            PipelineConfig.from_env()
+
+    def test_async_extract_settings(self):
+        config = PipelineConfig.from_env()
+        self.assertEqual(config.extract_engine, "sync")
+        self.assertIsNone(config.fetch_rate_per_second)
+
+        os.environ["PIPELINE_EXTRACT_ENGINE"] = "ASYNC"
+        os.environ["PIPELINE_FETCH_CONCURRENCY"] = "16"
+        os.environ["PIPELINE_FETCH_RATE"] = "2.5"
+        config = PipelineConfig.from_env()
+        self.assertEqual(config.extract_engine, "async")
+        self.assertEqual(config.fetch_concurrency, 16)
+        self.assertEqual(config.fetch_rate_per_second, 2.5)
+
+        os.environ["PIPELINE_EXTRACT_ENGINE"] = "threads"
+        with self.assertRaises(ValueError):
+            PipelineConfig.from_env()
+
+    def test_adaptive_fetch_settings(self):
+        config = PipelineConfig.from_env()
+        self.assertFalse(config.fetch_adaptive)
+        self.assertEqual((config.fetch_min_days, config.fetch_max_days), (1, 366))
+
+        os.environ["PIPELINE_FETCH_ADAPTIVE"] = "yes"
+        os.environ["PIPELINE_FETCH_TARGET_SECONDS"] = "2"
+        os.environ["PIPELINE_FETCH_MIN_DAYS"] = "7"
+        os.environ["PIPELINE_FETCH_MAX_DAYS"] = "3"
+        config = PipelineConfig.from_env()
+        self.assertTrue(config.fetch_adaptive)
+        self.assertEqual(config.fetch_target_seconds, 2.0)
+        self.assertEqual((config.fetch_min_days, config.fetch_max_days), (7, 7))
+
+        os.environ["PIPELINE_FETCH_ADAPTIVE"] = "maybe"
+        with self.assertRaises(ValueError):
+            PipelineConfig.from_env()
+
+    def test_tail_latency_settings(self):
+        from src.pipeline import make_request_guard
+
+        # Every control is opt-in.
+        config = PipelineConfig.from_env()
+        self.assertIsNone(config.fetch_hedge_percentile)
+        self.assertIsNone(config.fetch_timeout_multiplier)
+        self.assertIsNone(config.fetch_breaker_error_rate)
+        self.assertEqual((config.fetch_min_timeout, config.fetch_max_timeout), (5, 60))
+        self.assertIsNone(make_request_guard(config))
+
+        os.environ["PIPELINE_FETCH_HEDGE_PERCENTILE"] = "95"
+        os.environ["PIPELINE_FETCH_MIN_TIMEOUT"] = "90"
+        config = PipelineConfig.from_env()
+        self.assertEqual(config.fetch_min_timeout, 60.0)
+        guard = make_request_guard(config)
+        self.assertEqual(guard.hedge_percentile, 95.0)
+        self.assertIsNone(guard.timeout_multiplier)
+        self.assertIsNone(guard.breaker)
+
+        os.environ["PIPELINE_FETCH_BREAKER_ERROR_RATE"] = "0.5"
+        guard = make_request_guard(PipelineConfig.from_env())
+        self.assertEqual(guard.breaker.error_rate, 0.5)
+
+    def test_json_codec_settings(self):
+        config = PipelineConfig.from_env()
+        self.assertEqual((config.json_backend, config.json_pretty), ("auto", False))
+
+        os.environ["PIPELINE_JSON_BACKEND"] = "JSON"
+        os.environ["PIPELINE_JSON_PRETTY"] = "1"
+        config = PipelineConfig.from_env()
+        self.assertEqual((config.json_backend, config.json_pretty), ("json", True))
+
+        os.environ["PIPELINE_JSON_BACKEND"] = "ujson"
+        with self.assertRaises(ValueError):
+            PipelineConfig.from_env()
+
+    def test_profile_modes_and_output_root(self):
+        config = PipelineConfig.from_env()
+        self.assertEqual(config.profile_modes, frozenset())
+        self.assertEqual(config.profiles_root, config.data_root / "profiles")
+
+        os.environ["PIPELINE_PROFILE"] = "cpu,memory"
+        self.assertEqual(PipelineConfig.from_env().profile_modes, {"cpu", "memory"})
+
     def test_metric_sql_files_defined(self):
         self.assertGreater(len(METRIC_SQL_FILES), 0)
         for name in METRIC_SQL_FILES:
@@ -0,0 +1,145 @@
+import json
+import random
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+from fixtures import data_version, temp_config
+from stub_server import ArchiveStubServer, archive_payload
+
+from src.daemon import PipelineDaemon
+
+
+def reject_uv_index(params: dict):
+    """Serve archive payloads but reject ``uv_index_max`` like an unknown variable."""
+    if "uv_index_max" in params.get("daily", "").split(","):
+        reason = "Unknown daily variable: uv_index_max"
+        return 400, {}, {"error": True, "reason": reason}
+    return 200, {}, archive_payload(params)
+
+
+class PipelineDaemonTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = replace(
+            temp_config(self.tmp),
+            start_date="2025-08-01",
+            end_date="2025-08-10",
+            fetch_batch_days=5,
+            fetch_adaptive=False,
+            daemon_interval_seconds=60.0,
+            daemon_jitter_seconds=0.0,
+            daemon_lookback_days=3,
+            daemon_stats_path=self.tmp / "daemon" / "cycles.jsonl",
+            fetch_hedge_percentile=95.0,
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_cycles_fetch_incrementally_and_reuse_negotiated_variables(self):
+        today = [date(2025, 8, 8)]
+        with (
+            ArchiveStubServer(reject_uv_index) as server,
+            PipelineDaemon(
+                self.config, url=server.url, today=lambda: today[0]
+            ) as daemon,
+        ):
+            first = daemon.run_cycle()
+            reports = sorted((self.tmp / "reports").iterdir())
+            version = data_version(self.config)
+            second = daemon.run_cycle()
+            requests = list(server.requests)
+            today[0] = date(2025, 7, 31)  # nothing left to fetch
+            idle = daemon.run_cycle()
+
+        self.assertIsNone(first.error)
+        self.assertEqual(
+            (first.window_start, first.window_end), ("2025-08-01", "2025-08-08")
+        )
+        self.assertEqual((first.batches, first.rows), (2, 8))
+        self.assertGreater(first.analytics_seconds, 0)
+
+        self.assertEqual(
+            (second.window_start, second.window_end), ("2025-08-05", "2025-08-08")
+        )
+        self.assertEqual(second.rows, 4)
+        self.assertGreater(second.analytics_seconds, 0)
+
+        # Only the very first request carried the rejected variable.
+        carrying = [r for r in requests if "uv_index_max" in r["daily"].split(",")]
+        self.assertEqual(len(carrying), 1)
+        self.assertEqual(requests[-1]["start_date"], "2025-08-05")
+
+        # The re-fetched days and the idle cycle changed no row: the first report
+        # is kept and the serve cache is not invalidated.
+        self.assertIsNone(idle.window_start)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(sorted((self.tmp / "reports").iterdir()), reports)
+        self.assertEqual(data_version(self.config), version)
+
+        lines = self.config.daemon_stats_path.read_text().splitlines()
+        self.assertEqual([json.loads(line)["cycle"] for line in lines], [1, 2, 3])
+        # Request counters are recorded per cycle, not cumulated.
+        sent = [json.loads(line)["requests"]["sent"] for line in lines[:2]]
+        self.assertEqual(sum(sent), len(requests))
+        self.assertEqual(sent[1], second.requests["requests"])
+
+    def test_failed_cycle_is_recorded_and_the_daemon_keeps_running(self):
+        def fail_once(params, calls=[]):
+            calls.append(params)
+            if len(calls) == 1:
+                return 400, {}, {"error": True, "reason": "Parameter out of range"}
+            return 200, {}, archive_payload(params)
+
+        with (
+            ArchiveStubServer(fail_once) as server,
+            PipelineDaemon(
+                self.config, url=server.url, today=lambda: date(2025, 8, 3)
+            ) as daemon,
+        ):
+            failed = daemon.run_cycle()
+            recovered = daemon.run_cycle()
+
+        self.assertIn("Parameter out of range", failed.error)
+        self.assertIsNone(recovered.error)
+        self.assertEqual(recovered.rows, 3)
+
+    def test_next_delay_keeps_a_fixed_rate_within_the_jitter(self):
+        config = replace(
+            self.config, daemon_interval_seconds=10.0, daemon_jitter_seconds=2.0
+        )
+        daemon = PipelineDaemon(config, rng=random.Random(3))
+        started = time.monotonic() - 4.0
+        delays = [daemon.next_delay(started) for _ in range(50)]
+        self.assertTrue(all(3.9 <= delay <= 8.0 for delay in delays))
+        self.assertGreater(max(delays) - min(delays), 1.0)
+        self.assertEqual(daemon.next_delay(time.monotonic() - 30.0), 0.0)
+
+    def test_stop_request_interrupts_the_wait_between_cycles(self):
+        with ArchiveStubServer() as server:
+            daemon = PipelineDaemon(
+                self.config, url=server.url, today=lambda: date(2025, 8, 2)
+            )
+            thread = threading.Thread(target=daemon.serve)
+            thread.start()
+            deadline = time.monotonic() + 10
+            while not daemon.history and time.monotonic() < deadline:
+                time.sleep(0.01)
+            daemon._handle_signal(signal.SIGTERM, None)
+            thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(daemon.history), 1)
+        with self.assertRaises(KeyboardInterrupt):
+            daemon._handle_signal(signal.SIGTERM, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+import pandas as pd
+from fixtures import sample_batch, temp_config
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from src.analytics import calculate_metrics, calculate_parquet_metrics
+from src.config import METRIC_SQL_FILES
+from src.load import (
+    ensure_db_and_table,
+    load_upsert_statement,
+    read_table_version,
+    split_save_and_upsert,
+    upsert_frame,
+)
+from src.metrics import METRIC_CATALOGUE
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb_engine") is not None
+
+DAYS = [f"2025-01-{day:02d}" for day in range(25, 32)] + ["2025-02-01", "2025-02-02"]
+
+
+def hot_batch() -> dict:
+    batch = sample_batch(DAYS)
+    batch["daily"]["temperature_2m_max"] = [
+        31.0,
+        32.0,
+        33.0,
+        20.0,
+        30.5,
+        31.5,
+        30.0,
+        35.0,
+        29.0,
+    ]
+    batch["daily"]["sunrise"] = [None] * 4 + ["2025-01-29T07:40"] + [None] * 4
+    return batch
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb-engine is not installed")
+class DuckDBBackendTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = replace(
+            temp_config(self.tmp),
+            db_backend="duckdb",
+            duckdb_path=self.tmp / "weather.duckdb",
+        )
+        self.engine = ensure_db_and_table(self.config)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def test_upsert_inserts_then_updates_and_refreshes_rollups(self):
+        inserted = split_save_and_upsert(hot_batch(), self.config, engine=self.engine)
+        self.assertEqual(inserted, 9)
+        with self.engine.connect() as conn:
+            loaded = read_table_version(conn)
+        split_save_and_upsert(hot_batch(), self.config, engine=self.engine)
+        with self.engine.connect() as conn:
+            self.assertEqual(read_table_version(conn), loaded)
+        batch = hot_batch()
+        batch["daily"]["temperature_2m_max"][0] = 10.0
+        split_save_and_upsert(batch, self.config, engine=self.engine)
+
+        with self.engine.connect() as conn:
+            self.assertNotEqual(read_table_version(conn), loaded)
+            count, first, sunrise = conn.execute(
+                text(
+                    "SELECT COUNT(*), "
+                    "MIN(temp_max_c) FILTER (WHERE date = DATE '2025-01-25'), "
+                    "MAX(sunrise) FROM weather_daily"
+                )
+            ).one()
+            monthly = conn.execute(
+                text("SELECT month, days, hot_days FROM weather_monthly ORDER BY month")
+            ).all()
+        self.assertEqual((count, first), (9, 10.0))
+        self.assertEqual(sunrise.isoformat(), "2025-01-29T07:40:00")
+        self.assertEqual(
+            [(month.isoformat(), days, hot) for month, days, hot in monthly],
+            [("2025-01-01", 7, 5), ("2025-02-01", 2, 1)],
+        )
+
+    def test_check_constraints_reject_out_of_range_rows(self):
+        frame = pd.DataFrame([{"date": "2025-03-01", "precip_hours": 25.0}])
+        with self.assertRaisesRegex(DBAPIError, "(?i)check constraint"):
+            upsert_frame(self.engine, load_upsert_statement(self.config), frame)
+
+    def test_metrics_match_sqlite_and_direct_parquet_queries(self):
+        split_save_and_upsert(hot_batch(), self.config, engine=self.engine)
+        sqlite_config = replace(self.config, db_backend="sqlite")
+        ensure_db_and_table(sqlite_config)
+        split_save_and_upsert(hot_batch(), sqlite_config)
+
+        reports = {
+            "duckdb": calculate_metrics(
+                replace(self.config, reports_root=self.tmp / "duckdb"),
+                METRIC_SQL_FILES,
+                engine=self.engine,
+            ),
+            "duckdb_scan": calculate_metrics(
+                replace(self.config, reports_root=self.tmp / "duckdb_scan"),
+                METRIC_CATALOGUE,
+                engine=self.engine,
+            ),
+            "sqlite": calculate_metrics(
+                replace(sqlite_config, reports_root=self.tmp / "sqlite"),
+                METRIC_SQL_FILES,
+            ),
+            "parquet": calculate_parquet_metrics(
+                replace(self.config, reports_root=self.tmp / "parquet"),
+                METRIC_SQL_FILES,
+            ),
+        }
+        for filename in METRIC_SQL_FILES:
+            name = Path(filename).stem
+            results = {
+                source: json.loads((report / f"{name}.json").read_text("utf-8"))
+                for source, report in reports.items()
+            }
+            with self.subTest(metric=name):
+                self.assertTrue(results["sqlite"])
+                self.assertEqual(results["duckdb"], results["sqlite"])
+                self.assertEqual(results["parquet"], results["sqlite"])
+                self.assertEqual(results["duckdb_scan"], results["duckdb"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,18 @@
+import itertools
+import time
 import unittest
+from datetime import date
 
-from src.extract import _iter_date_chunks, parse_unknown_daily_vars
+from stub_server import ArchiveStubServer, archive_payload
+
+from src.extract import (
+    AdaptiveChunker,
+    _iter_date_chunks,
+    fetch_daily_archive,
+    http_get_with_retries,
+    parse_unknown_daily_vars,
+)
+from src.utils.resilience import CircuitBreaker, CircuitOpenError, RequestGuard
 
 
 class ExtractHelpersTests(unittest.TestCase):
@@ -26,5 +38,268 @@ class ExtractHelpersTests(unittest.TestCase):
         self.assertEqual(result, {"foo_bar", "temp_max"})
 
 
+class AdaptiveChunkerTests(unittest.TestCase):
+    def test_span_grows_towards_target_latency_within_limit(self):
+        chunker = AdaptiveChunker(4, max_days=30, target_seconds=2.0)
+        chunks = chunker.iter_chunks("2025-01-01", "2025-03-31")
+        self.assertEqual(next(chunks), ("2025-01-01", "2025-01-04"))
+        chunker.record_success(4, elapsed=0.4, payload_bytes=400)
+        # 0.1 s/day suggests 20 days, but growth is capped at 2x per step.
+        self.assertEqual(next(chunks), ("2025-01-05", "2025-01-12"))
+        chunker.record_success(8, elapsed=0.8, payload_bytes=800)
+        self.assertEqual(next(chunks), ("2025-01-13", "2025-01-28"))
+        chunker.record_success(16, elapsed=1.6, payload_bytes=1600)
+        self.assertEqual(chunker.span_days, 20)
+
+    def test_span_shrinks_for_slow_or_large_responses(self):
+        chunker = AdaptiveChunker(30, target_seconds=5.0, target_bytes=1000)
+        chunker.record_success(30, elapsed=30.0, payload_bytes=100)
+        self.assertEqual(chunker.span_days, 5)
+
+        chunker = AdaptiveChunker(30, target_seconds=5.0, target_bytes=1000)
+        chunker.record_success(30, elapsed=0.1, payload_bytes=15000)
+        self.assertEqual(chunker.span_days, 2)
+
+    def test_failure_halves_span_and_retries_same_start(self):
+        chunker = AdaptiveChunker(8, min_days=2)
+        chunks = chunker.iter_chunks("2025-01-01", "2025-01-31")
+        self.assertEqual(next(chunks), ("2025-01-01", "2025-01-08"))
+        self.assertTrue(chunker.record_failure())
+        self.assertEqual(next(chunks), ("2025-01-01", "2025-01-04"))
+        self.assertTrue(chunker.record_failure())
+        self.assertEqual(next(chunks), ("2025-01-01", "2025-01-02"))
+        self.assertFalse(chunker.record_failure())
+
+    def test_rejects_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            AdaptiveChunker(10, min_days=5, max_days=4)
+
+
+class AdaptiveFetchTests(unittest.TestCase):
+    @staticmethod
+    def _span(params):
+        start = date.fromisoformat(params["start_date"])
+        return (date.fromisoformat(params["end_date"]) - start).days + 1
+
+    def test_failing_chunks_are_split_until_they_succeed(self):
+        def responder(params):
+            if self._span(params) > 4:
+                return 500, {}, {"error": True, "reason": "too large"}
+            return 200, {}, archive_payload(params)
+
+        with ArchiveStubServer(responder) as server:
+            _, batches = fetch_daily_archive(
+                50.0,
+                30.0,
+                "2025-01-01",
+                "2025-01-20",
+                "UTC",
+                ["temperature_2m_max"],
+                batch_days=None,
+                adaptive=AdaptiveChunker(16, max_days=16, max_growth=1.0),
+                max_attempts=1,
+                url=server.url,
+            )
+            days = [day for batch in batches for day in batch["daily"]["time"]]
+            spans = [self._span(params) for params in server.requests]
+
+        self.assertEqual(len(days), 20)
+        self.assertEqual(days, sorted(set(days)))
+        self.assertEqual(spans[:3], [16, 8, 4])
+        self.assertTrue(all(span <= 4 for span in spans[3:]))
+
+    def test_failure_at_minimum_span_is_raised(self):
+        with ArchiveStubServer(lambda params: (503, {}, {"error": True})) as server:
+            with self.assertRaises(RuntimeError):
+                _, batches = fetch_daily_archive(
+                    50.0,
+                    30.0,
+                    "2025-01-01",
+                    "2025-01-10",
+                    "UTC",
+                    ["temperature_2m_max"],
+                    batch_days=None,
+                    adaptive=AdaptiveChunker(4, min_days=1),
+                    max_attempts=1,
+                    url=server.url,
+                )
+                list(batches)
+            self.assertEqual(len(server.requests), 3)
+
+
+class StreamingFetchTests(unittest.TestCase):
+    def test_streamed_response_is_yielded_in_day_windows(self):
+        variables = ["temperature_2m_max", "precipitation_sum"]
+        with ArchiveStubServer() as server:
+            _, batches = fetch_daily_archive(
+                50.0,
+                30.0,
+                "2025-01-01",
+                "2025-01-25",
+                "UTC",
+                variables,
+                batch_days=None,
+                url=server.url,
+                stream_window_days=10,
+            )
+            windows = list(batches)
+
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual([len(w["daily"]["time"]) for w in windows], [10, 10, 5])
+        expected = archive_payload(server.requests[0])
+        for name in ["time", *variables]:
+            self.assertEqual(
+                [value for window in windows for value in window["daily"][name]],
+                expected["daily"][name],
+            )
+        self.assertEqual(windows[1]["latitude"], 50.0)
+        self.assertEqual(windows[1]["_accepted_daily"], variables)
+
+
+class RequestGuardTests(unittest.TestCase):
+    def test_timeout_and_hedge_delay_follow_observed_latency(self):
+        guard = RequestGuard(min_timeout=0.5, max_timeout=60.0, min_samples=5)
+        self.assertEqual(guard.timeout("a"), 60.0)
+        self.assertIsNone(guard.hedge_delay("a"))
+        for index in range(1, 101):
+            guard.tracker.record("a", index / 100)
+        self.assertAlmostEqual(guard.timeout("a"), 4 * 0.99)
+        self.assertEqual(guard.hedge_delay("a"), 0.95)
+        self.assertEqual(guard.timeout("b"), 60.0)
+
+    def test_breaker_opens_on_error_spike_and_closes_after_probe(self):
+        now = [0.0]
+        breaker = CircuitBreaker(
+            error_rate=0.5,
+            window=4,
+            min_requests=4,
+            cooldown_seconds=10.0,
+            clock=lambda: now[0],
+        )
+        for success in (True, False, True):
+            self.assertFalse(breaker.record(success))
+        self.assertTrue(breaker.record(False))
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError) as raised:
+            breaker.before_request()
+        self.assertEqual(raised.exception.retry_after, 10.0)
+
+        now[0] = 10.0
+        breaker.before_request()  # the probe
+        self.assertEqual(breaker.state, "half-open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        self.assertTrue(breaker.record(False))
+        self.assertAlmostEqual(breaker.retry_after(), 10.0)
+
+        now[0] = 20.0
+        breaker.before_request()
+        breaker.record(True)
+        self.assertEqual(breaker.state, "closed")
+        breaker.before_request()
+
+
+class GuardedFetchTests(unittest.TestCase):
+    def fetch(self, url, guard, end="2025-01-06", **kwargs):
+        _, batches = fetch_daily_archive(
+            50.0,
+            30.0,
+            "2025-01-01",
+            end,
+            "UTC",
+            ["temperature_2m_max"],
+            url=url,
+            guard=guard,
+            max_attempts=1,
+            **kwargs,
+        )
+        return [day for batch in batches for day in batch["daily"]["time"]]
+
+    def test_slow_request_is_hedged_and_the_first_response_wins(self):
+        counter = itertools.count()
+
+        def responder(params):
+            if next(counter) == 5:
+                time.sleep(2.0)
+            return 200, {}, archive_payload(params)
+
+        guard = RequestGuard(timeout_multiplier=None, min_samples=5)
+        with ArchiveStubServer(responder) as server:
+            started = time.perf_counter()
+            days = self.fetch(server.url, guard, batch_days=1)
+            elapsed = time.perf_counter() - started
+            guard.close()
+
+        self.assertEqual(len(days), 6)
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(len(server.requests), 7)
+        counters = guard.counters
+        self.assertEqual((counters.requests, counters.sent), (6, 7))
+        self.assertEqual((counters.hedged, counters.hedge_wins), (1, 1))
+
+    def test_stalled_request_times_out_after_the_adaptive_timeout(self):
+        counter = itertools.count()
+
+        def responder(params):
+            if next(counter) == 3:
+                time.sleep(3.0)
+            return 200, {}, archive_payload(params)
+
+        guard = RequestGuard(
+            hedge_percentile=None,
+            timeout_multiplier=2.0,
+            min_timeout=0.2,
+            min_samples=3,
+        )
+        with ArchiveStubServer(responder) as server:
+            started = time.perf_counter()
+            with self.assertRaises(OSError):
+                self.fetch(server.url, guard, batch_days=1)
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual(guard.counters.timeouts, 1)
+        self.assertEqual(guard.counters.failures, 1)
+
+    def test_open_breaker_pauses_fetching_until_a_probe_succeeds(self):
+        counter = itertools.count()
+
+        def responder(params):
+            if next(counter) < 3:
+                return 500, {}, {"error": True}
+            return 200, {}, archive_payload(params)
+
+        breaker = CircuitBreaker(window=4, min_requests=3, cooldown_seconds=0.3)
+        guard = RequestGuard(hedge_percentile=None, breaker=breaker)
+        with ArchiveStubServer(responder) as server:
+            started = time.perf_counter()
+            days = self.fetch(
+                server.url,
+                guard,
+                end="2025-01-20",
+                batch_days=None,
+                adaptive=AdaptiveChunker(16, max_days=16, max_growth=1.0),
+            )
+            elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(days), 20)
+        self.assertGreaterEqual(elapsed, 0.3)
+        counters = guard.counters
+        self.assertEqual(counters.failures, 3)
+        self.assertEqual(counters.breaker_trips, 1)
+        self.assertEqual((counters.rejected, counters.pauses), (1, 1))
+        self.assertEqual(breaker.state, "closed")
+
+    def test_open_breaker_fails_fast_without_a_request(self):
+        breaker = CircuitBreaker(min_requests=1, cooldown_seconds=60.0)
+        breaker.record(False)
+        guard = RequestGuard(breaker=breaker)
+        with ArchiveStubServer() as server:
+            with self.assertRaises(CircuitOpenError):
+                http_get_with_retries(server.url, {}, max_attempts=1, guard=guard)
+        self.assertEqual(server.requests, [])
+        self.assertEqual(guard.counters.rejected, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,192 @@
+import asyncio
+import importlib.util
+import json
+import sqlite3
+import tempfile
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from fixtures import temp_config
+from stub_server import ArchiveStubServer, archive_payload
+
+from src.extract_async import (
+    AsyncArchiveExtractor,
+    TokenBucket,
+    backoff_delay,
+    fetch_daily_archive_async,
+    parse_retry_after,
+)
+from src.load import (
+    ensure_db_and_table,
+    load_rollup_statements,
+    load_upsert_statement,
+    make_artefact_writer,
+)
+from src.pipeline import _load_async_batches
+
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+
+
+async def _collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+class AsyncExtractHelpersTests(unittest.TestCase):
+    def test_backoff_delay_matches_urllib3_schedule(self):
+        self.assertEqual(backoff_delay(1, 1.0), 0.0)
+        self.assertEqual(backoff_delay(2, 1.0), 2.0)
+        self.assertEqual(backoff_delay(3, 0.5), 2.0)
+        self.assertEqual(backoff_delay(20, 1.0), 120.0)
+
+    def test_parse_retry_after_accepts_seconds_and_dates(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_token_bucket_limits_rate(self):
+        async def acquire_many():
+            bucket = TokenBucket(rate=50, capacity=1)
+            started = time.monotonic()
+            for _ in range(6):
+                await bucket.acquire()
+            return time.monotonic() - started
+
+        self.assertGreaterEqual(asyncio.run(acquire_many()), 0.09)
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class AsyncArchiveExtractorTests(unittest.TestCase):
+    def test_fetches_all_chunks_within_concurrency_limit(self):
+        with ArchiveStubServer(delay=0.05) as server:
+            extractor = AsyncArchiveExtractor(
+                ["temperature_2m_max"],
+                timezone="UTC",
+                batch_days=2,
+                max_concurrency=3,
+                url=server.url,
+            )
+            locations = [(50.0, 30.0), (51.0, 31.0)]
+            results = asyncio.run(
+                _collect(extractor.iter_batches(locations, "2025-01-01", "2025-01-10"))
+            )
+
+        self.assertEqual(len(results), 10)
+        self.assertLessEqual(server.max_in_flight, 3)
+        days = sorted(
+            day
+            for location, payload in results
+            if location == (50.0, 30.0)
+            for day in payload["daily"]["time"]
+        )
+        self.assertEqual(len(days), 10)
+        self.assertEqual(results[0][1]["_accepted_daily"], ["temperature_2m_max"])
+
+    def test_drops_unknown_variables_and_retries_transient_errors(self):
+        calls = {"unavailable": 0}
+
+        def responder(params):
+            if "bogus_var" in params["daily"]:
+                return (
+                    400,
+                    {},
+                    {"reason": "Invalid value for parameter 'daily': bogus_var"},
+                )
+            if calls["unavailable"] < 2:
+                calls["unavailable"] += 1
+                return 503, {"Retry-After": "0"}, {"reason": "busy"}
+            return 200, {}, archive_payload(params)
+
+        with ArchiveStubServer(responder) as server:
+            payloads = asyncio.run(
+                _collect(
+                    fetch_daily_archive_async(
+                        50.0,
+                        30.0,
+                        "2025-01-01",
+                        "2025-01-03",
+                        "UTC",
+                        ["temperature_2m_max", "bogus_var"],
+                        batch_days=None,
+                        url=server.url,
+                    )
+                )
+            )
+
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(payloads[0]["_accepted_daily"], ["temperature_2m_max"])
+        self.assertEqual(payloads[0]["_dropped_daily"], ["bogus_var"])
+        self.assertEqual(len(server.requests), 4)
+
+    def test_non_retryable_error_raises(self):
+        with ArchiveStubServer(
+            lambda params: (404, {}, {"reason": "missing"})
+        ) as server:
+            with self.assertRaises(RuntimeError):
+                asyncio.run(
+                    _collect(
+                        fetch_daily_archive_async(
+                            50.0,
+                            30.0,
+                            "2025-01-01",
+                            "2025-01-03",
+                            "UTC",
+                            ["temperature_2m_max"],
+                            batch_days=1,
+                            url=server.url,
+                        )
+                    )
+                )
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class AsyncPipelineTests(unittest.TestCase):
+    def test_pipeline_stores_the_batches_of_one_location(self):
+        # weather_daily and the day artefacts are keyed by date alone, so the
+        # batches of a second location would overwrite the first's.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = replace(
+                temp_config(Path(tmpdir)),
+                start_date="2025-01-01",
+                end_date="2025-01-30",
+                fetch_batch_days=10,
+            )
+            engine = ensure_db_and_table(config)
+
+            def load(server, locations):
+                with make_artefact_writer(config) as writer:
+                    asyncio.run(
+                        _load_async_batches(
+                            config,
+                            engine,
+                            load_upsert_statement(config),
+                            load_rollup_statements(config),
+                            writer,
+                            locations,
+                            url=server.url,
+                        )
+                    )
+
+            with ArchiveStubServer() as server:
+                with self.assertRaisesRegex(ValueError, "one location per database"):
+                    load(server, [(50.45, 30.52), (50.55, 30.41)])
+                self.assertEqual(server.requests, [])
+                load(server, [(50.55, 30.41)])
+
+            with sqlite3.connect(config.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT COUNT(*), COUNT(DISTINCT date) FROM weather_daily"
+                ).fetchone()
+            engine.dispose()
+            raw = json.loads(
+                (config.raw_root / "2025-01-15" / "response.json").read_text("utf-8")
+            )
+
+        self.assertEqual(rows, (30, 30))
+        self.assertEqual((raw["latitude"], raw["longitude"]), (50.55, 30.41))
+
+
+if __name__ == "__main__":
+    unittest.main()
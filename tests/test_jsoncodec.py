@@ -0,0 +1,92 @@
+import importlib.util
+import json
+import unittest
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from src.utils import jsoncodec
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+
+PAYLOAD = {
+    "latitude": 50.45,
+    "timezone": "Europe/Kyiv",
+    "name": "Київ",
+    "daily": {
+        "time": ["2025-08-01"],
+        "temperature_2m_max": [25.5],
+        "sunrise": [pd.Timestamp("2025-08-01T02:45:00Z")],
+        "precipitation_sum": [None],
+    },
+    "_dropped_daily": [],
+}
+
+
+class JsonCodecTests(unittest.TestCase):
+    def tearDown(self):
+        jsoncodec.set_backend("auto")
+
+    def test_stdlib_backend_is_compact_by_default(self):
+        self.assertEqual(jsoncodec.set_backend("json"), "json")
+        encoded = jsoncodec.dumps(PAYLOAD)
+        self.assertNotIn(b"\n", encoded)
+        self.assertNotIn(b", ", encoded)
+        self.assertIn("Київ".encode("utf-8"), encoded)
+        decoded = jsoncodec.loads(encoded)
+        self.assertEqual(decoded["daily"]["sunrise"], ["2025-08-01T02:45:00+00:00"])
+        self.assertEqual(
+            jsoncodec.loads(jsoncodec.dumps(PAYLOAD, indent=True)), decoded
+        )
+        self.assertEqual(
+            jsoncodec.dumps(PAYLOAD, indent=True).splitlines()[1][:3], b'  "'
+        )
+
+    @unittest.skipUnless(HAS_ORJSON, "orjson is not installed")
+    def test_backends_produce_identical_documents(self):
+        values = {
+            **PAYLOAD,
+            "count": np.int64(3),
+            "mean": np.float64(1.25),
+            "day": pd.Timestamp("2025-08-01").date(),
+        }
+        outputs = {}
+        for backend in ("json", "orjson"):
+            jsoncodec.set_backend(backend)
+            outputs[backend] = (
+                jsoncodec.dumps(values),
+                jsoncodec.dumps(values, indent=True),
+            )
+        self.assertEqual(
+            json.loads(outputs["json"][0]), json.loads(outputs["orjson"][0])
+        )
+        self.assertEqual(outputs["json"][1], outputs["orjson"][1])
+
+    def test_auto_prefers_orjson_when_available(self):
+        expected = "orjson" if HAS_ORJSON else "json"
+        self.assertEqual(jsoncodec.set_backend("auto"), expected)
+        self.assertEqual(jsoncodec.backend_name(), expected)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            jsoncodec.set_backend("simdjson")
+
+    def test_decimals_are_encoded_as_numbers(self):
+        for backend in ("json", "auto"):
+            jsoncodec.set_backend(backend)
+            with self.subTest(backend=backend):
+                self.assertEqual(
+                    jsoncodec.dumps({"temp_max_c": Decimal("25.50")}),
+                    b'{"temp_max_c":25.5}',
+                )
+
+    def test_unencodable_values_raise_type_error(self):
+        for backend in ("json", "auto"):
+            jsoncodec.set_backend(backend)
+            with self.assertRaises(TypeError):
+                jsoncodec.dumps({"value": object()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import json
+import unittest
+
+from src.utils.jsonstream import spool_archive
+
+PAYLOAD = {
+    "latitude": 50.45,
+    "daily_units": {"time": "iso8601", "temperature_2m_max": "°C"},
+    "daily": {
+        "time": [f"2025-08-{day:02d}" for day in range(1, 26)],
+        "temperature_2m_max": [None if i % 7 == 0 else i * 1.5e-3 for i in range(25)],
+        "sunrise": [f'2025-08-01T05:{i:02d} "x", ] \\' for i in range(25)],
+        "is_day": [True, False] * 12 + [True],
+        "empty": [],
+    },
+    "generationtime_ms": 0.5,
+    "nested": [[1, {"a": "}]"}], []],
+}
+
+
+def chunked(body: bytes, size: int) -> list[bytes]:
+    return [body[offset : offset + size] for offset in range(0, len(body), size)]
+
+
+class SpoolArchiveTests(unittest.TestCase):
+    def test_windows_match_the_payload_for_any_chunking(self):
+        for indent in (None, 2):
+            body = json.dumps(PAYLOAD, indent=indent).encode()
+            for size in (1, 2, 3, 7, 64, len(body)):
+                with (
+                    self.subTest(indent=indent, size=size),
+                    spool_archive(chunked(body, size), spool_bytes=16) as archive,
+                ):
+                    windows = list(archive.iter_windows(10))
+
+                    self.assertEqual(archive.days, 25)
+                    self.assertEqual(archive.bytes_read, len(body))
+                    self.assertEqual(
+                        [len(window["daily"]["time"]) for window in windows],
+                        [10, 10, 5],
+                    )
+                    for key in ("latitude", "daily_units", "nested"):
+                        self.assertEqual(windows[-1][key], PAYLOAD[key])
+                    joined = {
+                        name: [v for window in windows for v in window["daily"][name]]
+                        for name in PAYLOAD["daily"]
+                    }
+                    self.assertEqual(joined, PAYLOAD["daily"])
+
+    def test_malformed_bodies_are_rejected(self):
+        for body in (
+            b'{"daily": {"time": [1,,2]}}',
+            b'{"daily": {"time": [1, 2}',
+            b'{"latitude": 1} trailing',
+            b'{"latitude": ',
+        ):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                spool_archive(chunked(body, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
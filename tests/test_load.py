@@ -1,8 +1,25 @@
+import json
+import sqlite3
+import tempfile
 import unittest
+from pathlib import Path
 
 import pandas as pd
+from fixtures import sample_batch, temp_config
 
-from src.load import df_rows_for_upsert
+from src.load import (
+    df_rows_for_upsert,
+    ensure_db_and_table,
+    get_db_engine,
+    load_upsert_statement,
+    read_table_version,
+    rollup_periods,
+    split_daily_payload,
+    split_save_and_upsert,
+    upsert_frame,
+)
+from src.transform import records_to_dataframe, transform_day_payload
+from src.utils.io import ArtefactWriter
 
 
 class LoadHelpersTests(unittest.TestCase):
@@ -34,6 +51,214 @@ class LoadHelpersTests(unittest.TestCase):
         self.assertEqual(record["source"], "open-meteo")
         self.assertTrue(record["ingested_at"].endswith("Z"))
 
+    def test_df_rows_for_upsert_yields_every_row(self):
+        df = pd.DataFrame(
+            [
+                {"date": "2025-08-01", "sunrise": None, "temp_max_c": 20.0},
+                {"date": "2025-08-02", "sunrise": None, "temp_max_c": float("nan")},
+            ]
+        )
+
+        records = list(df_rows_for_upsert(df))
+        self.assertEqual(
+            [record["date"] for record in records], ["2025-08-01", "2025-08-02"]
+        )
+        self.assertEqual(records[0]["temp_max_c"], 20.0)
+        self.assertIsNone(records[1]["temp_max_c"])
+        self.assertIsNone(records[1]["sunrise"])
+
+
+class SplitSaveAndUpsertTests(unittest.TestCase):
+    def test_writes_artefacts_atomically_and_upserts_rows(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            engine = ensure_db_and_table(config, get_db_engine(config))
+            days = ["2025-08-01", "2025-08-02", "2025-08-03"]
+
+            with ArtefactWriter(max_workers=2, max_pending=2) as writer:
+                split_save_and_upsert(
+                    sample_batch(days), config, engine=engine, writer=writer
+                )
+
+            for day in days:
+                raw = json.loads((tmp / "raw" / day / "response.json").read_text())
+                self.assertEqual(raw["daily"]["time"], [day])
+                frame = pd.read_parquet(tmp / "processed" / day / "data.parquet")
+                self.assertEqual(frame.loc[0, "date"], day)
+            self.assertEqual(list((tmp / "raw").rglob("*.tmp")), [])
+
+            with sqlite3.connect(config.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT date, temp_max_c FROM weather_daily ORDER BY date"
+                ).fetchall()
+            self.assertEqual(
+                rows, [("2025-08-01", 25.0), ("2025-08-02", 26.0), ("2025-08-03", 27.0)]
+            )
+            engine.dispose()
+
+    def test_artefacts_are_written_outside_the_write_transaction(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            engine = ensure_db_and_table(config, get_db_engine(config))
+            split_save_and_upsert(sample_batch(["2025-07-31"]), config, engine=engine)
+            lock_free = []
+
+            class ProbingWriter(ArtefactWriter):
+                def write_bytes(self, path, data):
+                    probe = sqlite3.connect(config.db_path, timeout=0)
+                    try:
+                        probe.execute("BEGIN IMMEDIATE")
+                        probe.rollback()
+                        lock_free.append(True)
+                    except sqlite3.OperationalError:
+                        lock_free.append(False)
+                    finally:
+                        probe.close()
+                    super().write_bytes(path, data)
+
+            upserted = split_save_and_upsert(
+                sample_batch(["2025-08-01", "2025-08-02"]),
+                config,
+                engine=engine,
+                writer=ProbingWriter(),
+            )
+
+            self.assertEqual(upserted, 2)
+            self.assertEqual(lock_free, [True] * 4)
+            engine.dispose()
+
+
+class TableVersionTests(unittest.TestCase):
+    def test_version_changes_only_with_the_row_content(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = temp_config(Path(tmpdir))
+            engine = ensure_db_and_table(config, get_db_engine(config))
+            upsert_stmt = load_upsert_statement(config)
+
+            def load(temp_max_c: float):
+                batch = sample_batch(["2025-08-01", "2025-08-02"])
+                batch["daily"]["temperature_2m_max"] = [20.0, temp_max_c]
+                frame = records_to_dataframe(
+                    [
+                        transform_day_payload(day)
+                        for _, day in split_daily_payload(batch)
+                    ]
+                )
+                result = upsert_frame(engine, upsert_stmt, frame)
+                with engine.connect() as conn:
+                    return result, read_table_version(conn)
+
+            (first, initial), (again, unchanged), (edited, changed) = (
+                load(21.0),
+                load(21.0),
+                load(22.5),
+            )
+            engine.dispose()
+
+        self.assertEqual((first.rows, first.changed), (2, 2))
+        self.assertEqual((again.rows, again.changed), (2, 0))
+        self.assertEqual(unchanged, initial)
+        self.assertEqual((edited.rows, edited.changed), (2, 1))
+        self.assertNotEqual(changed, initial)
+
+
+class RollupTests(unittest.TestCase):
+    def test_rollup_periods_cover_touched_months_and_years(self):
+        days = ["2024-12-31", "2025-01-15", "2025-01-01"]
+        self.assertEqual(
+            rollup_periods(days, "month"),
+            [
+                {"period_start": "2024-12-01", "period_end": "2025-01-01"},
+                {"period_start": "2025-01-01", "period_end": "2025-02-01"},
+            ],
+        )
+        self.assertEqual(
+            rollup_periods(days, "year"),
+            [
+                {"period_start": "2024-01-01", "period_end": "2025-01-01"},
+                {"period_start": "2025-01-01", "period_end": "2026-01-01"},
+            ],
+        )
+
+    def test_upsert_refreshes_only_touched_rollups(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            engine = ensure_db_and_table(config, get_db_engine(config))
+
+            batch = sample_batch(["2025-07-30", "2025-07-31", "2025-08-01"])
+            batch["daily"]["temperature_2m_max"] = [31.0, 29.0, 33.0]
+            split_save_and_upsert(batch, config, engine=engine)
+
+            with sqlite3.connect(config.db_path) as conn:
+                conn.execute(
+                    "UPDATE weather_monthly SET hot_days = 99 WHERE month = '2025-07-01'"
+                )
+
+            batch = sample_batch(["2025-08-02"])
+            batch["daily"]["temperature_2m_max"] = [35.0]
+            split_save_and_upsert(batch, config, engine=engine)
+
+            with sqlite3.connect(config.db_path) as conn:
+                monthly = conn.execute(
+                    "SELECT month, days, mean_temp_max_c, total_precip_mm, "
+                    "sunshine_hours, hot_days FROM weather_monthly ORDER BY month"
+                ).fetchall()
+                yearly = conn.execute(
+                    "SELECT year, days, hot_days FROM weather_yearly"
+                ).fetchall()
+
+            self.assertEqual(
+                monthly,
+                [
+                    ("2025-07-01", 2, 30.0, 1.0, 20.0, 99),
+                    ("2025-08-01", 2, 34.0, 1.0, 20.0, 2),
+                ],
+            )
+            self.assertEqual(yearly, [(2025, 4, 3)])
+            engine.dispose()
+
+    def test_ensure_db_and_table_backfills_existing_rows(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            with sqlite3.connect(config.db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE weather_daily (date DATE PRIMARY KEY, temp_max_c REAL, "
+                    "temp_min_c REAL, precip_mm REAL, sunshine_sec REAL, "
+                    "weather_code INTEGER, source TEXT, ingested_at TEXT)"
+                )
+                conn.execute(
+                    "INSERT INTO weather_daily (date, temp_max_c) VALUES ('2025-08-01', 30.5)"
+                )
+
+            engine = ensure_db_and_table(config, get_db_engine(config))
+
+            with sqlite3.connect(config.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT month, days, hot_days FROM weather_monthly"
+                ).fetchall()
+            self.assertEqual(rows, [("2025-08-01", 1, 1)])
+            engine.dispose()
+
+    def test_ensure_db_and_table_backfills_an_empty_yearly_table(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            engine = ensure_db_and_table(config, get_db_engine(config))
+            split_save_and_upsert(sample_batch(["2025-08-01"]), config, engine=engine)
+            with sqlite3.connect(config.db_path) as conn:
+                conn.execute("DELETE FROM weather_yearly")
+
+            ensure_db_and_table(config, engine)
+
+            with sqlite3.connect(config.db_path) as conn:
+                rows = conn.execute("SELECT year, days FROM weather_yearly").fetchall()
+            self.assertEqual(rows, [(2025, 1)])
+            engine.dispose()
+
 
 if __name__ == "__main__":
     unittest.main()
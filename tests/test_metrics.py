@@ -0,0 +1,154 @@
+import json
+import math
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+from fixtures import sample_batch, temp_config
+from sqlalchemy import event
+
+from src.analytics import calculate_metrics, configured_metrics
+from src.config import METRIC_SQL_FILES
+from src.load import ensure_db_and_table, split_save_and_upsert
+from src.metrics import (
+    METRIC_CATALOGUE,
+    HeatwaveStreaks,
+    LinearFit,
+    RollingWindow,
+    scan_metrics,
+)
+
+
+def seasonal_batch(days: int = 400) -> dict:
+    """A year and a bit of history with two summers, a gap and missing values."""
+    start = date(2024, 3, 1)
+    time = [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+    del time[100:103]  # rows are consecutive in date order even across gaps
+    batch = sample_batch(time)
+    temps = [
+        18 + 15 * math.sin((offset - 60) * 2 * math.pi / 365) + (offset % 5)
+        for offset in range(len(time))
+    ]
+    temps[200] = None  # outside any heatwave: both SQL dialects agree
+    batch["daily"]["temperature_2m_max"] = temps
+    batch["daily"]["precipitation_sum"] = [
+        None if offset % 11 == 0 else float(offset % 4) for offset in range(len(time))
+    ]
+    batch["daily"]["sunshine_duration"] = [30000.0 + 400 * (t or 0) for t in temps]
+    return batch
+
+
+def assert_records_close(test, actual, expected):
+    test.assertEqual(len(actual), len(expected))
+    for got, want in zip(actual, expected):
+        test.assertEqual(list(got), list(want))
+        for key, value in want.items():
+            if isinstance(value, float) and got[key] is not None:
+                test.assertAlmostEqual(got[key], value, places=6, msg=key)
+            else:
+                test.assertEqual(got[key], value, msg=key)
+
+
+class MetricCatalogueTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = temp_config(self.tmp)
+        self.engine = ensure_db_and_table(self.config)
+        split_save_and_upsert(seasonal_batch(), self.config, engine=self.engine)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def report(self, queries, label: str) -> dict:
+        return self.report_for(
+            replace(self.config, reports_root=self.tmp / label), queries, self.engine
+        )
+
+    def report_for(self, config, queries, engine=None) -> dict:
+        report_dir = calculate_metrics(config, queries, engine=engine, use_cache=False)
+        return {
+            path.stem: json.loads(path.read_text("utf-8"))
+            for path in report_dir.glob("*.json")
+            if path.name != "metadata.json"
+        }
+
+    def test_catalogue_matches_the_sql_files(self):
+        scanned = self.report(METRIC_CATALOGUE, "scan")
+        queried = self.report(METRIC_SQL_FILES, "sql")
+        self.assertEqual(set(scanned), {Path(name).stem for name in METRIC_SQL_FILES})
+        for name, expected in queried.items():
+            with self.subTest(metric=name):
+                self.assertTrue(expected)
+                assert_records_close(self, scanned[name], expected)
+
+    def test_parameterised_metrics_share_one_scan(self):
+        catalogue = [
+            *(RollingWindow(f"rolling_{n}d", n) for n in (7, 30, 90)),
+            *(HeatwaveStreaks(f"heat_{t}", threshold=t) for t in (25.0, 30.0, 32.0)),
+            LinearFit("sunshine_vs_temp"),
+            LinearFit("precip_vs_temp", x="temp_max_c", y="precip_mm"),
+        ]
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if "weather_daily" in statement:
+                statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", record)
+        try:
+            with self.engine.connect() as conn:
+                results = scan_metrics(conn, catalogue)
+        finally:
+            event.remove(self.engine, "before_cursor_execute", record)
+
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(len(results), 8)
+        self.assertEqual(
+            list(results["rolling_30d"].columns),
+            ["date", "ma30_temp_max_c", "ma30_temp_min_c", "sum30_precip_mm"],
+        )
+        for threshold in (25.0, 30.0, 32.0):
+            streaks = results[f"heat_{threshold}"]
+            self.assertFalse(streaks.empty)
+            self.assertTrue((streaks["days"] >= 3).all())
+            self.assertTrue((streaks["avg_temp_max_c"] >= threshold).all())
+        # 397 rows, 37 without precipitation and one more without a temperature.
+        self.assertEqual(results["precip_vs_temp"]["n"][0], 397 - 37 - 1)
+
+    def test_missing_value_ends_a_streak(self):
+        days = [f"2025-07-0{day}" for day in range(1, 8)]
+        batch = sample_batch(days)
+        batch["daily"]["temperature_2m_max"] = [31.0, 32.0, 33.0, None, 31, 30, 34]
+        config = temp_config(self.tmp / "gap")
+        engine = ensure_db_and_table(config)
+        split_save_and_upsert(batch, config, engine=engine)
+        engine.dispose()
+
+        streaks = self.report_for(config, METRIC_CATALOGUE)["metrics_heatwave_streaks"]
+        self.assertEqual(
+            [[s["grp_id"], s["start_date"], s["days"]] for s in streaks],
+            [[1, "2025-07-01", 3], [2, "2025-07-05", 3]],
+        )
+        self.assertEqual([s["peak_temp_max_c"] for s in streaks], [33.0, 34.0])
+        # The SQLite query lets a streak run on across the missing day, unlike
+        # the Postgres and DuckDB ones (and the catalogue).
+        queried = self.report_for(config, METRIC_SQL_FILES)["metrics_heatwave_streaks"]
+        self.assertEqual(
+            [[s["start_date"], s["end_date"], s["days"]] for s in queried],
+            [["2025-07-01", "2025-07-07", 6]],
+        )
+
+    def test_metric_engine_selects_the_report(self):
+        self.assertEqual(configured_metrics(self.config), METRIC_CATALOGUE)
+        self.assertEqual(
+            configured_metrics(replace(self.config, metric_engine="sql")),
+            METRIC_SQL_FILES,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
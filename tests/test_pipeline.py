@@ -0,0 +1,41 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from src.pipeline import parse_args
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = {"pandas", "numpy", "pyarrow", "sqlalchemy", "requests", "urllib3"}
+
+
+class PipelineEntryPointTests(unittest.TestCase):
+    def test_entry_points_do_not_import_heavy_dependencies(self):
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import src.pipeline, src.dump_db, src.replay, src.daemon, src.serve, "
+                "src.workqueue, src.sync_db",
+            ],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        imported = {
+            line.rsplit("|", 1)[-1].strip()
+            for line in completed.stderr.splitlines()
+            if line.startswith("import time:")
+        }
+        self.assertEqual(imported & HEAVY_MODULES, set())
+
+    def test_parse_args_backend_override(self):
+        self.assertIsNone(parse_args([]).backend)
+        self.assertEqual(parse_args(["--backend", "postgres"]).backend, "postgres")
+
+
+if __name__ == "__main__":
+    unittest.main()
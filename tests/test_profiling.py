@@ -0,0 +1,61 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.config import parse_profile_modes
+from src.utils.profiling import StageProfiler
+
+
+def busy(seconds: float) -> list[int]:
+    deadline = time.perf_counter() + seconds
+    chunks = []
+    while time.perf_counter() < deadline:
+        chunks.append(list(range(1000)))
+    return [len(chunk) for chunk in chunks]
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_parse_profile_modes(self):
+        self.assertEqual(parse_profile_modes(None), frozenset())
+        self.assertEqual(parse_profile_modes(" CPU, memory "), {"cpu", "memory"})
+        self.assertEqual(parse_profile_modes("all"), {"cpu", "memory", "sample"})
+        with self.assertRaises(ValueError):
+            parse_profile_modes("cpu,gpu")
+
+    def test_stage_profiles_write_artefacts_per_stage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp) / "profiles" / "run"
+            profiler = StageProfiler(
+                {"cpu", "memory", "sample"}, output_dir, sample_interval=0.001
+            )
+            with self.assertLogs("src.utils.profiling", level="INFO") as logs:
+                with profiler.stage("load"):
+                    busy(0.05)
+                    with profiler.stage("nested"):
+                        busy(0.01)
+                items = list(profiler.wrap_iterator("extract", iter([1, 2, 3])))
+                self.assertEqual(profiler.finish(), output_dir)
+
+            self.assertEqual(items, [1, 2, 3])
+            names = sorted(path.name for path in output_dir.iterdir())
+            self.assertIn("load.prof", names)
+            self.assertIn("load.cpu.txt", names)
+            self.assertIn("load.memory.txt", names)
+            self.assertIn("load.samples.txt", names)
+            self.assertIn("extract.prof", names)
+            self.assertFalse(any(name.startswith("nested") for name in names))
+            self.assertIn("busy", (output_dir / "load.samples.txt").read_text())
+            self.assertTrue(any("stage load" in line for line in logs.output))
+
+    def test_disabled_profiler_is_a_no_op(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = StageProfiler(frozenset(), Path(tmp) / "unused")
+            with profiler.stage("load"):
+                pass
+            self.assertIsNone(profiler.finish())
+            self.assertFalse((Path(tmp) / "unused").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+from fixtures import sample_batch, temp_config
+
+from src.load import ensure_db_and_table, split_save_and_upsert
+from src.replay import discover_days, replay
+
+
+def _days(start: str, count: int) -> list[str]:
+    first = date.fromisoformat(start)
+    return [(first + timedelta(days=offset)).isoformat() for offset in range(count)]
+
+
+def _table(db_path: Path, query: str) -> list[tuple]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(query).fetchall()
+
+
+DAILY_QUERY = (
+    "SELECT date, temp_max_c, temp_min_c, temp_max_f, precip_mm, sunshine_sec "
+    "FROM weather_daily ORDER BY date"
+)
+MONTHLY_QUERY = (
+    "SELECT month, days, mean_temp_max_c FROM weather_monthly ORDER BY month"
+)
+
+
+class ReplayTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = temp_config(self.tmp)
+        engine = ensure_db_and_table(self.config)
+        split_save_and_upsert(
+            sample_batch(_days("2024-12-25", 40)), self.config, engine=engine
+        )
+        self.expected_daily = _table(self.config.db_path, DAILY_QUERY)
+        self.expected_monthly = _table(self.config.db_path, MONTHLY_QUERY)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _fresh_config(self, name: str):
+        return replace(self.config, db_path=self.tmp / f"{name}.db")
+
+    def test_discover_days_filters_range_and_ignores_stray_entries(self):
+        (self.config.proc_root / "2025-01-10.tmp").mkdir()
+        (self.config.proc_root / "2099-01-01").mkdir()
+        days = discover_days(self.config, "processed", "2025-01-01", "2025-01-05")
+        self.assertEqual(days, _days("2025-01-01", 5))
+        self.assertEqual(len(discover_days(self.config, "raw")), 40)
+
+    def test_replay_rebuilds_identical_tables_from_each_source(self):
+        for source, workers in (("raw", 1), ("processed", 1), ("raw", 2)):
+            with self.subTest(source=source, workers=workers):
+                config = self._fresh_config(f"{source}-{workers}")
+                stats = replay(config, source=source, workers=workers, chunk_days=7)
+                self.assertEqual((stats.days, stats.rows), (40, 40))
+                self.assertGreater(stats.rows_per_second, 0)
+                self.assertEqual(
+                    _table(config.db_path, DAILY_QUERY), self.expected_daily
+                )
+                self.assertEqual(
+                    _table(config.db_path, MONTHLY_QUERY), self.expected_monthly
+                )
+
+    def test_replay_of_partial_range_only_touches_those_days(self):
+        config = self._fresh_config("partial")
+        stats = replay(config, start="2025-01-01", end="2025-01-31", workers=1)
+        self.assertEqual(stats.rows, 31)
+        rows = _table(config.db_path, "SELECT MIN(date), MAX(date) FROM weather_daily")
+        self.assertEqual(rows, [("2025-01-01", "2025-01-31")])
+
+    def test_unknown_source_is_rejected(self):
+        with self.assertRaises(ValueError):
+            replay(self._fresh_config("bad"), source="api")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import http.client
+import importlib.util
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from fixtures import sample_batch, temp_config
+from sqlalchemy import create_engine, text
+
+from src.analytics import calculate_metrics
+from src.config import METRIC_SQL_FILES
+from src.load import ensure_db_and_table, split_save_and_upsert
+from src.serve import ReadService, etag_matches, make_server
+
+DAYS = ["2025-08-01", "2025-08-02", "2025-08-03", "2025-08-04"]
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb_engine") is not None
+
+
+class ReadServiceTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = temp_config(self.tmp)
+        self.engine = ensure_db_and_table(self.config)
+        split_save_and_upsert(sample_batch(DAYS), self.config, engine=self.engine)
+        self.report_dir = calculate_metrics(
+            self.config, METRIC_SQL_FILES, engine=self.engine
+        )
+
+        self.service = ReadService(self.config, engine=self.engine)
+        self.server = make_server(self.service, port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        self.conn = http.client.HTTPConnection(host, port, timeout=5)
+
+    def tearDown(self):
+        self.conn.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def request(self, path: str, headers: dict | None = None):
+        self.conn.request("GET", path, headers=headers or {})
+        response = self.conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+
+    def test_serves_latest_metrics_with_etag_revalidation(self):
+        status, _, body = self.request("/metrics")
+        self.assertEqual(status, 200)
+        manifest = json.loads(body)
+        self.assertEqual(manifest["report"], self.report_dir.name)
+        self.assertEqual(
+            [entry["name"] for entry in manifest["metrics"]],
+            [Path(name).stem for name in METRIC_SQL_FILES],
+        )
+
+        status, headers, body = self.request("/metrics/metrics_rolling_7d")
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            body, (self.report_dir / "metrics_rolling_7d.json").read_bytes()
+        )
+        etag = headers["ETag"]
+
+        # Same connection (keep-alive): a matching validator gets an empty 304.
+        status, headers, body = self.request(
+            "/metrics/metrics_rolling_7d", {"If-None-Match": etag}
+        )
+        self.assertEqual((status, body, headers["ETag"]), (304, b"", etag))
+
+        self.assertEqual(self.request("/metrics/nope")[0], 404)
+        self.assertEqual(self.request("/nope")[0], 404)
+
+    def test_daily_ranges_are_cached_until_the_data_version_changes(self):
+        path = "/daily?start=2025-08-02&end=2025-08-03&columns=temp_max_c"
+        status, headers, body = self.request(path)
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            json.loads(body),
+            [
+                {"date": "2025-08-02", "temp_max_c": 26.0},
+                {"date": "2025-08-03", "temp_max_c": 27.0},
+            ],
+        )
+        self.request(path)
+        self.assertEqual(self.service.cache_info()["hits"], 1)
+
+        batch = sample_batch(DAYS)
+        batch["daily"]["temperature_2m_max"] = [10.0, 11.0, 12.0, 13.0]
+        split_save_and_upsert(batch, self.config, engine=self.engine)
+
+        status, fresh_headers, fresh = self.request(path)
+        self.assertEqual(json.loads(fresh)[0]["temp_max_c"], 11.0)
+        self.assertNotEqual(fresh_headers["ETag"], headers["ETag"])
+        self.assertEqual(self.service.cache_info()["invalidations"], 1)
+
+    def test_invalid_daily_queries_are_rejected(self):
+        for path in (
+            "/daily",
+            "/daily?start=2025-13-01",
+            "/daily?start=2025-08-03&end=2025-08-01",
+            "/daily?start=2025-08-01&columns=temp_max_c,1;DROP",
+        ):
+            with self.subTest(path=path):
+                status, _, body = self.request(path)
+                self.assertEqual(status, 400)
+                self.assertIn("error", json.loads(body))
+
+    def test_etag_matching_follows_if_none_match_lists(self):
+        self.assertTrue(etag_matches('"a", W/"b"', '"b"'))
+        self.assertTrue(etag_matches("*", '"b"'))
+        self.assertFalse(etag_matches('"a"', '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb-engine is not installed")
+class DecimalColumnTests(unittest.TestCase):
+    def test_daily_ranges_encode_decimal_columns(self):
+        # Postgres NUMERIC(5,2) columns reach the service as Decimal values, as
+        # DuckDB DECIMAL ones do.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            engine = create_engine(f"duckdb:///{tmp / 'weather.duckdb'}")
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "CREATE TABLE weather_daily "
+                        "(date DATE PRIMARY KEY, temp_max_c DECIMAL(5, 2))"
+                    )
+                )
+                conn.execute(
+                    text("INSERT INTO weather_daily VALUES ('2025-08-01', 25.50)")
+                )
+            service = ReadService(temp_config(tmp), engine=engine)
+            try:
+                response = service.get(
+                    "/daily", {"start": "2025-08-01", "columns": "temp_max_c"}
+                )
+            finally:
+                engine.dispose()
+
+        self.assertEqual(
+            json.loads(response.body), [{"date": "2025-08-01", "temp_max_c": 25.5}]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
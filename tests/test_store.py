@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.store import WeatherStore, invalidate_days
+from src.utils.io import ensure_proc_outpath
+
+
+def write_day(root: Path, day: str, temp_max_c: float) -> Path:
+    path = ensure_proc_outpath(root, day)
+    pd.DataFrame(
+        [
+            {
+                "date": day,
+                "temp_max_c": temp_max_c,
+                "temp_min_c": temp_max_c - 10,
+                "sunrise": pd.Timestamp(f"{day}T05:45"),
+            }
+        ]
+    ).to_parquet(path, index=False, engine="pyarrow")
+    return path
+
+
+class WeatherStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for offset, day in enumerate(["2025-08-01", "2025-08-02", "2025-08-04"]):
+            write_day(self.root, day, 20.0 + offset)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_get_range_projects_columns_and_skips_missing_days(self):
+        store = WeatherStore(self.root)
+        frame = store.get_range(
+            "2025-07-31", "2025-08-05", ["temp_max_c", "uv_index_max"]
+        )
+
+        self.assertEqual(list(frame.columns), ["date", "temp_max_c", "uv_index_max"])
+        self.assertEqual(
+            list(frame["date"]), ["2025-08-01", "2025-08-02", "2025-08-04"]
+        )
+        self.assertEqual(list(frame["temp_max_c"]), [20.0, 21.0, 22.0])
+        self.assertTrue(frame["uv_index_max"].isna().all())
+
+    def test_repeated_reads_hit_cache_and_timestamps_stay_local(self):
+        store = WeatherStore(self.root)
+        store.get_range("2025-08-01", "2025-08-04", ["sunrise"])
+        frame = store.get_range("2025-08-01", "2025-08-04", ["sunrise"])
+
+        self.assertEqual(store.cache_info()["hits"], 3)
+        self.assertEqual(frame.loc[0, "sunrise"], pd.Timestamp("2025-08-01T05:45"))
+        self.assertIsNone(frame.loc[0, "sunrise"].tzinfo)
+
+    def test_get_day_raises_for_missing_day(self):
+        store = WeatherStore(self.root)
+        self.assertEqual(store.get_day("2025-08-02").loc[0, "temp_max_c"], 21.0)
+        with self.assertRaises(KeyError):
+            store.get_day("2025-08-03")
+
+    def test_invalidation_and_file_checks_pick_up_rewrites(self):
+        store = WeatherStore(self.root, check_files=False)
+        self.assertEqual(store.get_day("2025-08-01").loc[0, "temp_max_c"], 20.0)
+
+        path = write_day(self.root, "2025-08-01", 30.0)
+        os.utime(path, ns=(1, 1))
+        self.assertEqual(store.get_day("2025-08-01").loc[0, "temp_max_c"], 20.0)
+        invalidate_days(["2025-08-01"])
+        self.assertEqual(store.get_day("2025-08-01").loc[0, "temp_max_c"], 30.0)
+
+        checking = WeatherStore(self.root)
+        checking.get_day("2025-08-02")
+        path = write_day(self.root, "2025-08-02", 40.0)
+        os.utime(path, ns=(2, 2))
+        self.assertEqual(checking.get_day("2025-08-02").loc[0, "temp_max_c"], 40.0)
+
+    def test_cache_is_bounded(self):
+        store = WeatherStore(self.root, cache_bytes=400)
+        store.get_range("2025-08-01", "2025-08-04")
+        info = store.cache_info()
+        self.assertLessEqual(info["bytes"], 400)
+        self.assertGreater(info["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import importlib.util
+import json
+import tempfile
+import unittest
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+from fixtures import data_version, sample_batch, temp_config
+from sqlalchemy import text
+
+from src.analytics import calculate_metrics
+from src.load import ensure_db_and_table, split_save_and_upsert
+from src.sync_db import read_watermark, sync, upsert_record
+
+HAS_DUCKDB = importlib.util.find_spec("duckdb_engine") is not None
+
+DAYS = [(date(2025, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(40)]
+
+
+class UpsertRecordTests(unittest.TestCase):
+    def test_driver_types_become_plain_values(self):
+        from datetime import UTC, datetime, timezone
+        from decimal import Decimal
+
+        row = [None] * 26
+        row[0] = date(2025, 1, 2)
+        row[1] = Decimal("21.50")
+        row[12] = datetime(2025, 1, 2, 7, 40)
+        kyiv = timezone(timedelta(hours=2))
+        row[25] = datetime(2025, 1, 2, 12, 0, 0, 250, tzinfo=kyiv)
+        record = upsert_record(row)
+        self.assertEqual(record["date"], "2025-01-02")
+        self.assertEqual(record["temp_max_c"], 21.5)
+        self.assertEqual(record["sunrise"], "2025-01-02T07:40:00")
+        self.assertEqual(record["ingested_at"], "2025-01-02T10:00:00.000250Z")
+        self.assertEqual(
+            upsert_record([None] * 25 + [datetime(2025, 1, 2, tzinfo=UTC)])[
+                "ingested_at"
+            ],
+            "2025-01-02T00:00:00Z",
+        )
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb-engine is not installed")
+class SyncTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.sqlite = temp_config(self.tmp)
+        self.duckdb = replace(
+            self.sqlite, db_backend="duckdb", duckdb_path=self.tmp / "weather.duckdb"
+        )
+        self.engine = ensure_db_and_table(self.sqlite)
+        split_save_and_upsert(sample_batch(DAYS), self.sqlite, engine=self.engine)
+        self.stamp("2025-02-01T00:00:00Z")
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def stamp(self, ingested_at: str, days=None, temp_max_c=None):
+        """Give ``days`` (default: all) a fixed ``ingested_at`` in the SQLite source."""
+        sql = "UPDATE weather_daily SET ingested_at = ?"
+        params = [ingested_at]
+        if temp_max_c is not None:
+            sql += ", temp_max_c = ?"
+            params.append(temp_max_c)
+        if days is not None:
+            sql += f" WHERE date IN ({','.join('?' * len(days))})"
+            params.extend(days)
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(sql, tuple(params))
+
+    def duckdb_rows(self, sql: str):
+        engine = ensure_db_and_table(self.duckdb)
+        try:
+            with engine.connect() as conn:
+                return conn.execute(text(sql)).all()
+        finally:
+            engine.dispose()
+
+    def test_incremental_sync_copies_only_rows_ingested_after_the_watermark(self):
+        stats = sync(self.sqlite, self.duckdb, chunk_rows=15)
+        self.assertEqual((stats.rows, stats.chunks), (40, 3))
+        self.assertEqual(stats.watermark, ("2025-02-01T00:00:00Z", "2025-02-09"))
+        self.assertGreater(stats.rows_per_second, 0)
+        self.assertIn("rows/s", stats.summary())
+        self.assertEqual(
+            self.duckdb_rows("SELECT days FROM weather_monthly ORDER BY month"),
+            [(31,), (9,)],
+        )
+
+        self.assertEqual(sync(self.sqlite, self.duckdb).rows, 0)
+
+        updated = ["2025-01-03", "2025-02-05"]
+        self.stamp("2025-03-01T00:00:00Z", updated, temp_max_c=-5.0)
+        stats = sync(self.sqlite, self.duckdb, chunk_rows=15)
+        self.assertEqual((stats.rows, stats.chunks), (2, 1))
+        self.assertEqual(
+            self.duckdb_rows(
+                "SELECT CAST(date AS VARCHAR) FROM weather_daily "
+                "WHERE temp_max_c = -5 ORDER BY date"
+            ),
+            [(day,) for day in updated],
+        )
+
+        # Rows at or after ``until`` wait for a later run.
+        self.stamp("2025-04-01T00:00:00Z", ["2025-01-10"], temp_max_c=-6.0)
+        self.assertEqual(
+            sync(self.sqlite, self.duckdb, until="2025-04-01T00:00:00Z").rows, 0
+        )
+        self.assertEqual(sync(self.sqlite, self.duckdb).rows, 1)
+
+    def test_round_trip_back_into_sqlite(self):
+        sync(self.sqlite, self.duckdb)
+        target = replace(self.sqlite, db_path=self.tmp / "copy.db")
+        stats = sync(self.duckdb, target, chunk_rows=25)
+        self.assertEqual((stats.rows, stats.chunks), (40, 2))
+
+        copy_engine = ensure_db_and_table(target)
+        try:
+            with copy_engine.connect() as conn:
+                copied = conn.execute(
+                    text("SELECT date, temp_max_c, ingested_at FROM weather_daily")
+                ).all()
+            source = f"duckdb:///{self.duckdb.duckdb_path}"
+            self.assertEqual(
+                read_watermark(copy_engine, source),
+                ("2025-02-01T00:00:00Z", "2025-02-09"),
+            )
+        finally:
+            copy_engine.dispose()
+        with self.engine.connect() as conn:
+            original = conn.execute(
+                text("SELECT date, temp_max_c, ingested_at FROM weather_daily")
+            ).all()
+        self.assertEqual(sorted(copied), sorted(original))
+        self.assertIn("sqlite", stats.summary())
+
+    def test_synced_changes_invalidate_the_target_metrics(self):
+        # The target's own load stamps a newer ingested_at than any synced row.
+        engine = ensure_db_and_table(self.duckdb)
+        split_save_and_upsert(sample_batch(DAYS), self.duckdb, engine=engine)
+        engine.dispose()
+        sql_dir = self.tmp / "sql"
+        sql_dir.mkdir()
+        (sql_dir / "coldest.sql").write_text(
+            "SELECT MIN(temp_max_c) AS coldest FROM weather_daily", encoding="utf-8"
+        )
+        metrics_config = replace(self.duckdb, duckdb_sql_dir=sql_dir)
+        first_dir = calculate_metrics(metrics_config, ["coldest.sql"])
+        version = data_version(self.duckdb)
+
+        stats = sync(self.sqlite, self.duckdb)
+        self.assertEqual((stats.rows, stats.changed), (40, 0))
+        self.assertEqual(calculate_metrics(metrics_config, ["coldest.sql"]), first_dir)
+        self.assertEqual(data_version(self.duckdb), version)
+
+        self.stamp("2025-03-01T00:00:00Z", ["2025-01-03"], temp_max_c=-5.0)
+        stats = sync(self.sqlite, self.duckdb)
+        self.assertEqual((stats.rows, stats.changed), (1, 1))
+        self.assertNotEqual(data_version(self.duckdb), version)
+        report_dir = calculate_metrics(metrics_config, ["coldest.sql"])
+        manifest = json.loads((report_dir / "metadata.json").read_text("utf-8"))
+        self.assertFalse(manifest["metrics"][0]["cached"])
+        rows = json.loads((report_dir / "coldest.json").read_text("utf-8"))
+        self.assertEqual(rows, [{"coldest": -5.0}])
+
+    def test_same_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            sync(self.sqlite, self.sqlite)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,9 +6,12 @@ from pathlib import Path
 import pandas as pd
 
 from src.utils.io import (
+    ArtefactWriter,
+    atomic_write_bytes,
     ensure_proc_outpath,
     ensure_raw_outpath,
     json_default,
+    link_or_copy,
     utc_isoformat,
 )
 from src.utils.schema import clip_num
@@ -24,6 +27,48 @@ class UtilsTests(unittest.TestCase):
             self.assertTrue(str(raw_path).endswith("response.json"))
             self.assertTrue(str(proc_path).endswith("data.parquet"))
 
+    def test_atomic_write_bytes_replaces_file_without_leftovers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "response.json"
+            target.write_bytes(b"old")
+            atomic_write_bytes(target, b"new")
+            self.assertEqual(target.read_bytes(), b"new")
+            self.assertEqual(
+                sorted(p.name for p in Path(tmp).iterdir()), ["response.json"]
+            )
+
+    def test_atomic_write_bytes_uses_the_umask_file_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            plain = Path(tmp) / "plain.json"
+            plain.write_bytes(b"{}")
+            target = atomic_write_bytes(Path(tmp) / "response.json", b"{}")
+            self.assertEqual(
+                target.stat().st_mode & 0o777, plain.stat().st_mode & 0o777
+            )
+
+    def test_artefact_writer_background_writes_and_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            with ArtefactWriter(max_workers=2, max_pending=1) as writer:
+                for index in range(5):
+                    writer.write_bytes(
+                        root / f"day{index}" / "data.bin", bytes([index])
+                    )
+                writer.flush()
+                self.assertEqual((root / "day3" / "data.bin").read_bytes(), b"\x03")
+
+                writer.write_bytes(root / "day1", b"x")
+                with self.assertRaises(OSError):
+                    writer.flush()
+
+    def test_link_or_copy_shares_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source.json"
+            source.write_text("[]", encoding="utf-8")
+            target = link_or_copy(source, Path(tmp) / "target.json")
+            self.assertEqual(target.read_text(encoding="utf-8"), "[]")
+            self.assertEqual(link_or_copy(source, source), source)
+
     def test_json_default_handles_datetime_and_nan(self):
         iso = json_default(pd.Timestamp("2025-01-01T00:00:00Z"))
         self.assertEqual(iso, "2025-01-01T00:00:00+00:00")
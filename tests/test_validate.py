@@ -0,0 +1,80 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from fixtures import sample_batch, temp_config
+
+from src.load import ensure_db_and_table, split_save_and_upsert
+from src.validate import REASONS_COLUMN, validate_frame
+
+
+class ValidateFrameTests(unittest.TestCase):
+    def test_rows_violating_checks_are_split_out_with_every_reason(self):
+        frame = pd.DataFrame(
+            [
+                {"date": "2025-08-01", "temp_max_c": 25.0, "precip_hours": 3.0},
+                {"date": "2025-08-02", "temp_max_c": 70.0, "precip_hours": None},
+                {"date": "2025-08-03", "precip_hours": 25.0, "wind_dir_deg": -1.0},
+                {"date": "2025-08-04", "temp_max_c": "n/a"},
+                {"date": None, "temp_max_c": 20.0},
+                {"date": "2025-08-06", "weather_code": 99.0, "sunshine_sec": 86400.0},
+            ]
+        )
+
+        valid, rejected = validate_frame(frame)
+
+        self.assertEqual(list(valid["date"]), ["2025-08-01", "2025-08-06"])
+        self.assertEqual(
+            dict(zip(rejected["date"].fillna("-"), rejected[REASONS_COLUMN])),
+            {
+                "2025-08-02": "temp_max_c 70.0 violates < 70",
+                "2025-08-03": "precip_hours 25.0 violates <= 24; "
+                "wind_dir_deg -1.0 violates >= 0",
+                "2025-08-04": "temp_max_c 'n/a' is not numeric",
+                "-": "date is missing or invalid",
+            },
+        )
+
+    def test_clean_frame_is_returned_unchanged(self):
+        frame = pd.DataFrame([{"date": "2025-08-01", "temp_max_c": 25.0}])
+        valid, rejected = validate_frame(frame)
+        self.assertIs(valid, frame)
+        self.assertTrue(rejected.empty)
+        self.assertIn(REASONS_COLUMN, rejected.columns)
+
+
+class QuarantineLoadTests(unittest.TestCase):
+    def test_bad_rows_are_quarantined_and_the_rest_of_the_batch_loads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            config = temp_config(tmp)
+            engine = ensure_db_and_table(config)
+            days = ["2025-08-01", "2025-08-02", "2025-08-03"]
+            batch = sample_batch(days)
+            # 70.0 survives the transform's clipping but breaks ``temp_max_c < 70``.
+            batch["daily"]["temperature_2m_max"][1] = 70.0
+
+            upserted = split_save_and_upsert(batch, config, engine=engine)
+            engine.dispose()
+
+            self.assertEqual(upserted, 2)
+            with sqlite3.connect(config.db_path) as conn:
+                rows = conn.execute("SELECT date FROM weather_daily").fetchall()
+            loaded = [row[0] for row in rows]
+            self.assertEqual(sorted(loaded), ["2025-08-01", "2025-08-03"])
+
+            files = list(config.quarantine_root.glob("*.parquet"))
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].name.endswith("_2025-08-02_2025-08-02.parquet"))
+            quarantined = pd.read_parquet(files[0])
+            self.assertEqual(list(quarantined["date"]), ["2025-08-02"])
+            self.assertEqual(
+                list(quarantined[REASONS_COLUMN]), ["temp_max_c 70.0 violates < 70"]
+            )
+            self.assertIn("quarantined_at", quarantined.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
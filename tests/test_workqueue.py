@@ -0,0 +1,152 @@
+import multiprocessing
+import sqlite3
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+from fixtures import temp_config
+from stub_server import ArchiveStubServer, archive_payload
+
+from src.load import ensure_db_and_table
+from src.workqueue import QueueWorker, WorkQueue, run_worker, task_id_for
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class WorkQueueTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.config = replace(
+            temp_config(self.tmp),
+            queue_lease_seconds=10.0,
+            queue_heartbeat_seconds=0.2,
+            queue_max_attempts=2,
+        )
+        self.engine = ensure_db_and_table(self.config)
+        self.clock = FakeClock()
+        self.queue = WorkQueue(self.config, self.engine, clock=self.clock)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self._tmp.cleanup()
+
+    def test_enqueue_is_idempotent_per_chunk(self):
+        location = [(50.45, 30.52)]
+        self.assertEqual(self.queue.enqueue(location, "2025-08-06", "2025-08-12", 5), 2)
+        self.assertEqual(self.queue.enqueue(location, "2025-08-01", "2025-08-12", 5), 1)
+        self.assertEqual(self.queue.counts()["pending"], 3)
+
+        # Oldest chunk first, whenever it was enqueued.
+        task = self.queue.claim("a", 10.0)
+        self.assertEqual(
+            task.task_id, task_id_for(50.45, 30.52, "2025-08-01", "2025-08-05")
+        )
+        self.assertEqual((task.start_date, task.end_date), ("2025-08-01", "2025-08-05"))
+
+    def test_enqueue_rejects_a_second_location(self):
+        # weather_daily and the day artefacts are keyed by date alone.
+        with self.assertRaises(ValueError):
+            self.queue.enqueue(
+                [(50.45, 30.52), (49.84, 24.03)], "2025-08-01", "2025-08-05", 5
+            )
+        self.queue.enqueue([(50.45, 30.52)], "2025-08-01", "2025-08-05", 5)
+        with self.assertRaises(ValueError):
+            self.queue.enqueue([(49.84, 24.03)], "2025-08-01", "2025-08-05", 5)
+        self.assertEqual(self.queue.counts()["pending"], 1)
+
+    def test_expired_lease_is_requeued_and_the_old_owner_cannot_finish(self):
+        self.queue.enqueue([(50.45, 30.52)], "2025-08-01", "2025-08-05", 5)
+        task = self.queue.claim("a", 10.0)
+        self.assertIsNone(self.queue.claim("b", 10.0))
+
+        self.clock.now += 8
+        self.assertTrue(self.queue.heartbeat(task, "a", 10.0))
+        self.clock.now += 9
+        self.assertEqual(self.queue.requeue_expired(max_attempts=3), 0)
+        self.clock.now += 2
+        self.assertEqual(self.queue.requeue_expired(max_attempts=3), 1)
+
+        retaken = self.queue.claim("b", 10.0)
+        self.assertEqual((retaken.task_id, retaken.attempts), (task.task_id, 2))
+        self.assertFalse(self.queue.heartbeat(task, "a", 10.0))
+        self.assertFalse(self.queue.complete(task, "a", rows=5))
+        self.assertTrue(self.queue.complete(retaken, "b", rows=5))
+        self.assertEqual(self.queue.counts()["done"], 1)
+
+    def test_failing_task_is_retried_then_marked_failed(self):
+        def reject_august_3(params):
+            if params["start_date"] <= "2025-08-03" <= params["end_date"]:
+                return 400, {}, {"error": True, "reason": "Parameter out of range"}
+            return 200, {}, archive_payload(params)
+
+        self.queue.enqueue([(50.45, 30.52)], "2025-08-01", "2025-08-06", 2)
+        with (
+            ArchiveStubServer(reject_august_3) as server,
+            QueueWorker(self.config, worker_id="solo", url=server.url) as worker,
+        ):
+            stats = worker.run()
+
+        self.assertEqual((stats.tasks, stats.failed, stats.rows), (2, 2, 4))
+        self.assertEqual(
+            self.queue.counts(), {"pending": 0, "leased": 0, "done": 2, "failed": 1}
+        )
+        with sqlite3.connect(self.config.db_path) as conn:
+            failed = conn.execute(
+                "SELECT start_date, attempts, last_error FROM work_queue "
+                "WHERE status = 'failed'"
+            ).fetchone()
+        self.assertEqual(failed[:2], ("2025-08-03", 2))
+        self.assertIn("Parameter out of range", failed[2])
+
+
+class MultiProcessWorkQueueTests(unittest.TestCase):
+    def test_worker_processes_share_one_backfill_without_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = replace(temp_config(Path(tmpdir)), queue_heartbeat_seconds=0.05)
+            engine = ensure_db_and_table(config)
+            queue = WorkQueue(config, engine)
+            queue.enqueue([(50.45, 30.52)], "2025-08-01", "2025-08-30", 3)
+
+            context = multiprocessing.get_context("spawn")
+            with ArchiveStubServer(delay=0.1) as server:
+                workers = [
+                    context.Process(
+                        target=run_worker, args=(config, server.url, f"w{index}")
+                    )
+                    for index in range(3)
+                ]
+                for process in workers:
+                    process.start()
+                for process in workers:
+                    process.join(timeout=120)
+                requests = list(server.requests)
+
+            counts = queue.counts()
+            engine.dispose()
+            self.assertEqual([process.exitcode for process in workers], [0, 0, 0])
+            self.assertEqual(
+                counts, {"pending": 0, "leased": 0, "done": 10, "failed": 0}
+            )
+            # Every chunk was fetched exactly once across the three processes.
+            fetched = sorted((r["start_date"], r["end_date"]) for r in requests)
+            self.assertEqual(len(fetched), 10)
+            self.assertEqual(len(set(fetched)), 10)
+            with sqlite3.connect(config.db_path) as conn:
+                days = conn.execute("SELECT COUNT(*) FROM weather_daily").fetchone()
+                attempts = conn.execute(
+                    "SELECT DISTINCT attempts FROM work_queue"
+                ).fetchall()
+            self.assertEqual(days[0], 30)
+            self.assertEqual(attempts, [(1,)])
+
+
+if __name__ == "__main__":
+    unittest.main()